@@ -2,10 +2,13 @@
 constants.py
 
 Defines all constants used across the Aussie NLP Toolkit.
-These constants are primarily file type codes, which guide the behavior of file detection and processing modules.
+These constants are primarily file type codes, which guide the behavior of file detection and processing modules,
+and the standard data directories that stages read from and write to.
 
 """
 
+from pathlib import Path
+
 # Constants for file type detection and processing in the Aussie NLP Toolkit.
 # These constants are used to identify the type of file being processed and determine the appropriate handling method.
 # - 0 represents unsupported file types.
@@ -28,4 +31,18 @@ FILETYPE_TEXT = 5           # Plain text files, e.g., .txt.
 # FILETYPE_YAML = 10          # YAML configuration files, e.g., for pipeline setups.
 # FILETYPE_SQLITE = 11        # SQLite database files.
 
+# Pipeline Data Directories
+# All paths are resolved relative to the repository root so modules behave the same regardless of the working directory.
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+RAW_DIR = DATA_DIR / "raw"                                  # Unprocessed input files.
+LOADED_DIR = DATA_DIR / "loaded"                            # Optional loader checkpoints.
+CLEANING_CHECKPOINT_DIR = DATA_DIR / "cleaned" / "cleaning" # Optional per-stage cleaning checkpoints.
+PREPROCESSED_DIR = DATA_DIR / "preprocessed"                # Output of the cleaning sub-pipeline.
+PROCESSED_DIR = DATA_DIR / "processed"                      # Tokenised output.
+GENERATED_DIR = DATA_DIR / "generated"                      # Final datasets.
+CACHE_DIR = DATA_DIR / "cache"                              # Content-addressed stage output cache.
+FAILED_CORRUPT_DIR = DATA_DIR / "failed" / "corrupt"        # Files detected as corrupted.
+FAILED_UNSUPPORTED_DIR = DATA_DIR / "failed" / "unsupported" # Unsupported file types.
+
 # Additional constants can be added here as needed.
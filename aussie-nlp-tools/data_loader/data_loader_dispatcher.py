@@ -4,19 +4,134 @@ Module: data_loader_dispatcher.py
 Purpose:
 - Acts as the entry point for handling file loading operations within the Aussie NLP Toolkit.
 - Routes files to the appropriate data loader module based on their detected file type.
+- Emits a single stream of `Document` records for the cleaning sub-pipeline.
 
 Frameworks/Tools:
 - Built-in Python libraries for basic file operations.
 - Modules from `aussie-nlp-tools` for specific data loader implementations.
 
 Expected Inputs:
-- Full file path as a string, including the filename (e.g., "/path/to/my_file.csv").
+- Full file path as a string, including the filename (e.g., "/path/to/my_file.csv"), or an iterable of paths.
 
 Expected Outputs:
-- Routes the file to the correct data loader module for processing.
-- Logs errors for unsupported (FILETYPE_UNSUPPORTED) or corrupted (FILETYPE_CORRUPT) files, using `constants.py`.
+- A generator of `Document` records produced by the matching loader module. With a `root` directory, document ids
+  are qualified by the file's path relative to it (e.g., "news/index.html", "feeds/items.jsonl:3"), so files with
+  the same stem in different directories, or with different extensions, never share ids or output files.
+- Optional loader checkpoints in `data/loaded/` (`<doc_id>_loaded.txt`) when a checkpoint directory is given.
+- Logs errors for unsupported (FILETYPE_UNSUPPORTED) or corrupted (FILETYPE_CORRUPT) files, using `constants.py`,
+  and moves them into `data/failed/`.
 
 Planned Test Approach:
 - Test with various supported file types (e.g., FILETYPE_HTML, FILETYPE_JSON, FILETYPE_CSV) to ensure correct dispatch.
 - Verify proper handling and logging of unsupported and corrupted files.
 """
+
+from pathlib import Path
+
+from constants import (
+    FILETYPE_CORRUPT,
+    FILETYPE_CSV,
+    FILETYPE_HTML,
+    FILETYPE_JSON,
+    FILETYPE_PDF,
+    FILETYPE_TEXT,
+)
+from data_loader.data_loader_csv import load_csv
+from data_loader.data_loader_html import load_html
+from data_loader.data_loader_json import load_json
+from data_loader.data_loader_pdf import load_pdf
+from data_loader.data_loader_txt import load_txt
+from data_loader.detect_filetype import detect_filetype
+from document import write_checkpoint
+from utils.error_handling import CorruptFileError, quarantine_file
+from utils.logging import get_logger, get_metrics
+
+logger = get_logger("data_loader_dispatcher")
+
+LOADERS = {
+    FILETYPE_HTML: load_html,
+    FILETYPE_JSON: load_json,
+    FILETYPE_CSV: load_csv,
+    FILETYPE_PDF: load_pdf,
+    FILETYPE_TEXT: load_txt,
+}
+
+# Suffix for optional loader checkpoints written to `data/loaded/`.
+LOADED_SUFFIX = "loaded"
+
+
+def document_key(file_path, root):
+    """
+    Return the id prefix for documents of `file_path`: its POSIX path relative to `root`, extension included, or its
+    absolute path when it lies outside `root`.
+    """
+    path = Path(file_path).resolve()
+    try:
+        return path.relative_to(Path(root).resolve()).as_posix()
+    except ValueError:
+        return path.as_posix().lstrip("/")
+
+
+def qualify_documents(documents, file_path, root):
+    """Yield `documents` with the loader's `<stem>` id prefix replaced by `document_key(file_path, root)`."""
+    stem = Path(file_path).stem
+    key = document_key(file_path, root)
+    for document in documents:
+        suffix = document.doc_id[len(stem):] if document.doc_id.startswith(stem) else f":{document.doc_id}"
+        yield document.replace(doc_id=key + suffix)
+
+
+def load_file(file_path, quarantine=True, failed_root=None, root=None):
+    """
+    Detect the type of `file_path` and yield its documents.
+
+    Args:
+        file_path: Path of the raw file.
+        quarantine: Move unsupported or corrupt files into `data/failed/`.
+        failed_root: Optional override for the `data/failed/` directory.
+        root: Directory the file was discovered under (e.g., `data/raw/`); qualifies document ids with the file's
+            relative path (see `document_key`). Without it, ids are the loader's `<stem>`-based ids.
+
+    Yields:
+        `Document` records from the matching loader. Nothing is yielded for unsupported or corrupt files.
+    """
+    metrics = get_metrics()
+    with metrics.timer("detect_filetype"):
+        filetype = detect_filetype(file_path)
+    loader = LOADERS.get(filetype)
+    if loader is None:
+        label = "corrupt" if filetype == FILETYPE_CORRUPT else "unsupported"
+        logger.error("Skipping %s file: %s", label, file_path)
+        if quarantine:
+            quarantine_file(file_path, filetype, failed_root)
+        return
+
+    try:
+        stage = getattr(loader, "__name__", "load")
+        documents = loader(file_path)
+        if root is not None:
+            documents = qualify_documents(documents, file_path, root)
+        yield from metrics.iterate(stage, documents, size=lambda document: len(document.text))
+    except CorruptFileError as exc:
+        logger.error("Corrupt file: %s", exc)
+        if quarantine:
+            quarantine_file(file_path, FILETYPE_CORRUPT, failed_root)
+
+
+def load_documents(file_paths, checkpoint_dir=None, quarantine=True, failed_root=None, root=None):
+    """
+    Yield documents from every file in `file_paths`, in order.
+
+    Args:
+        file_paths: Iterable of raw file paths.
+        checkpoint_dir: If set (e.g., `LOADED_DIR`), write each loaded document there before yielding it.
+        quarantine: Move unsupported or corrupt files into `data/failed/`.
+        failed_root: Optional override for the `data/failed/` directory.
+        root: Directory the files were discovered under; see `load_file`.
+    """
+    for file_path in file_paths:
+        for document in load_file(file_path, quarantine, failed_root, root):
+            if checkpoint_dir is not None:
+                write_checkpoint(document, checkpoint_dir, LOADED_SUFFIX)
+            yield document
+
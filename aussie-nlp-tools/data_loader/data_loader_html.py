@@ -6,19 +6,22 @@ Purpose:
 - Handles the complexities of HTML structures, such as embedded tags and inline scripts, to ensure meaningful content is extracted.
 
 Frameworks/Tools:
-- Utilizes `BeautifulSoup` from `bs4` for robust HTML parsing.
-- Optionally integrates with `lxml` for advanced parsing tasks.
+- Built-in Python `re` and `html` for metadata; no document tree is built at load time. Text is extracted by the
+  streaming engine in `clean_html_tags.py` (`html.parser`, or `lxml` when installed, with a `BeautifulSoup` fallback).
 
 Expected Inputs:
 - Full file path to an HTML file as a string, including the filename (e.g., "/path/to/my_file.html").
 
 Expected Outputs:
-- Generates a temporary file in `data/loaded/` containing the extracted text content as plain text.
-- Naming convention: `<original_filename>_loaded.txt` (e.g., "my_file_loaded.txt").
+- Yields a single `Document` with `filetype=FILETYPE_HTML` holding the page markup.
+- A loader checkpoint in `data/loaded/` is only written when requested via `data_loader_dispatcher.py`.
 
 Behavior:
-- Parses the HTML structure to remove extraneous elements, such as scripts, styles, and navigation bars.
-- Focuses on extracting meaningful content from body tags or specific HTML elements.
+- Reads the page once; markup is parsed a single time by the `clean_html_tags` stage of the cleaning sub-pipeline,
+  which removes extraneous elements such as scripts, styles, and navigation bars.
+- Records the page `<title>` and canonical URL (`<link rel="canonical">`) in the document metadata when present;
+  the URL lets later stages group pages by site (e.g., frequency-based boilerplate removal). Both are looked up in
+  the `<head>` only, so large page bodies are not scanned.
 
 Planned Test Approach:
 - Test with varied HTML files, including:
@@ -28,3 +31,38 @@ Planned Test Approach:
 - Verify that extracted text content is accurate, excluding noise and irrelevant tags.
 - Benchmark performance on large files or batches of files.
 """
+
+import re
+from html import unescape
+from pathlib import Path
+
+from constants import FILETYPE_HTML
+from data_loader.data_loader_txt import read_text
+from document import Document
+
+_TITLE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_CANONICAL_LINK = re.compile(r"<link\b[^>]*\brel=[\"']?canonical\b[^>]*>", re.IGNORECASE)
+_HREF = re.compile(r"\bhref=[\"']?([^\"'\s>]+)", re.IGNORECASE)
+_HEAD_END = re.compile(r"</head\s*>|<body\b", re.IGNORECASE)
+
+
+def page_head(markup):
+    """Return the markup before the end of `<head>` (the whole page when there is no head/body boundary)."""
+    end = _HEAD_END.search(markup)
+    return markup[:end.start()] if end else markup
+
+
+def load_html(file_path):
+    """Yield the HTML file at `file_path` as a single `Document` holding its markup."""
+    path = Path(file_path)
+    markup = read_text(path)
+    metadata = {}
+    head = page_head(markup)
+    title = _TITLE.search(head)
+    if title:
+        metadata["title"] = unescape(title.group(1)).strip()
+    canonical = _CANONICAL_LINK.search(head)
+    href = canonical and _HREF.search(canonical.group(0))
+    if href:
+        metadata["url"] = unescape(href.group(1))
+    yield Document(doc_id=path.stem, text=markup, source=str(path), filetype=FILETYPE_HTML, metadata=metadata)
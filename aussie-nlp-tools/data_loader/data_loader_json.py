@@ -13,12 +13,20 @@ Expected Inputs:
 - Full file path to a JSON file as a string, including the filename (e.g., "/path/to/my_file.json").
 
 Expected Outputs:
-- Generates a temporary file in `data/loaded/` containing flattened or structured JSON data in a consistent format.
-- Naming convention: `<original_filename>_loaded.json` (e.g., "my_file_loaded.json").
+- Yields one `Document` per record: each element of a top-level array, each line of a `.jsonl` file,
+  or the whole file for a single object.
+- Record ids follow `<original_filename>:<index>` (e.g., "my_file:0").
 
 Behavior:
 - Validates the JSON file for syntax errors and handles exceptions gracefully.
-- Optionally flattens nested structures for easier downstream processing.
+- Streams records with a fixed memory ceiling regardless of file size:
+  - `.jsonl` files are decoded line by line.
+  - Top-level arrays are parsed incrementally, one element at a time, from reads of `chunk_size` characters.
+  - Any other file is read as a sequence of whitespace-separated JSON values (a single object, or JSON Lines
+    saved with a `.json` extension).
+- Uses the record's `text` field as document text and keeps the remaining fields as metadata;
+  records without a text field are serialised whole.
+- Records before a syntax error are still yielded; the error is raised when it is reached.
 
 Planned Test Approach:
 - Test with various JSON files, including:
@@ -28,3 +36,144 @@ Planned Test Approach:
 - Verify that parsed JSON data is accurate and stored in the expected format.
 - Ensure proper error handling for corrupted or invalid files.
 """
+
+import json
+import re
+from pathlib import Path
+
+from constants import FILETYPE_JSON
+from document import Document
+from utils.error_handling import CorruptFileError
+
+DEFAULT_TEXT_FIELD = "text"
+# Characters read per call when streaming JSON arrays.
+DEFAULT_CHUNK_SIZE = 1 << 16
+# Largest single record accepted while streaming; guards against reading a whole corrupt file into memory.
+MAX_RECORD_CHARS = 1 << 28
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+
+def record_to_document(record, doc_id, source, text_field=DEFAULT_TEXT_FIELD):
+    """Convert a decoded JSON record into a `Document`."""
+    if isinstance(record, str):
+        return Document(doc_id=doc_id, text=record, source=source, filetype=FILETYPE_JSON)
+    if isinstance(record, dict) and isinstance(record.get(text_field), str):
+        metadata = {key: value for key, value in record.items() if key != text_field}
+        return Document(doc_id=doc_id, text=record[text_field], source=source, filetype=FILETYPE_JSON, metadata=metadata)
+    return Document(doc_id=doc_id, text=json.dumps(record, ensure_ascii=False), source=source, filetype=FILETYPE_JSON)
+
+
+def _iter_jsonl(handle):
+    for line_number, line in enumerate(handle, start=1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise json.JSONDecodeError(f"line {line_number}: {exc.msg}", exc.doc, exc.pos) from exc
+
+
+def iter_json_values(handle, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Incrementally decode JSON from a text `handle`.
+
+    A top-level array yields its elements one at a time; otherwise each whitespace-separated top-level value
+    is yielded. Only the current value and the unread remainder of the last read are held in memory.
+
+    Raises:
+        json.JSONDecodeError: On malformed input.
+    """
+    buffer = ""
+    position = 0
+    eof = False
+
+    def fill():
+        # Drop consumed text and append the next read, returning False once the file is exhausted. Reads grow
+        # with the pending text, so a value spanning many chunks is re-decoded a logarithmic number of times.
+        nonlocal buffer, position, eof
+        if eof:
+            return False
+        pending = len(buffer) - position
+        if pending > MAX_RECORD_CHARS:
+            raise json.JSONDecodeError(f"Record exceeds {MAX_RECORD_CHARS} characters", buffer, position)
+        chunk = handle.read(max(chunk_size, pending))
+        buffer = buffer[position:] + chunk
+        position = 0
+        eof = not chunk
+        return not eof
+
+    def skip_whitespace():
+        nonlocal position
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()
+            if position < len(buffer) or not fill():
+                return
+
+    def next_value():
+        nonlocal position
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The value may just be cut off by the end of the read.
+                if fill():
+                    continue
+                raise
+            if buffer[end - 1] not in '}]"' and _NUMBER_TAIL.fullmatch(buffer, end) and fill():
+                continue  # a number or literal may continue in the next read (e.g. "12" + "34", "1." + "5")
+            position = end
+            return value
+
+    skip_whitespace()
+    if not buffer.startswith("[", position):
+        while position < len(buffer):
+            yield next_value()
+            skip_whitespace()
+        return
+
+    position += 1
+    skip_whitespace()
+    if buffer.startswith("]", position):
+        position += 1
+    else:
+        while True:
+            yield next_value()
+            skip_whitespace()
+            delimiter = buffer[position : position + 1]
+            position += 1
+            if delimiter == "]":
+                break
+            if delimiter != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position - 1)
+            skip_whitespace()
+    skip_whitespace()
+    if position < len(buffer):
+        raise json.JSONDecodeError("Extra data", buffer, position)
+
+
+def load_json(file_path, text_field=DEFAULT_TEXT_FIELD, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield one `Document` per record in a JSON or JSONL file, streaming the file.
+
+    Args:
+        file_path: Path of the JSON or JSONL file.
+        text_field: Field holding each record's text.
+        chunk_size: Characters read per call when parsing JSON arrays; larger reads trade memory for throughput.
+
+    Raises:
+        CorruptFileError: If the file is not valid JSON.
+    """
+    path = Path(file_path)
+    source = str(path)
+    try:
+        with path.open(encoding="utf-8-sig") as handle:
+            if path.suffix.lower() == ".jsonl":
+                records = _iter_jsonl(handle)
+            else:
+                records = iter_json_values(handle, chunk_size)
+            for index, record in enumerate(records):
+                yield record_to_document(record, f"{path.stem}:{index}", source, text_field)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise CorruptFileError(f"{path}: {exc}") from exc
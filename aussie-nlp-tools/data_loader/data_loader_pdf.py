@@ -1,33 +1,290 @@
 """
-Module: clean_html_tags.py
+Module: data_loader_pdf.py
 
 Purpose:
-- Removes unnecessary HTML tags from loaded text files, ensuring that only meaningful content remains for further processing.
-- Deletes intermediate files from `data/loaded/` once their content is successfully cleaned.
+- Loads PDF documents and extracts their text content for further processing in the Aussie NLP pipeline.
 
 Frameworks/Tools:
-- Utilizes `BeautifulSoup` from `bs4` for robust HTML parsing and tag removal.
+- Utilizes `pypdf` for text extraction (optional dependency; imported on first use, in the extraction workers).
+- Built-in Python `multiprocessing` for a pool of page extraction workers.
 
 Expected Inputs:
-- File path to a temporary text file in `data/loaded/`, created by `data_loader_html.py`.
-  - Example: "data/loaded/<original_filename>_loaded.txt".
+- Full file path to a PDF file as a string, including the filename (e.g., "/path/to/my_file.pdf").
 
 Expected Outputs:
-- A cleaned text file in `data/cleaned/`, free of HTML tags and artifacts.
-  - Example: "data/cleaned/<original_filename>_cleaned.txt".
-- The input file in `data/loaded/` is deleted after successful cleaning.
+- Yields a single `Document` containing the text of all pages, separated by blank lines.
+- PDFs whose text exceeds `max_document_bytes` yield one `Document` per part instead (`<stem>:<n>`), each holding
+  whole pages, as `data_loader_txt.py` does for large text files.
+- The page count is recorded in the document metadata (with the part number and first page for parts), with the
+  numbers of any pages skipped (timed out or failed) under "skipped_pages".
+- With `per_page`, yields one `Document` per page instead (`<stem>:<page index>`, page number in the metadata).
 
 Behavior:
-- Reads the loaded text file and processes its content to remove all HTML tags.
-- Handles edge cases such as incomplete or malformed HTML.
-- Outputs a plain text file, ensuring consistent formatting.
-- Ensures intermediate files are deleted to maintain a clean pipeline.
+- Extracts the text layer of each page; scanned PDFs without a text layer yield empty text (OCR is out of scope).
+- Pages are extracted in a pool of worker processes (`PagePool`, one per loading process, reused across files).
+  Each worker opens the PDF once and extracts the pages it is given; only page text crosses back to the loader, and
+  at most `PAGES_IN_FLIGHT_PER_WORKER` pages per worker are queued ahead. Pages are yielded in order as they
+  complete and collected into documents of at most `max_document_bytes`, so loader memory is bounded by that limit
+  (or by a page, with `per_page`) rather than by the PDF.
+- The pool size defaults to `DEFAULT_PAGE_WORKERS`; `set_page_workers` overrides it for the process, which the batch
+  runner uses to size page pools from its own worker count rather than nesting a full pool under every worker.
+- Every page has a timeout (`page_timeout`, counted from when the loader starts waiting for that page): a page that
+  runs over it is skipped, the pool's workers are killed and replaced, and the other queued pages are resubmitted.
+  A file with more than `max_page_timeouts` such pages is abandoned as corrupt, so one pathological PDF cannot stall
+  a batch. Pages whose extraction raises are skipped and logged. Both count as errors of the `load_pdf` stage in
+  the pipeline metrics.
+- Inside daemonic processes (which cannot start workers) pages are extracted in-process, without timeouts.
+- Raises `CorruptFileError` for files that cannot be parsed as PDF.
 
 Planned Test Approach:
-- Test with text files containing varied HTML content, including:
-  - Well-formed and malformed HTML.
-  - Text with embedded JavaScript or CSS.
-  - Large files with extensive nested tags.
-- Verify that cleaned text output matches expected results, free of noise or artifacts.
-- Confirm that the original intermediate file is deleted after successful cleaning.
+- Test with varied PDF files, including:
+  - Single and multi-page documents.
+  - Encrypted or damaged PDFs.
+  - Scanned PDFs without a text layer.
+- Verify that extracted text matches the visible document content.
+- Verify page ordering, skipping of timed-out and failing pages, pool recovery, and the corrupt-file limit with
+  stand-in extraction functions, independent of `pypdf`.
 """
+
+import atexit
+import multiprocessing
+import os
+from collections import deque
+from pathlib import Path
+
+from constants import FILETYPE_PDF
+from data_loader.data_loader_txt import DEFAULT_MAX_DOCUMENT_BYTES
+from document import Document
+from utils.error_handling import AussieNLPError, CorruptFileError
+from utils.logging import get_logger, get_metrics
+
+logger = get_logger("data_loader_pdf")
+
+# Seconds a single page (or reading the page tree) may take before it is abandoned.
+DEFAULT_PAGE_TIMEOUT = 30.0
+DEFAULT_PAGE_WORKERS = min(2, os.cpu_count() or 1)
+# Pages queued ahead per worker; bounds the page text held by the loader.
+PAGES_IN_FLIGHT_PER_WORKER = 2
+# Files with more timed-out pages than this are treated as corrupt.
+DEFAULT_MAX_PAGE_TIMEOUTS = 3
+PAGE_SEPARATOR = "\n\n"
+
+# Per worker process: the PDF currently being extracted, as `(path, mtime_ns, reader)`.
+_OPEN_READER = None
+# Per loading process: pools by worker count, keyed with the owning pid so forked children start their own.
+_POOLS = {}
+# Per loading process: page workers used by `load_pdf` when none are given (None means `DEFAULT_PAGE_WORKERS`).
+_PAGE_WORKERS = None
+
+
+def set_page_workers(workers):
+    """Set the page workers `load_pdf` uses in this process by default (None restores `DEFAULT_PAGE_WORKERS`)."""
+    global _PAGE_WORKERS
+    _PAGE_WORKERS = workers
+
+
+def _pdf_reader(path):
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PdfReadError
+    except ImportError as exc:
+        raise AussieNLPError("PDF loading requires the optional `pypdf` package") from exc
+    try:
+        return PdfReader(str(path))
+    except (PdfReadError, ValueError, OSError) as exc:
+        raise CorruptFileError(f"{path}: {exc}") from exc
+
+
+def _reader(path):
+    """Return a reader for `path`, reusing the one this worker opened for the previous page of the same file."""
+    global _OPEN_READER
+    mtime_ns = os.stat(path).st_mtime_ns
+    if _OPEN_READER is None or _OPEN_READER[:2] != (path, mtime_ns):
+        _OPEN_READER = (path, mtime_ns, _pdf_reader(path))
+    return _OPEN_READER[2]
+
+
+def count_pages(path):
+    """Return the number of pages in the PDF at `path`."""
+    return len(_reader(path).pages)
+
+
+def extract_page(path, index):
+    """Return the text layer of page `index` (0-based) of the PDF at `path`."""
+    return _reader(path).pages[index].extract_text() or ""
+
+
+class PagePool:
+    """Process pool for page extraction that can abandon stuck pages by replacing its workers."""
+
+    def __init__(self, workers=DEFAULT_PAGE_WORKERS):
+        self.workers = workers
+        self._pool = None
+
+    def submit(self, func, *args):
+        if self._pool is None:
+            self._pool = multiprocessing.get_context().Pool(self.workers)
+        return self._pool.apply_async(func, args)
+
+    def reset(self):
+        """Kill the workers, including any stuck page; a fresh pool starts on the next `submit`."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    close = reset
+
+
+def default_pool(workers=DEFAULT_PAGE_WORKERS):
+    """Return this process's shared `PagePool` with `workers` workers."""
+    key = (os.getpid(), workers)
+    pool = _POOLS.get(key)
+    if pool is None:
+        pool = _POOLS[key] = PagePool(workers)
+    return pool
+
+
+@atexit.register
+def _close_pools():
+    for (pid, _), pool in _POOLS.items():
+        if pid == os.getpid():
+            pool.close()
+
+
+def _extract_in_process(path, extract, count):
+    for index in range(count(path)):
+        try:
+            yield index, extract(path, index)
+        except AussieNLPError:
+            raise
+        except Exception as exc:
+            logger.warning("%s: skipping page %d: %s", path, index + 1, exc)
+            get_metrics().count("load_pdf", errors=1)
+            yield index, None
+
+
+def extract_pages(
+    path,
+    page_timeout=DEFAULT_PAGE_TIMEOUT,
+    workers=DEFAULT_PAGE_WORKERS,
+    max_page_timeouts=DEFAULT_MAX_PAGE_TIMEOUTS,
+    extract=extract_page,
+    count=count_pages,
+    pool=None,
+):
+    """
+    Yield `(index, text)` for every page of the PDF at `path`, in page order; `text` is None for skipped pages.
+
+    Args:
+        path: PDF path (a string).
+        page_timeout: Seconds to wait for each page before abandoning it.
+        workers: Extraction worker processes (0 extracts in this process, without timeouts).
+        max_page_timeouts: Timed-out pages tolerated before the file is treated as corrupt.
+        extract: `extract(path, index)` -> page text, run in the workers (module-level, so it can be pickled).
+        count: `count(path)` -> page count, run in a worker.
+        pool: `PagePool` to use (default: this process's shared pool).
+
+    Raises:
+        CorruptFileError: The file cannot be parsed, reading its page tree timed out, or too many pages timed out.
+    """
+    if not workers or multiprocessing.current_process().daemon:
+        yield from _extract_in_process(path, extract, count)
+        return
+    pool = pool or default_pool(workers)
+    result = pool.submit(count, path)
+    try:
+        page_count = result.get(page_timeout)
+    except multiprocessing.TimeoutError:
+        pool.reset()
+        raise CorruptFileError(f"{path}: reading the page tree took over {page_timeout:g}s") from None
+
+    metrics = get_metrics()
+    window = deque()
+    next_index = 0
+    timeouts = 0
+    while window or next_index < page_count:
+        while next_index < page_count and len(window) < workers * PAGES_IN_FLIGHT_PER_WORKER:
+            window.append((next_index, pool.submit(extract, path, next_index)))
+            next_index += 1
+        index, result = window.popleft()
+        try:
+            text = result.get(page_timeout)
+        except multiprocessing.TimeoutError:
+            timeouts += 1
+            metrics.count("load_pdf", errors=1)
+            pool.reset()
+            if timeouts > max_page_timeouts:
+                raise CorruptFileError(f"{path}: more than {max_page_timeouts} pages took over {page_timeout:g}s")
+            logger.warning("%s: skipping page %d after %gs", path, index + 1, page_timeout)
+            window = deque((queued, pool.submit(extract, path, queued)) for queued, _ in window)
+            text = None
+        except AussieNLPError:
+            raise
+        except Exception as exc:
+            logger.warning("%s: skipping page %d: %s", path, index + 1, exc)
+            metrics.count("load_pdf", errors=1)
+            text = None
+        yield index, text
+
+
+def _pdf_document(path, doc_id, texts, skipped, metadata):
+    metadata = dict(metadata, pages=len(texts))
+    if skipped:
+        metadata["skipped_pages"] = skipped
+    return Document(
+        doc_id=doc_id,
+        text=PAGE_SEPARATOR.join(texts),
+        source=str(path),
+        filetype=FILETYPE_PDF,
+        metadata=metadata,
+    )
+
+
+def load_pdf(
+    file_path,
+    per_page=False,
+    page_timeout=DEFAULT_PAGE_TIMEOUT,
+    workers=None,
+    max_document_bytes=DEFAULT_MAX_DOCUMENT_BYTES,
+):
+    """
+    Yield the PDF at `file_path` as a single `Document`, as parts if its text is very large, or one `Document` per
+    page if `per_page`.
+    """
+    path = Path(file_path)
+    if workers is None:
+        workers = DEFAULT_PAGE_WORKERS if _PAGE_WORKERS is None else _PAGE_WORKERS
+    pages = extract_pages(str(path), page_timeout, workers)
+    if per_page:
+        for index, text in pages:
+            if text is not None:
+                yield Document(
+                    doc_id=f"{path.stem}:{index}",
+                    text=text,
+                    source=str(path),
+                    filetype=FILETYPE_PDF,
+                    metadata={"page": index + 1},
+                )
+        return
+    texts = []
+    skipped = []
+    size = 0
+    part = 0
+    first_page = 1
+    for index, text in pages:
+        page_bytes = len(text.encode("utf-8")) if text else 0
+        if texts and size + page_bytes > max_document_bytes:
+            metadata = {"part": part, "first_page": first_page}
+            yield _pdf_document(path, f"{path.stem}:{part}", texts, skipped, metadata)
+            texts, skipped, size = [], [], 0
+            part += 1
+            first_page = index + 1
+        if text is None:
+            skipped.append(index + 1)
+        texts.append(text or "")
+        size += page_bytes + len(PAGE_SEPARATOR)
+    if part:
+        yield _pdf_document(path, f"{path.stem}:{part}", texts, skipped, {"part": part, "first_page": first_page})
+    else:
+        yield _pdf_document(path, path.stem, texts, skipped, {})
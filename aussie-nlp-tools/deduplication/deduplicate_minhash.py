@@ -1 +1,490 @@
-"""Removes duplicates using MinHash."""
\ No newline at end of file
+"""
+Module: deduplicate_minhash.py
+
+Purpose:
+- Removes near-duplicate documents using MinHash signatures and a banded Locality-Sensitive Hashing (LSH) index.
+- Makes cross-corpus deduplication incremental: new batches are queried against a persisted index instead of
+  being compared pairwise with every document seen before.
+
+Frameworks/Tools:
+- `numpy` for vectorised shingle hashing, MinHash permutations and bucket lookups.
+- Built-in `zlib.crc32` for stable (process-independent) word hashes.
+
+Expected Inputs:
+- A stream of `Document` records, typically the output of the cleaning sub-pipeline.
+- Optionally, the directory of a previously saved index.
+
+Expected Outputs:
+- A generator of documents that are not near-duplicates of anything already indexed (or earlier in the stream).
+- An index directory that can be reloaded for the next batch:
+  - `signatures.u32`: raw (documents × permutations) uint32 MinHash matrix, appended to and opened memory-mapped.
+  - `buckets-<n>.keys.npy` / `buckets-<n>.rows.npy`: segments of per-band bucket keys sorted for binary search,
+    with matching row numbers.
+  - `doc_ids.jsonl` (appended to) and `meta.json`: document ids, index parameters, and the committed row count,
+    byte lengths and segment list.
+
+Behavior:
+- Documents are reduced to hashed word k-shingles; permutations are computed as batched uint64 array operations
+  using multiply-shift hashing `(a * x + b) >> 32` (wrapping 64-bit arithmetic, no modulo), and the row-wise
+  minimum is taken per document with `np.minimum.reduceat`.
+- Signatures are split into `bands` bands of `rows` rows; documents sharing any band bucket become candidates,
+  and candidates are confirmed by estimated Jaccard similarity against `threshold`.
+- `bands`/`rows` default to the combination minimising false positive and false negative probability mass for the
+  threshold, and can be set explicitly to trade recall for speed.
+- Saving is incremental: new signatures and document ids are appended, and the new bucket entries are sorted into a
+  new segment. Segments are merged (linear merges of sorted runs, no re-sort) while the older one is at most
+  `SEGMENT_MERGE_RATIO` times the size of the newer, so there are O(log n) segments and each entry is rewritten
+  O(log n) times over the life of the index. `meta.json` is replaced last, so an interrupted save leaves the
+  previous index intact (extra appended bytes and unreferenced segments are discarded by the next save).
+- Memory maps of files that a save changes or deletes are released first, since mapped files cannot be changed on
+  Windows; existing files are never replaced while mapped.
+
+Planned Test Approach:
+- Verify that exact and near duplicates are removed and distinct documents are kept.
+- Verify that a saved index reloads memory-mapped and deduplicates a later batch against earlier ones.
+- Verify that repeated saves append, keep the segment count logarithmic, and find the same candidates as one index.
+- Benchmark recall vs. throughput across band/row settings (`benchmarks/bench_deduplicate_minhash.py`).
+"""
+
+import json
+import os
+import re
+import zlib
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from utils.logging import get_logger, get_metrics
+
+logger = get_logger("deduplicate_minhash")
+
+MAX_HASH = np.uint64((1 << 32) - 1)
+_HASH_SHIFT = np.uint64(32)
+_SHINGLE_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_BAND_MULTIPLIER = np.uint64(0x100000001B3)
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_SEED = 1
+# Stage name under which batches are timed in the run metrics.
+DEDUPLICATION_STAGE = "deduplicate_minhash"
+# Upper bound on cells in the (permutations × shingles) working matrix, to keep batch memory bounded (~128 MB).
+MAX_WORK_CELLS = 1 << 24
+# A new bucket segment is merged into the previous one while that one is at most this many times larger.
+SEGMENT_MERGE_RATIO = 2
+INDEX_FORMAT = 2
+SIGNATURES_FILE = "signatures.u32"
+DOC_IDS_FILE = "doc_ids.jsonl"
+META_FILE = "meta.json"
+
+_WORD = re.compile(r"\w+")
+
+
+def shingle_hashes(text, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """
+    Return the unique 32-bit hashes of the word `shingle_size`-grams in `text`.
+
+    Texts shorter than one shingle are hashed as a single shingle, so every text has at least one hash.
+    """
+    words = _WORD.findall(text.lower()) or [""]
+    word_hashes = np.fromiter(map(zlib.crc32, map(str.encode, words)), dtype=np.uint64, count=len(words))
+    size = min(shingle_size, len(word_hashes))
+    count = len(word_hashes) - size + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes = hashes * _SHINGLE_MULTIPLIER + word_hashes[offset:offset + count]
+    return np.unique((hashes ^ (hashes >> _HASH_SHIFT)) & MAX_HASH)
+
+
+def make_permutations(num_perm=DEFAULT_NUM_PERM, seed=DEFAULT_SEED):
+    """Return the `(a, b)` coefficient arrays of `num_perm` multiply-shift hash functions (`a` is odd)."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True)
+    return a, b
+
+
+def minhash_signatures(texts, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, seed=DEFAULT_SEED):
+    """
+    Compute MinHash signatures for a batch of texts.
+
+    Returns:
+        A `(len(texts), num_perm)` uint32 array.
+    """
+    a, b = make_permutations(num_perm, seed)
+    a, b = a[:, None], b[:, None]
+    shingles = [shingle_hashes(text, shingle_size) for text in texts]
+    signatures = np.empty((len(shingles), num_perm), dtype=np.uint32)
+
+    start = 0
+    while start < len(shingles):
+        stop, cells = start + 1, len(shingles[start]) * num_perm
+        while stop < len(shingles) and cells + len(shingles[stop]) * num_perm <= MAX_WORK_CELLS:
+            cells += len(shingles[stop]) * num_perm
+            stop += 1
+        group = shingles[start:stop]
+        offsets = np.cumsum([0] + [len(hashes) for hashes in group[:-1]])
+        flat = np.concatenate(group)[None, :]
+        permuted = a * flat
+        permuted += b
+        permuted >>= _HASH_SHIFT
+        signatures[start:stop] = np.minimum.reduceat(permuted, offsets, axis=1).T
+        start = stop
+    return signatures
+
+
+def band_keys(signatures, bands, rows):
+    """Hash each band of each signature to a uint64 bucket key; returns a `(n, bands)` array."""
+    banded = signatures[:, : bands * rows].astype(np.uint64).reshape(len(signatures), bands, rows)
+    keys = np.zeros((len(signatures), bands), dtype=np.uint64)
+    for row in range(rows):
+        keys = keys * _BAND_MULTIPLIER + banded[:, :, row]
+    return keys
+
+
+def merge_sorted_runs(keys_a, rows_a, keys_b, rows_b):
+    """Merge two `(bands, n)` bucket runs, each sorted by key per band, in linear time per band."""
+    bands, size_b = keys_b.shape
+    size = keys_a.shape[1] + size_b
+    keys = np.empty((bands, size), dtype=np.uint64)
+    rows = np.empty((bands, size), dtype=np.int64)
+    for band in range(bands):
+        # Entry j of run b lands after the entries of run a with keys <= its own, and after the j before it.
+        positions = np.searchsorted(keys_a[band], keys_b[band], side="right") + np.arange(size_b)
+        from_a = np.ones(size, dtype=bool)
+        from_a[positions] = False
+        keys[band, positions] = keys_b[band]
+        rows[band, positions] = rows_b[band]
+        keys[band, from_a] = keys_a[band]
+        rows[band, from_a] = rows_a[band]
+    return keys, rows
+
+
+def _sorted_run(keys, rows):
+    order = np.argsort(keys, axis=1, kind="stable")
+    return np.take_along_axis(keys, order, axis=1), np.take_along_axis(rows, order, axis=1)
+
+
+@lru_cache(maxsize=None)
+def optimal_bands_rows(threshold, num_perm, false_positive_weight=0.5, false_negative_weight=0.5):
+    """
+    Choose `(bands, rows)` with `bands * rows <= num_perm` minimising the weighted false positive and
+    false negative probability mass of the LSH S-curve around `threshold`.
+    """
+    below = np.linspace(0.0, threshold, 200)
+    above = np.linspace(threshold, 1.0, 200)
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positive = np.trapezoid(1 - (1 - below**rows) ** bands, below)
+            false_negative = np.trapezoid((1 - above**rows) ** bands, above)
+            error = false_positive_weight * false_positive + false_negative_weight * false_negative
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashLSH:
+    """
+    Banded LSH index over MinHash signatures, persistable as memory-mapped arrays.
+
+    Documents added since the last `save` are held in memory; `save` appends them to the on-disk tables.
+    """
+
+    def __init__(
+        self,
+        threshold=DEFAULT_THRESHOLD,
+        num_perm=DEFAULT_NUM_PERM,
+        bands=None,
+        rows=None,
+        shingle_size=DEFAULT_SHINGLE_SIZE,
+        seed=DEFAULT_SEED,
+    ):
+        if bands is None or rows is None:
+            bands, rows = optimal_bands_rows(threshold, num_perm)
+        if bands * rows > num_perm:
+            raise ValueError(f"bands * rows ({bands} * {rows}) exceeds num_perm ({num_perm})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+        self.seed = seed
+
+        self.doc_ids = []
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        # On-disk bucket segments: `(name, sorted keys, rows)`, each `(bands, n)` and memory-mapped.
+        self._segments = []
+        # Directory and `meta.json` contents of the on-disk index, once saved or loaded.
+        self._index_dir = None
+        self._meta = None
+        self._pending_signatures = []
+        self._pending_keys = []
+        self._pending_buckets = [{} for _ in range(bands)]
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    @property
+    def persisted_count(self):
+        return len(self._signatures)
+
+    def signatures(self, texts):
+        """Compute signatures for `texts` with this index's parameters."""
+        return minhash_signatures(texts, self.num_perm, self.shingle_size, self.seed)
+
+    def signature(self, row):
+        """Return the stored signature for index row `row`."""
+        if row < self.persisted_count:
+            return self._signatures[row]
+        return self._pending_signatures[row - self.persisted_count]
+
+    def add(self, doc_id, signature, keys=None):
+        """Add one document to the in-memory part of the index and return its row number."""
+        if keys is None:
+            keys = band_keys(signature[None, :], self.bands, self.rows)[0]
+        row = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self._pending_signatures.append(signature)
+        self._pending_keys.append(keys)
+        for band, key in enumerate(keys.tolist()):
+            self._pending_buckets[band].setdefault(key, []).append(row)
+        return row
+
+    def candidates(self, keys):
+        """
+        Return candidate row sets for a batch of band keys.
+
+        Args:
+            keys: `(n, bands)` array from `band_keys`.
+
+        Returns:
+            A list of `n` sets of row numbers sharing at least one band bucket.
+        """
+        found = self.persisted_candidates(keys)
+        for query, query_keys in enumerate(keys):
+            found[query].update(self.pending_candidates(query_keys))
+        return found
+
+    def persisted_candidates(self, keys):
+        """Look up a `(n, bands)` batch of band keys in the on-disk segments with one binary search per band."""
+        found = [set() for _ in range(len(keys))]
+        for _, segment_keys, segment_rows in self._segments:
+            for band in range(self.bands):
+                sorted_keys = segment_keys[band]
+                lo = np.searchsorted(sorted_keys, keys[:, band], side="left")
+                hi = np.searchsorted(sorted_keys, keys[:, band], side="right")
+                for query in np.flatnonzero(hi > lo):
+                    found[query].update(segment_rows[band, lo[query]:hi[query]].tolist())
+        return found
+
+    def pending_candidates(self, keys):
+        """Return rows added since the last save that share a bucket with one signature's band `keys`."""
+        found = set()
+        for band, key in enumerate(keys.tolist()):
+            found.update(self._pending_buckets[band].get(key, ()))
+        return found
+
+    def best_match(self, signature, rows):
+        """Return `(row, estimated Jaccard)` of the most similar candidate, or `(None, 0.0)`."""
+        if not rows:
+            return None, 0.0
+        rows = sorted(rows)
+        matrix = np.stack([self.signature(row) for row in rows])
+        similarity = (matrix == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        return rows[best], float(similarity[best])
+
+    def _meta_for(self, count, doc_ids_bytes, segments, next_segment):
+        return {
+            "format": INDEX_FORMAT,
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "rows": self.rows,
+            "shingle_size": self.shingle_size,
+            "seed": self.seed,
+            "count": count,
+            "doc_ids_bytes": doc_ids_bytes,
+            "segments": segments,
+            "next_segment": next_segment,
+        }
+
+    def save(self, index_dir):
+        """
+        Append pending documents to the on-disk index in `index_dir` and reopen it memory-mapped.
+
+        Saving to the directory the index was loaded from (or last saved to) only writes the new documents; saving
+        anywhere else writes a full copy.
+        """
+        index_dir = Path(index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+        total = len(self.doc_ids)
+        persisted = self.persisted_count
+        incremental = self._index_dir is not None and index_dir.resolve() == self._index_dir.resolve()
+        if incremental:
+            base, meta = persisted, self._meta
+            runs = [(name, size) for name, size in meta["segments"]]
+            next_segment = meta["next_segment"]
+            doc_ids_bytes = meta["doc_ids_bytes"]
+            # Release the signature map before appending to its file.
+            self._signatures = None
+        else:
+            base, runs, next_segment, doc_ids_bytes = 0, [], 0, 0
+
+        try:
+            doc_ids_bytes = self._append_rows(index_dir, base, doc_ids_bytes, incremental)
+        except BaseException:
+            if incremental:
+                self._signatures = self._map_signatures(index_dir, base)
+            raise
+
+        pending_keys = (
+            np.stack(self._pending_keys).T if self._pending_keys else np.empty((self.bands, 0), dtype=np.uint64)
+        )
+        new_keys, new_rows = _sorted_run(
+            pending_keys, np.broadcast_to(np.arange(persisted, total), pending_keys.shape)
+        )
+        segments = {name: (keys, rows) for name, keys, rows in self._segments}
+        if not incremental:
+            # A copy starts with all existing entries in one run.
+            for keys, rows in segments.values():
+                new_keys, new_rows = merge_sorted_runs(keys, rows, new_keys, new_rows)
+        elif new_keys.shape[1]:
+            while runs and runs[-1][1] <= SEGMENT_MERGE_RATIO * new_keys.shape[1]:
+                name, _ = runs.pop()
+                new_keys, new_rows = merge_sorted_runs(*segments[name], new_keys, new_rows)
+        if new_keys.shape[1]:
+            name = f"buckets-{next_segment:06d}"
+            next_segment += 1
+            np.save(index_dir / f"{name}.keys.npy", new_keys)
+            np.save(index_dir / f"{name}.rows.npy", new_rows)
+            runs.append((name, new_keys.shape[1]))
+
+        meta = self._meta_for(total, doc_ids_bytes, runs, next_segment)
+        (index_dir / f"{META_FILE}.tmp").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        os.replace(index_dir / f"{META_FILE}.tmp", index_dir / META_FILE)
+        # Release maps of merged segments before their files are deleted.
+        self._segments = []
+        del segments
+        self._open(index_dir, meta)
+        self._remove_unreferenced_segments(index_dir, meta)
+        logger.info("Saved MinHash index with %d documents to %s", total, index_dir)
+
+    def _append_rows(self, index_dir, base, doc_ids_bytes, incremental):
+        """Append the pending signatures and ids after the first `base` rows; returns the new doc id byte length."""
+        row_bytes = self.num_perm * np.dtype(np.uint32).itemsize
+        with open(index_dir / SIGNATURES_FILE, "r+b" if incremental else "wb") as handle:
+            # Drop bytes appended by an interrupted save, then append.
+            handle.truncate(base * row_bytes)
+            handle.seek(0, os.SEEK_END)
+            if not incremental and self.persisted_count:
+                np.ascontiguousarray(self._signatures).tofile(handle)
+            if self._pending_signatures:
+                np.stack(self._pending_signatures).astype(np.uint32, copy=False).tofile(handle)
+        with open(index_dir / DOC_IDS_FILE, "r+b" if incremental else "wb") as handle:
+            handle.truncate(doc_ids_bytes)
+            handle.seek(0, os.SEEK_END)
+            handle.write("".join(json.dumps(doc_id) + "\n" for doc_id in self.doc_ids[base:]).encode("utf-8"))
+            return handle.tell()
+
+    def _map_signatures(self, index_dir, count):
+        if not count:
+            return np.empty((0, self.num_perm), dtype=np.uint32)
+        return np.memmap(index_dir / SIGNATURES_FILE, dtype=np.uint32, mode="r", shape=(count, self.num_perm))
+
+    @staticmethod
+    def _remove_unreferenced_segments(index_dir, meta):
+        referenced = {name for name, _ in meta["segments"]}
+        for path in index_dir.glob("buckets-*.npy"):
+            if path.name.split(".", 1)[0] not in referenced:
+                try:
+                    path.unlink()
+                except OSError as exc:
+                    # Still mapped elsewhere (e.g., another process on Windows): removed by a later save.
+                    logger.debug("Could not remove %s: %s", path, exc)
+
+    def _open(self, index_dir, meta):
+        self._signatures = self._map_signatures(index_dir, meta["count"])
+        self._segments = [
+            (
+                name,
+                np.load(index_dir / f"{name}.keys.npy", mmap_mode="r"),
+                np.load(index_dir / f"{name}.rows.npy", mmap_mode="r"),
+            )
+            for name, _ in meta["segments"]
+        ]
+        self._index_dir = index_dir
+        self._meta = meta
+        self._pending_signatures = []
+        self._pending_keys = []
+        self._pending_buckets = [{} for _ in range(self.bands)]
+
+    @classmethod
+    def load(cls, index_dir):
+        """Open a saved index; signature and bucket tables are memory-mapped, not read into memory."""
+        index_dir = Path(index_dir)
+        meta = json.loads((index_dir / META_FILE).read_text(encoding="utf-8"))
+        if meta.get("format") != INDEX_FORMAT:
+            raise ValueError(f"{index_dir}: unsupported MinHash index format; rebuild the index")
+        index = cls(
+            threshold=meta["threshold"],
+            num_perm=meta["num_perm"],
+            bands=meta["bands"],
+            rows=meta["rows"],
+            shingle_size=meta["shingle_size"],
+            seed=meta["seed"],
+        )
+        with open(index_dir / DOC_IDS_FILE, "rb") as handle:
+            # Bytes past `doc_ids_bytes` belong to an interrupted save.
+            lines = handle.read(meta["doc_ids_bytes"]).decode("utf-8").splitlines()
+        index.doc_ids = [json.loads(line) for line in lines]
+        index._open(index_dir, meta)
+        return index
+
+
+def deduplicate_documents(documents, index=None, batch_size=1024):
+    """
+    Yield documents that are not near-duplicates of an indexed document or of an earlier document in the stream.
+
+    Kept documents are added to `index`; call `index.save(...)` afterwards to persist them for later batches.
+
+    Args:
+        documents: Iterable of `Document` records.
+        index: A `MinHashLSH` index; a fresh in-memory index is used when omitted.
+        batch_size: Documents hashed per vectorised batch.
+    """
+    index = MinHashLSH() if index is None else index
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield from _deduplicate_batch(batch, index)
+            batch = []
+    if batch:
+        yield from _deduplicate_batch(batch, index)
+
+
+def _deduplicate_batch(batch, index):
+    metrics = get_metrics()
+    kept = []
+    with metrics.timer(DEDUPLICATION_STAGE, sum(len(document.text) for document in batch), len(batch)):
+        signatures = index.signatures([document.text for document in batch])
+        keys = band_keys(signatures, index.bands, index.rows)
+        # On-disk buckets are searched for the whole batch at once; pending buckets are checked per document so that
+        # duplicates within the batch are caught as earlier documents are added.
+        persisted = index.persisted_candidates(keys)
+        for document, signature, doc_keys, candidates in zip(batch, signatures, keys, persisted):
+            candidates.update(index.pending_candidates(doc_keys))
+            match, similarity = index.best_match(signature, candidates)
+            if match is not None and similarity >= index.threshold:
+                logger.debug(
+                    "Dropped %s: near-duplicate of %s (%.2f)", document.doc_id, index.doc_ids[match], similarity
+                )
+                continue
+            index.add(document.doc_id, signature, doc_keys)
+            kept.append(document)
+    metrics.count(DEDUPLICATION_STAGE, dropped=len(batch) - len(kept))
+    return kept
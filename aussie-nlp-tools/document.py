@@ -0,0 +1,81 @@
+"""
+Module: document.py
+
+Purpose:
+- Defines the `Document` record that flows between pipeline stages in memory.
+- Replaces the file-per-stage handoff: loaders yield Documents, cleaning and tokenising stages transform them,
+  and files are only written at configured checkpoints.
+
+Frameworks/Tools:
+- Built-in Python `dataclasses` and `pathlib`.
+
+Expected Inputs:
+- Text and provenance produced by the loader modules in `data_loader/`.
+
+Expected Outputs:
+- `Document` instances, and checkpoint files written by `write_checkpoint`.
+"""
+
+import dataclasses
+import re
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from constants import FILETYPE_TEXT
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]+")
+
+
+@dataclass
+class Document:
+    """
+    A single unit of text moving through the pipeline.
+
+    Attributes:
+        doc_id: Stable identifier; `<file stem>` for single-document files, `<file stem>:<n>` for record-based files,
+            or prefixed by the file's path relative to the raw directory in batch runs (e.g., "news/index.html").
+        text: Current text content.
+        source: Path of the raw file the document was loaded from.
+        filetype: File type code from `constants.py`.
+        metadata: Free-form metadata (e.g., record fields, URL, author).
+        tokens: Token output, populated by the tokenising sub-pipeline.
+    """
+
+    doc_id: str
+    text: str
+    source: str = ""
+    filetype: int = FILETYPE_TEXT
+    metadata: dict = field(default_factory=dict)
+    tokens: list = None
+
+    @property
+    def filename_stem(self):
+        """
+        `doc_id` made safe for use as a file name.
+
+        Ids containing a path separator also get a hash of the full id, so "a/b.txt" and a file named "a_b.txt" do
+        not share output files.
+        """
+        stem = _UNSAFE_FILENAME_CHARS.sub("_", self.doc_id)
+        if "/" in self.doc_id:
+            stem += f"-{zlib.crc32(self.doc_id.encode('utf-8')):08x}"
+        return stem
+
+    def replace(self, **changes):
+        """Return a copy of the document with `changes` applied."""
+        return dataclasses.replace(self, **changes)
+
+
+def write_checkpoint(document, directory, suffix):
+    """
+    Write a document's text to `<directory>/<doc_id>_<suffix>.txt`.
+
+    Returns:
+        The path written.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{document.filename_stem}_{suffix}.txt"
+    path.write_text(document.text, encoding="utf-8")
+    return path
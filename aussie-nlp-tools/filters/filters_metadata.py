@@ -1 +1,296 @@
-"""Filters metadata (e.g., timestamps, author info)."""
\ No newline at end of file
+"""
+Module: filters_metadata.py
+
+Purpose:
+- Filters metadata (e.g., timestamps, author info): keeps or drops records by predicates over their metadata fields,
+  such as a publication date range, an author block list or an allowed set of sources.
+
+Frameworks/Tools:
+- `pandas` and `numpy` for column-wise predicate evaluation over record batches; `re` for pattern predicates.
+
+Expected Inputs:
+- Record batches as `pandas` DataFrames (one column per metadata field), or `Document` streams whose metadata (or
+  `source`, `doc_id` and `filetype` attributes) holds the fields.
+- Predicates: `DateRange`, `ValueIn` and `Matches`, combined with AND by a `MetadataFilter`.
+
+Expected Outputs:
+- A boolean keep-mask per batch, or the kept documents.
+- Per-rule counts (`MetadataFilter.hit_counts`): records each predicate rejected, and records only that predicate
+  rejected (those a rule's removal would let through), so rules can be tuned without rerunning the corpus. Counts
+  are mergeable across workers.
+
+Behavior:
+- Each predicate evaluates a whole column at once and returns a boolean array: the column is factorised, the test
+  (date parse, set lookup, regex search) runs once per distinct value, and results are mapped back to records with a
+  NumPy take. Metadata values repeat heavily within a batch (a few sources, authors and dates), so the per-record cost
+  is array operations only. The filter stacks them into a `(rules, records)` matrix, so the keep-mask and all counts
+  are reductions over that matrix rather than per-record Python calls.
+- Date ranges are inclusive at both ends (an `end` date without a time includes that whole day) and compared in
+  UTC; dates are parsed as ISO 8601 by default (`datetime.fromisoformat`), and naive dates are taken as UTC.
+- `ValueIn` compares case-insensitively by default; `exclude` turns it into a block list.
+- Records missing a field (or with an unparseable date) fail that predicate unless it sets `keep_missing`.
+- Dropped documents are counted against the `filters_metadata` stage in the pipeline metrics.
+
+Planned Test Approach:
+- Verify each predicate on valid, missing and malformed values.
+- Verify the combined mask and the per-rule rejected/only-rule counts, merging, and document batching.
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from utils.logging import get_metrics
+
+STAGE = "filters_metadata"
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_DATE_FORMAT = "ISO8601"
+# Document attributes that can be filtered on like metadata fields.
+DOCUMENT_FIELDS = ("doc_id", "source", "filetype")
+_EPOCH = pd.Timestamp(0, tz="UTC")
+
+
+def _utc(value):
+    if value is None:
+        return None
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+
+
+def _hashable(value):
+    """Return `value`, with lists, dicts and sets (e.g., from JSON records) as JSON text so they can be factorised."""
+    if isinstance(value, (list, dict, set, tuple)):
+        if isinstance(value, set):
+            value = sorted(value, key=str)
+        return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return value
+
+
+def _factorize(column):
+    try:
+        return pd.factorize(column)
+    except TypeError:
+        # Unhashable values in a frame built by the caller.
+        return pd.factorize(column.map(_hashable))
+
+
+def _per_value(column, func, dtype, missing):
+    """Apply `func` to each distinct value of `column` and map the results back to records (`missing` where NaN)."""
+    codes, uniques = _factorize(column)
+    results = np.fromiter(map(func, uniques), dtype=dtype, count=len(uniques))
+    # Missing values have code -1: append `missing` so they map to it.
+    return np.append(results, np.array(missing, dtype=dtype))[codes]
+
+
+def _iso_seconds(value):
+    """Return POSIX seconds for an ISO 8601 string or a datetime (naive taken as UTC), NaN if neither."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return np.nan
+    elif not isinstance(value, datetime):
+        return np.nan
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def date_seconds(column, date_format=DEFAULT_DATE_FORMAT):
+    """
+    Return POSIX seconds (NaN where missing or unparseable) for a column of dates.
+
+    Values are factorised and each distinct value is parsed once: metadata dates repeat heavily within a batch, and
+    parsing dominates the cost. ISO 8601 strings are parsed with `datetime.fromisoformat`, which handles UTC offsets
+    far faster than `pd.to_datetime`; other formats go through `pd.to_datetime`.
+    """
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return ((pd.to_datetime(column, utc=True) - _EPOCH) / pd.Timedelta(seconds=1)).to_numpy(dtype=float)
+    if date_format == DEFAULT_DATE_FORMAT:
+        return _per_value(column, _iso_seconds, float, np.nan)
+    codes, uniques = _factorize(column)
+    dates = pd.to_datetime(pd.Series(uniques, dtype="object"), errors="coerce", utc=True, format=date_format)
+    seconds = ((dates - _EPOCH) / pd.Timedelta(seconds=1)).to_numpy(dtype=float)
+    return np.append(seconds, np.nan)[codes]
+
+
+def _column(frame, field):
+    if field in frame:
+        return frame[field]
+    return pd.Series(None, index=frame.index, dtype="object")
+
+
+class DateRange:
+    """Keep records whose `field` date lies within `[start, end]` (either bound may be None)."""
+
+    def __init__(self, field, start=None, end=None, keep_missing=False, date_format=DEFAULT_DATE_FORMAT, name=None):
+        self.field = field
+        self.start = _utc(start)
+        self.end = _utc(end)
+        # An end at midnight (e.g., a date without a time) includes that whole day.
+        whole_day = self.end is not None and self.end == self.end.normalize()
+        self.before = self.end + pd.Timedelta(days=1) if whole_day else None
+        # Bounds as POSIX seconds, computed as the column values are, so equal instants compare equal.
+        self.bounds = [
+            None if bound is None else _iso_seconds(bound.to_pydatetime())
+            for bound in (self.start, self.end, self.before)
+        ]
+        self.keep_missing = keep_missing
+        self.date_format = date_format
+        self.name = name or f"{field} {start or ''}..{end or ''}"
+
+    def evaluate(self, frame):
+        seconds = date_seconds(_column(frame, self.field), self.date_format)
+        start, end, before = self.bounds
+        keep = np.ones(len(frame), dtype=bool)
+        if start is not None:
+            keep &= seconds >= start
+        if before is not None:
+            keep &= seconds < before
+        elif end is not None:
+            keep &= seconds <= end
+        keep[np.isnan(seconds)] = self.keep_missing
+        return keep
+
+
+class ValueIn:
+    """Keep records whose `field` is one of `values` (or, with `exclude`, is none of them)."""
+
+    def __init__(self, field, values, exclude=False, case_sensitive=False, keep_missing=False, name=None):
+        self.field = field
+        self.case_sensitive = case_sensitive
+        self.values = {value if case_sensitive else str(value).casefold() for value in values}
+        self.exclude = exclude
+        self.keep_missing = keep_missing
+        shown = ", ".join(sorted(map(str, self.values))[:3]) + (", ..." if len(self.values) > 3 else "")
+        self.name = name or f"{field} {'not in' if exclude else 'in'} {{{shown}}}"
+
+    def _contains(self, value):
+        return (value if self.case_sensitive else str(value).casefold()) in self.values
+
+    def evaluate(self, frame):
+        column = _column(frame, self.field)
+        found = _per_value(column, self._contains, bool, False)
+        keep = found != self.exclude
+        keep[column.isna().to_numpy()] = self.keep_missing
+        return keep
+
+
+class Matches:
+    """Keep records whose `field` contains a match for the regex `pattern` (or, with `exclude`, does not)."""
+
+    def __init__(self, field, pattern, exclude=False, case_sensitive=False, keep_missing=False, name=None):
+        self.field = field
+        self.pattern = pattern
+        self.exclude = exclude
+        self.case_sensitive = case_sensitive
+        self.keep_missing = keep_missing
+        self.regex = re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+        self.name = name or f"{field} {'!~' if exclude else '~'} {pattern}"
+
+    def _search(self, value):
+        return self.regex.search(str(value)) is not None
+
+    def evaluate(self, frame):
+        column = _column(frame, self.field)
+        found = _per_value(column, self._search, bool, False)
+        keep = found != self.exclude
+        keep[column.isna().to_numpy()] = self.keep_missing
+        return keep
+
+
+class MetadataFilter:
+    """
+    AND of metadata predicates evaluated over record batches, with per-rule counts.
+
+    Args:
+        rules: Predicates with a `name` and an `evaluate(frame)` method returning a boolean array.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        names = [rule.name for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Metadata rule names must be unique")
+        self.records = 0
+        self.kept = 0
+        self.rejected = np.zeros(len(self.rules), dtype=np.int64)
+        self.only_rule = np.zeros(len(self.rules), dtype=np.int64)
+
+    @property
+    def fields(self):
+        return sorted({rule.field for rule in self.rules})
+
+    def mask(self, frame):
+        """Return a boolean keep-mask for the records of `frame`, counting rejections per rule."""
+        if not self.rules:
+            keep = np.ones(len(frame), dtype=bool)
+        else:
+            passed = np.vstack([rule.evaluate(frame) for rule in self.rules])
+            failures = ~passed
+            failed_rules = failures.sum(axis=0)
+            keep = failed_rules == 0
+            self.rejected += failures.sum(axis=1)
+            self.only_rule += (failures & (failed_rules == 1)).sum(axis=1)
+        self.records += len(frame)
+        self.kept += int(keep.sum())
+        return keep
+
+    def hit_counts(self):
+        """Return `{rule name: {"rejected": n, "only_rule": n}}` plus the record and kept totals."""
+        counts = {
+            rule.name: {"rejected": int(rejected), "only_rule": int(only)}
+            for rule, rejected, only in zip(self.rules, self.rejected, self.only_rule)
+        }
+        return {"records": self.records, "kept": self.kept, "rules": counts}
+
+    def merge(self, other):
+        """Add the counts of a filter with the same rules, e.g. from another worker."""
+        if [rule.name for rule in other.rules] != [rule.name for rule in self.rules]:
+            raise ValueError("Cannot merge metadata filters with different rules")
+        self.records += other.records
+        self.kept += other.kept
+        self.rejected += other.rejected
+        self.only_rule += other.only_rule
+        return self
+
+
+def records_frame(documents, fields):
+    """
+    Return a DataFrame with one row per document and one column per field (metadata, else attribute).
+
+    Container values are stored as JSON text, so `Matches` can search them and they never break factorising.
+    Columns keep object dtype, so an integer column with missing values stays integer rather than becoming float.
+    """
+    columns = {}
+    for field in fields:
+        if field in DOCUMENT_FIELDS:
+            values = (document.metadata.get(field, getattr(document, field)) for document in documents)
+        else:
+            values = (document.metadata.get(field) for document in documents)
+        columns[field] = pd.Series([_hashable(value) for value in values], dtype="object")
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(documents)))
+
+
+def filter_metadata(documents, metadata_filter, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield the documents that pass `metadata_filter`, evaluated in batches."""
+    metrics = get_metrics()
+    fields = metadata_filter.fields
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield from _filter_batch(batch, metadata_filter, fields, metrics)
+            batch = []
+    if batch:
+        yield from _filter_batch(batch, metadata_filter, fields, metrics)
+
+
+def _filter_batch(batch, metadata_filter, fields, metrics):
+    with metrics.timer(STAGE, documents=len(batch)):
+        keep = metadata_filter.mask(records_frame(batch, fields))
+    metrics.count(STAGE, dropped=int(len(batch) - keep.sum()))
+    return [document for document, kept in zip(batch, keep) if kept]
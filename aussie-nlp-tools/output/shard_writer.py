@@ -0,0 +1,263 @@
+"""
+Module: shard_writer.py
+
+Purpose:
+- Shared machinery for the streaming dataset writers (`write_json.py`, `write_csv.py`): size-bounded output shards,
+  optional compression, background flushing and per-record offset indexes.
+
+Frameworks/Tools:
+- Built-in Python `gzip`, `bz2`, `lzma`, `queue` and `threading`; `numpy` for the offset indexes.
+
+Expected Inputs:
+- Records (`Document`s or dicts) passed to `write`, and a subclass `serialise` method turning a record into text.
+
+Expected Outputs:
+- Shards named "<prefix>-00000.<suffix>[.gz|.bz2|.xz]" in the output directory, each rolled over once it holds
+  `max_shard_bytes` of uncompressed data.
+- A record index per shard ("<shard>.idx.npy") and a dataset manifest ("<prefix>.manifest.json").
+
+Behavior:
+- Double buffering: `write` appends to an in-memory block; a full block is handed to a background thread that
+  serialises, compresses and writes it while the caller fills the next block. At most one block waits in the
+  hand-off queue, bounding memory and applying backpressure when the disk falls behind.
+- Each block is compressed as an independent member (gzip members, bz2 and xz streams), which standard
+  decompressors read back as one stream. The index records, for every record, its block's byte offset and length in
+  the shard and the record's offset and length within the decompressed block, so `read_records` can seek to any
+  record and decompress only its block.
+
+Planned Test Approach:
+- Verify shard rollover, manifest contents and that every compression mode round-trips through a plain reader.
+- Verify random access through the index matches sequential reading.
+- Verify that errors on the writer thread are raised to the caller.
+"""
+
+import abc
+import bz2
+import gzip
+import json
+import lzma
+import os
+import queue
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from utils.logging import get_logger
+
+logger = get_logger("shard_writer")
+
+DEFAULT_MAX_SHARD_BYTES = 256 * 1024 * 1024
+DEFAULT_BLOCK_RECORDS = 1000
+
+# Compression name -> (file extension, compress function, decompress function).
+COMPRESSION = {
+    None: ("", None, None),
+    "gzip": (".gz", lambda data: gzip.compress(data, compresslevel=6), gzip.decompress),
+    "bz2": (".bz2", bz2.compress, bz2.decompress),
+    "lzma": (".xz", lzma.compress, lzma.decompress),
+}
+INDEX_SUFFIX = ".idx.npy"
+INDEX_DTYPE = np.dtype(
+    [("block_offset", "<u8"), ("block_length", "<u8"), ("record_offset", "<u8"), ("record_length", "<u8")]
+)
+
+_STOP = None
+
+
+def _atomic_write_text(path, text):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    os.replace(tmp, path)
+
+
+class ShardedWriter(abc.ABC):
+    """
+    Base class for streaming, sharded, optionally compressed text writers with a background writer thread.
+
+    Subclasses implement `serialise(record) -> str` (one line including its newline) and may override `header()` for
+    text written at the start of every shard; a subclass without `serialise` cannot be created. Use as a context
+    manager or call `close` when done.
+    """
+
+    format_name = "text"
+    suffix = ".txt"
+
+    def __init__(
+        self,
+        output_dir,
+        prefix="part",
+        max_shard_bytes=DEFAULT_MAX_SHARD_BYTES,
+        compression=None,
+        block_records=DEFAULT_BLOCK_RECORDS,
+    ):
+        if compression not in COMPRESSION:
+            choices = sorted(name for name in COMPRESSION if name)
+            raise ValueError(f"Unknown compression {compression!r}; expected one of {choices}")
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_shard_bytes = max_shard_bytes
+        self.compression = compression
+        self.block_records = block_records
+        self.shards = []
+        self._extension, self._compress, _ = COMPRESSION[compression]
+        self._buffer = []
+        self._handoff = queue.Queue(maxsize=1)
+        self._error = None
+        self._handle = None
+        self._thread = threading.Thread(target=self._run, name=f"{prefix}-writer", daemon=True)
+        self._thread.start()
+
+    @abc.abstractmethod
+    def serialise(self, record):
+        """Return `record` as one line of output, including its newline."""
+
+    def header(self):
+        return None
+
+    def write(self, record):
+        """Buffer `record`; full blocks are flushed by the background thread."""
+        if self._error is not None:
+            raise self._error
+        self._buffer.append(record)
+        if len(self._buffer) >= self.block_records:
+            self._handoff.put(self._buffer)
+            self._buffer = []
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+        return self
+
+    def close(self):
+        """Flush buffered records, finish the last shard, write the manifest and stop the writer thread."""
+        if self._buffer:
+            self._handoff.put(self._buffer)
+            self._buffer = []
+        self._handoff.put(_STOP)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        self._write_manifest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    @property
+    def manifest_path(self):
+        return self.output_dir / f"{self.prefix}.manifest.json"
+
+    # Writer thread.
+
+    def _run(self):
+        stopped = False
+        try:
+            while True:
+                block = self._handoff.get()
+                if block is _STOP:
+                    stopped = True
+                    break
+                self._write_block(block)
+            self._finish_shard()
+        except Exception as exc:
+            logger.error("Writer thread failed: %s", exc)
+            self._error = exc
+            # Keep accepting blocks until `close` so the caller never blocks on a dead thread.
+            while not stopped:
+                stopped = self._handoff.get() is _STOP
+            if self._handle is not None:
+                self._handle.close()
+
+    def _open_shard(self):
+        name = f"{self.prefix}-{len(self.shards):05d}{self.suffix}{self._extension}"
+        self._handle = open(self.output_dir / name, "wb")
+        self._index = []
+        self._shard_bytes = 0
+        self.shards.append({"path": name, "index": name + INDEX_SUFFIX, "records": 0, "bytes": 0})
+        header = self.header()
+        if header:
+            self._emit([header.encode("utf-8")], records=False)
+
+    def _finish_shard(self):
+        if self._handle is None:
+            return
+        self._handle.close()
+        self._handle = None
+        shard = self.shards[-1]
+        shard["compressed_bytes"] = (self.output_dir / shard["path"]).stat().st_size
+        np.save(self.output_dir / shard["index"], np.array(self._index, dtype=INDEX_DTYPE))
+
+    def _write_block(self, block):
+        pending = []
+        pending_bytes = 0
+        for record in block:
+            data = self.serialise(record).encode("utf-8")
+            if self._handle is None:
+                self._open_shard()
+            if pending and self._shard_bytes + pending_bytes + len(data) > self.max_shard_bytes:
+                self._emit(pending)
+                pending, pending_bytes = [], 0
+            if self.shards[-1]["records"] and self._shard_bytes + len(data) > self.max_shard_bytes:
+                self._finish_shard()
+                self._open_shard()
+            pending.append(data)
+            pending_bytes += len(data)
+        if pending:
+            self._emit(pending)
+
+    def _emit(self, items, records=True):
+        """Write `items` as one (optionally compressed) block and index its records."""
+        raw = b"".join(items)
+        block = self._compress(raw) if self._compress else raw
+        block_offset = self._handle.tell()
+        self._handle.write(block)
+        self._shard_bytes += len(raw)
+        shard = self.shards[-1]
+        shard["bytes"] += len(raw)
+        if not records:
+            return
+        offset = 0
+        for item in items:
+            self._index.append((block_offset, len(block), offset, len(item)))
+            offset += len(item)
+        shard["records"] += len(items)
+
+    def _write_manifest(self):
+        manifest = {
+            "format": self.format_name,
+            "compression": self.compression,
+            "records": sum(shard["records"] for shard in self.shards),
+            "shards": self.shards,
+        }
+        _atomic_write_text(self.manifest_path, json.dumps(manifest, indent=2))
+        logger.info("Wrote %d records in %d shards to %s", manifest["records"], len(self.shards), self.output_dir)
+
+
+def read_records(shard_path, positions, compression=None):
+    """
+    Return the raw text of the records at `positions` in a shard, decompressing only the blocks that hold them.
+
+    Args:
+        shard_path: Path of a shard written by a `ShardedWriter`.
+        positions: Record numbers within the shard.
+        compression: The shard's compression (as listed in the manifest).
+    """
+    decompress = COMPRESSION[compression][2]
+    index = np.load(f"{shard_path}{INDEX_SUFFIX}", mmap_mode="r")
+    records = []
+    cached_offset, cached_block = None, None
+    with open(shard_path, "rb") as handle:
+        for position in positions:
+            block_offset, block_length, record_offset, record_length = (int(value) for value in index[position])
+            if block_offset != cached_offset:
+                handle.seek(block_offset)
+                data = handle.read(block_length)
+                cached_offset, cached_block = block_offset, decompress(data) if decompress else data
+            records.append(cached_block[record_offset:record_offset + record_length].decode("utf-8"))
+    return records
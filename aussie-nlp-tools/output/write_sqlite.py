@@ -1 +1,228 @@
-"""Saves data to SQLite databases."""
\ No newline at end of file
+"""
+Module: write_sqlite.py
+
+Purpose:
+- Saves data to SQLite databases.
+- Bulk-loads processed `Document` records into a single database file for querying and dataset generation.
+
+Frameworks/Tools:
+- Built-in Python `sqlite3`, `queue` and `threading`.
+
+Expected Inputs:
+- A stream of `Document` records (typically tokenised output) and a database path (e.g., "data/generated/corpus.db").
+
+Expected Outputs:
+- A `documents` table with one row per document: `doc_id` (primary key), `source`, `filetype` (the integer code
+  from `constants.py`), `text`, and `metadata` and `tokens` as JSON text.
+
+Behavior:
+- Opens the database in WAL journal mode with `synchronous=NORMAL` and a large page cache, so commits do not wait on
+  a full sync and readers are not blocked by the writer.
+- Inserts rows with `executemany` in batches of `batch_size`, one explicit transaction per batch.
+- Secondary indexes are dropped before a load and created once it finishes, instead of being updated row by row.
+- Rows are upserted on `doc_id`, so rerunning a load replaces earlier rows.
+- `SQLiteWriter` owns the only connection and runs on a background thread fed by a queue: any number of producer
+  threads (or processes, given a `multiprocessing` queue) call `put` without contending for the database lock.
+
+Planned Test Approach:
+- Verify rows, JSON columns and upserts round-trip through the database.
+- Verify that indexes exist after a load and that the journal mode is WAL.
+- Verify that concurrent producers all land in the database and that writer errors are raised on `close`.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+
+from utils.logging import get_logger
+
+logger = get_logger("write_sqlite")
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_QUEUE_SIZE = 10_000
+# Seconds the writer thread waits for more rows before committing a partial batch.
+FLUSH_INTERVAL = 1.0
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB
+)
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    source TEXT,
+    filetype INTEGER,
+    text TEXT,
+    metadata TEXT,
+    tokens TEXT
+)
+"""
+INSERT_ROW = (
+    "INSERT OR REPLACE INTO documents (doc_id, source, filetype, text, metadata, tokens) VALUES (?, ?, ?, ?, ?, ?)"
+)
+# Secondary indexes, built after the bulk load.
+INDEXES = {
+    "idx_documents_source": "CREATE INDEX IF NOT EXISTS idx_documents_source ON documents (source)",
+    "idx_documents_filetype": "CREATE INDEX IF NOT EXISTS idx_documents_filetype ON documents (filetype)",
+}
+
+_STOP = None
+
+
+def document_row(document):
+    """Convert a `Document` into a `documents` table row."""
+    tokens = None if document.tokens is None else json.dumps(document.tokens, ensure_ascii=False)
+    return (
+        document.doc_id,
+        document.source,
+        document.filetype,
+        document.text,
+        json.dumps(document.metadata, ensure_ascii=False),
+        tokens,
+    )
+
+
+def connect(db_path):
+    """Open `db_path` with bulk-load pragmas and explicit transaction control."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    for pragma in PRAGMAS:
+        connection.execute(pragma)
+    connection.execute(CREATE_TABLE)
+    return connection
+
+
+def drop_indexes(connection):
+    for name in INDEXES:
+        connection.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def create_indexes(connection):
+    for statement in INDEXES.values():
+        connection.execute(statement)
+
+
+def insert_batch(connection, rows):
+    """Insert `rows` in a single transaction."""
+    connection.execute("BEGIN")
+    try:
+        connection.executemany(INSERT_ROW, rows)
+    except Exception:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def write_documents(documents, db_path, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Bulk-load `documents` into the database at `db_path` from the calling thread.
+
+    Returns:
+        The number of rows written.
+    """
+    connection = connect(db_path)
+    written = 0
+    try:
+        drop_indexes(connection)
+        batch = []
+        for document in documents:
+            batch.append(document_row(document))
+            if len(batch) >= batch_size:
+                insert_batch(connection, batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            insert_batch(connection, batch)
+            written += len(batch)
+        create_indexes(connection)
+    finally:
+        connection.close()
+    return written
+
+
+class SQLiteWriter:
+    """
+    Single writer thread that drains a queue of documents into SQLite in batched transactions.
+
+    Use as a context manager, or call `start` and `close`:
+
+        with SQLiteWriter(GENERATED_DIR / "corpus.db") as writer:
+            for document in documents:
+                writer.put(document)
+    """
+
+    def __init__(self, db_path, batch_size=DEFAULT_BATCH_SIZE, queue_size=DEFAULT_QUEUE_SIZE, row_queue=None):
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        # A bounded queue applies backpressure to producers that outpace the writer.
+        self.queue = row_queue if row_queue is not None else queue.Queue(maxsize=queue_size)
+        self.written = 0
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def put(self, document):
+        """Queue a document for writing; blocks while the queue is full."""
+        if self._error is not None:
+            raise self._error
+        self.queue.put(document_row(document))
+
+    def close(self):
+        """Flush queued rows, build indexes and stop the writer thread, re-raising any writer error."""
+        self.queue.put(_STOP)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        logger.info("Wrote %d rows to %s", self.written, self.db_path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    def _flush(self, connection, batch):
+        if batch:
+            insert_batch(connection, batch)
+            self.written += len(batch)
+            batch.clear()
+
+    def _run(self):
+        connection = None
+        batch = []
+        stopped = False
+        try:
+            connection = connect(self.db_path)
+            drop_indexes(connection)
+            while True:
+                try:
+                    row = self.queue.get(timeout=FLUSH_INTERVAL if batch else None)
+                except queue.Empty:
+                    # Producers are idle: commit what we have so readers see it.
+                    self._flush(connection, batch)
+                    continue
+                if row is _STOP:
+                    stopped = True
+                    break
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    self._flush(connection, batch)
+            self._flush(connection, batch)
+            create_indexes(connection)
+        except Exception as exc:
+            logger.error("SQLite writer failed: %s", exc)
+            self._error = exc
+            # Keep draining until `close` so producers blocked on a full queue are released.
+            while not stopped:
+                stopped = self.queue.get() is _STOP
+        finally:
+            if connection is not None:
+                connection.close()
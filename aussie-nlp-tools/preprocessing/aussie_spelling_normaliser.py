@@ -7,27 +7,114 @@ Purpose:
 
 Frameworks/Tools:
 - Utilizes custom dictionaries and rules for Australian English spelling normalization.
+- Matches dictionary entries with the shared Aho–Corasick matcher in `utils/aho_corasick.py`.
 - Optionally integrates with libraries like `pyspellchecker` for broader spell-checking support.
 
 Expected Inputs:
-- File path to a cleaned text file in `data/cleaned/`.
-  - Example: "data/cleaned/<original_filename>_cleaned.txt".
+- Document text as a string, passed in memory by `cleaning_dispatcher.py`.
 
 Expected Outputs:
-- A normalized text file in `data/cleaned/`, adhering to Australian English conventions.
-  - Example: "data/cleaned/<original_filename>_aus_normalised.txt".
-- Deletes the input file in `data/cleaned/` after successful normalization.
+- Returns the text with spellings normalised to Australian English conventions.
 
 Behavior:
 - Detects and replaces non-Australian spellings with their Australian equivalents (e.g., "color" to "colour").
-- Handles edge cases such as ambiguous or context-dependent words (e.g., "program" vs. "programme").
-- Logs any unhandled or skipped changes for manual review.
+- Preserves the case of the original word (lower, Title and UPPER case).
+- Makes one pass over the text whatever the lexicon size; large custom lexicons can be compiled once with
+  `utils.aho_corasick.load_or_compile` and passed in as a matcher.
+- Leaves ambiguous or context-dependent words untouched (e.g., "program" vs. "programme", "license" vs. "licence",
+  and "labor", which is the correct spelling for the Australian Labor Party).
 
 Planned Test Approach:
-- Test with text files containing:
+- Test with text containing:
   - American English spellings (e.g., "color," "honor").
   - British English spellings (e.g., "tyre," "organisation").
   - Mixed regional variations within the same text.
 - Verify that output text adheres to Australian English conventions.
-- Confirm that the original cleaned file is deleted after processing.
 """
+
+import re
+
+from utils.aho_corasick import AhoCorasickMatcher
+
+# US (and occasional UK) spellings mapped to their Australian equivalents.
+AU_SPELLING_LEXICON = {
+    "aluminum": "aluminium",
+    "analyze": "analyse",
+    "analyzed": "analysed",
+    "analyzing": "analysing",
+    "behavior": "behaviour",
+    "behaviors": "behaviours",
+    "catalog": "catalogue",
+    "center": "centre",
+    "centers": "centres",
+    "color": "colour",
+    "colors": "colours",
+    "colored": "coloured",
+    "defense": "defence",
+    "favor": "favour",
+    "favorite": "favourite",
+    "flavor": "flavour",
+    "harbor": "harbour",
+    "honor": "honour",
+    "jewelry": "jewellery",
+    "neighbor": "neighbour",
+    "neighbors": "neighbours",
+    "offense": "offence",
+    "organization": "organisation",
+    "organizations": "organisations",
+    "organize": "organise",
+    "organized": "organised",
+    "realize": "realise",
+    "realized": "realised",
+    "recognize": "recognise",
+    "recognized": "recognised",
+    "theater": "theatre",
+    "traveled": "travelled",
+    "traveling": "travelling",
+}
+
+_WORD = re.compile(r"[A-Za-z]+")
+_DEFAULT_MATCHER = AhoCorasickMatcher(AU_SPELLING_LEXICON, _WORD)
+
+
+def match_case(replacement, original):
+    """Apply the case pattern of `original` (lower, Title or UPPER) to `replacement`."""
+    if original.isupper() and len(original) > 1:
+        return replacement.upper()
+    if original[0].isupper():
+        return replacement[0].upper() + replacement[1:]
+    return replacement
+
+
+def build_spelling_matcher(lexicon):
+    """Compile a spelling lexicon (lower-case source spelling -> Australian spelling) into a matcher."""
+    return AhoCorasickMatcher(lexicon, _WORD)
+
+
+def normalise_spelling(text, lexicon=AU_SPELLING_LEXICON):
+    """
+    Replace non-Australian spellings in `text` using `lexicon`.
+
+    Args:
+        text: Input text.
+        lexicon: Mapping of lower-case source spellings to Australian spellings, or a matcher from
+            `build_spelling_matcher` (preferred for large lexicons, which would otherwise be compiled on every call).
+
+    Returns:
+        The normalised text.
+    """
+    if lexicon is AU_SPELLING_LEXICON:
+        matcher = _DEFAULT_MATCHER
+    elif isinstance(lexicon, AhoCorasickMatcher):
+        matcher = lexicon
+    else:
+        matcher = build_spelling_matcher(lexicon)
+
+    pieces = []
+    cursor = 0
+    for start, end, replacement in matcher.find(text):
+        pieces.append(text[cursor:start])
+        pieces.append(match_case(replacement, text[start:end]))
+        cursor = end
+    pieces.append(text[cursor:])
+    return "".join(pieces)
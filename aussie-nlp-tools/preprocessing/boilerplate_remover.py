@@ -2,33 +2,235 @@
 Module: boilerplate_remover.py
 
 Purpose:
-- Removes boilerplate text from cleaned files to ensure only meaningful and relevant content is retained for further processing in the Aussie NLP pipeline.
+- Removes boilerplate text from cleaned documents to ensure only meaningful and relevant content is retained for further processing in the Aussie NLP pipeline.
 
 Frameworks/Tools:
 - Implements custom logic and regex patterns to identify and remove boilerplate text.
+- `numpy` for a Count-Min sketch of corpus-wide line frequencies.
 - Optionally integrates with external libraries for predefined boilerplate patterns.
 
 Expected Inputs:
-- File path to a cleaned text file in `data/cleaned/`.
-  - Example: "data/cleaned/<original_filename>_cleaned.txt".
+- Document text as a string, passed in memory by `cleaning_dispatcher.py`.
+- For frequency-based removal, a `LineFrequencySketch` built from the whole batch in a first pass.
 
 Expected Outputs:
-- A refined text file in `data/cleaned/`, where all boilerplate text has been removed.
-  - Example: "data/cleaned/<original_filename>_boilerplate_removed.txt".
-- Deletes the input file in `data/cleaned/` after successful removal.
+- Returns the text with boilerplate lines removed.
+- Sketch files (`.npz`) that can be saved, reloaded and merged across worker processes.
 
 Behavior:
 - Detects and removes common boilerplate elements, such as:
   - Footer and header text (e.g., "Copyright 2025 Aussie NLP").
   - Navigation menus or disclaimers from web-scraped content.
-  - Repeated or templated text found across documents.
-- Logs skipped or ambiguous cases for manual review.
+- Operates line by line so surrounding content is preserved untouched.
+- Two-pass mode for templated text that no fixed pattern covers:
+  - Pass one adds every document's distinct normalised lines (lower case, digits folded, whitespace collapsed)
+    to a `LineFrequencySketch`, keyed by the document's site (the host of its `url` metadata), together with an
+    exact count of documents per site. Memory is fixed by the sketch size, not the corpus size.
+  - Pass two (`remove_frequent_lines`) drops lines seen in at least `min_documents` documents and at least
+    `min_fraction` of the documents from the same site.
+  - Counts use conservative update, so they are never underestimated and rarely overestimated; sketches built on
+    separate shards are summed with `merge`.
 
 Planned Test Approach:
-- Test with files containing varied boilerplate text, including:
-  - Repeated headers and footers in multiple documents.
+- Test with text containing varied boilerplate, including:
+  - Repeated headers and footers.
   - Common disclaimers and navigation menus from web pages.
   - Boilerplate text patterns embedded within paragraphs.
 - Verify that relevant content is preserved and boilerplate is removed accurately.
-- Confirm that the original cleaned file is deleted after processing.
+- Verify that lines repeated across a site's documents are removed, and that merged shard sketches match a sketch
+  built in one pass.
 """
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+# Lines matching any of these patterns (case-insensitive) are treated as boilerplate.
+DEFAULT_BOILERPLATE_PATTERNS = (
+    r"^(copyright|©|\(c\))\b.*",
+    r".*\ball rights reserved\b.*",
+    r"^skip to (main )?content$",
+    r"^(privacy policy|terms of use|terms and conditions|cookie policy|sitemap|contact us)"
+    r"(\s*[|·•]\s*(privacy policy|terms of use|terms and conditions|cookie policy|sitemap|contact us))*$",
+    r"^(home|menu|search|log ?in|sign ?up|subscribe)$",
+    r"^we acknowledge the traditional (owners|custodians)\b.*",
+    r"^this (site|website) uses cookies\b.*",
+    r"^share (this|on) (page|article|facebook|twitter|x|linkedin)\b.*",
+)
+
+
+def compile_boilerplate_patterns(patterns=DEFAULT_BOILERPLATE_PATTERNS):
+    """Compile `patterns` into a single case-insensitive regex."""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
+
+_DEFAULT_REGEX = compile_boilerplate_patterns()
+
+
+def remove_boilerplate(text, pattern=None):
+    """
+    Remove lines of `text` that match boilerplate patterns.
+
+    Args:
+        text: Input text.
+        pattern: Optional compiled regex from `compile_boilerplate_patterns`; defaults to the built-in patterns.
+
+    Returns:
+        The text with boilerplate lines removed.
+    """
+    regex = pattern or _DEFAULT_REGEX
+    return "\n".join(line for line in text.split("\n") if not regex.fullmatch(line.strip()))
+
+
+# Sketch dimensions: DEFAULT_SKETCH_DEPTH rows of DEFAULT_SKETCH_WIDTH uint32 counters (16 MiB by default).
+DEFAULT_SKETCH_WIDTH = 1 << 20
+DEFAULT_SKETCH_DEPTH = 4
+# A line is boilerplate when it appears in at least this many documents...
+DEFAULT_MIN_DOCUMENTS = 5
+# ...and in at least this fraction of the documents from the same site.
+DEFAULT_MIN_FRACTION = 0.1
+
+_DIGITS = re.compile(r"\d+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalise_line(line):
+    """Normalise a line for frequency counting, so dates, page numbers and spacing do not hide repeats."""
+    return _SPACES.sub(" ", _DIGITS.sub("0", line.lower())).strip()
+
+
+def document_domain(document):
+    """Return the site a document belongs to: the host of its `url` metadata, or "" when unknown."""
+    url = document.metadata.get("url")
+    if not isinstance(url, str) or not url:
+        # JSON/CSV records may carry any value under `url`.
+        url = document.source
+    host = urlsplit(url).hostname if "://" in url else None
+    return host.removeprefix("www.") if host else ""
+
+
+def line_keys(lines):
+    """Return the distinct, non-empty normalised forms of `lines`."""
+    keys = {normalise_line(line) for line in lines}
+    keys.discard("")
+    return keys
+
+
+def hash_line_keys(keys, domain=""):
+    """Return a uint64 array of 64-bit hashes of normalised line `keys` within `domain`, in order."""
+    prefix = f"{domain}\0".encode("utf-8")
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(prefix + key.encode("utf-8"), digest_size=8).digest(), "little")
+            for key in keys
+        ),
+        dtype=np.uint64,
+        count=len(keys),
+    )
+
+
+class CountMinSketch:
+    """Count-Min sketch over 64-bit hashes with conservative update."""
+
+    def __init__(self, width=DEFAULT_SKETCH_WIDTH, depth=DEFAULT_SKETCH_DEPTH, table=None):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.uint32) if table is None else table
+
+    def _columns(self, hashes):
+        # Double hashing: row i uses (low + i * high) mod width, derived from one 64-bit hash.
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((low[None, :] + rows * high[None, :]) % np.uint64(self.width)).astype(np.intp)
+
+    def estimate(self, hashes):
+        """Return upper-bound counts for `hashes`."""
+        if len(hashes) == 0:
+            return np.zeros(0, dtype=np.uint32)
+        columns = self._columns(hashes)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def add(self, hashes):
+        """Count each of `hashes` once (callers pass distinct hashes)."""
+        if len(hashes) == 0:
+            return
+        columns = self._columns(hashes)
+        counts = self.table[np.arange(self.depth)[:, None], columns].min(axis=0) + np.uint32(1)
+        for row in range(self.depth):
+            np.maximum.at(self.table[row], columns[row], counts)
+
+    def merge(self, other):
+        """Add the counts of `other` (same dimensions) into this sketch."""
+        if self.table.shape != other.table.shape:
+            raise ValueError(f"Cannot merge sketches of shape {other.table.shape} into {self.table.shape}")
+        np.add(self.table, other.table, out=self.table)
+
+
+class LineFrequencySketch:
+    """Per-site document frequencies of normalised lines, in bounded memory."""
+
+    def __init__(self, width=DEFAULT_SKETCH_WIDTH, depth=DEFAULT_SKETCH_DEPTH):
+        self.sketch = CountMinSketch(width, depth)
+        self.domain_documents = Counter()
+
+    def add_document(self, text, domain=""):
+        """Count each distinct line of `text` once for `domain`."""
+        self.sketch.add(hash_line_keys(list(line_keys(text.split("\n"))), domain))
+        self.domain_documents[domain] += 1
+
+    def frequent_lines(self, lines, domain="", min_documents=DEFAULT_MIN_DOCUMENTS, min_fraction=DEFAULT_MIN_FRACTION):
+        """Return the set of normalised `lines` frequent enough in `domain` to count as boilerplate."""
+        keys = list(line_keys(lines))
+        counts = self.sketch.estimate(hash_line_keys(keys, domain))
+        threshold = max(min_documents, min_fraction * self.domain_documents[domain])
+        return {key for key, count in zip(keys, counts) if count >= threshold}
+
+    def merge(self, other):
+        """Merge a sketch built on another shard into this one."""
+        self.sketch.merge(other.sketch)
+        self.domain_documents.update(other.domain_documents)
+        return self
+
+    def save(self, path):
+        """Write the sketch to `path` (`.npz`) atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            np.savez(handle, table=self.sketch.table, domains=np.array(json.dumps(self.domain_documents)))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a sketch written by `save`."""
+        with np.load(path) as data:
+            table = data["table"]
+            domains = json.loads(str(data["domains"]))
+        sketch = cls.__new__(cls)
+        sketch.sketch = CountMinSketch(table.shape[1], table.shape[0], table)
+        sketch.domain_documents = Counter(domains)
+        return sketch
+
+
+def remove_frequent_lines(
+    document, sketch, min_documents=DEFAULT_MIN_DOCUMENTS, min_fraction=DEFAULT_MIN_FRACTION
+):
+    """
+    Remove lines of `document` that the first-pass `sketch` saw repeated across its site's documents.
+
+    Returns:
+        The document text without frequent lines.
+    """
+    lines = document.text.split("\n")
+    frequent = sketch.frequent_lines(lines, document_domain(document), min_documents, min_fraction)
+    if not frequent:
+        return document.text
+    return "\n".join(line for line in lines if normalise_line(line) not in frequent)
@@ -5,7 +5,8 @@ Purpose:
 - Cleans and removes unnecessary HTML tags from text content, ensuring only meaningful content remains for further processing in the Aussie NLP pipeline.
 
 Frameworks/Tools:
-- Utilizes `BeautifulSoup` from `bs4` for parsing and cleaning HTML structures.
+- Built-in Python `html.parser` for streaming extraction; `lxml` (optional) as a faster streaming parser when
+  installed; `BeautifulSoup` from `bs4` as the fallback for malformed documents.
 
 Expected Inputs:
 - Raw HTML text as a string, typically loaded from a file or directly from web scraping.
@@ -14,16 +15,217 @@ Expected Outputs:
 - Returns a clean text string, free of extraneous HTML tags and attributes.
 
 Behavior:
-- Strips all HTML tags, leaving plain text content.
+- Strips all HTML markup, leaving plain text content.
+- Drops `script`, `style`, `noscript` and `nav` subtrees entirely.
 - Handles nested tags and edge cases, such as incomplete or malformed HTML.
-- Optionally retains specific tags or attributes if needed (e.g., `<a>` for links).
 - Removes whitespace and other artifacts left behind after cleaning.
+- The default "auto" engine extracts text in one streaming pass without building a document tree: parser events
+  are turned into text as they arrive, skipped subtrees are dropped as they are entered, and the only state kept is
+  the stack of open element names. Markup is fed to the parser in fixed-size chunks, so parser buffers stay small
+  on huge pages.
+- End tags close every element opened after their matching start tag, the same rule BeautifulSoup applies, so both
+  engines agree on which text sits inside a skipped subtree.
+- "auto" falls back to BeautifulSoup when the streaming parser fails or reaches the end of the page with a skipped
+  element still open (e.g., an unclosed `<script>`), where a tree builder decides what the element contains.
 
 Planned Test Approach:
 - Test with varied HTML content, including:
   - Well-formed and malformed HTML.
   - HTML with embedded JavaScript, CSS, or complex nested structures.
   - Simple HTML content with minimal tags.
-- Verify that plain text output is clean, consistent, and accurate.
-- Benchmark performance with large HTML files or bulk operations.
+- Verify that plain text output is clean, consistent, and accurate, and identical across engines.
+- Benchmark performance with large HTML files or bulk operations (`benchmarks/bench_clean_html_tags.py`).
 """
+
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+from utils.logging import get_logger
+
+try:
+    from lxml import etree
+except ImportError:  # Optional: the stdlib parser is used instead.
+    etree = None
+
+logger = get_logger("clean_html_tags")
+
+# Elements whose entire subtree is noise for NLP purposes.
+SKIPPED_TAGS = ("script", "style", "noscript", "nav")
+
+# Elements that start a new line of text; inline elements (e.g., `<b>`, `<a>`) are joined with their neighbours.
+BLOCK_TAGS = (
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "ol", "p", "pre", "section", "table",
+    "td", "th", "title", "tr", "ul",
+)
+
+# Elements that never have content or an end tag.
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr",
+})
+
+ENGINE_AUTO = "auto"
+ENGINE_STREAM = "stream"
+ENGINE_SOUP = "soup"
+ENGINES = (ENGINE_AUTO, ENGINE_STREAM, ENGINE_SOUP)
+# Characters fed to the streaming parser at a time.
+FEED_CHARS = 1 << 16
+
+_SKIPPED = frozenset(SKIPPED_TAGS)
+_BLOCK = frozenset(BLOCK_TAGS)
+_INLINE_WHITESPACE = re.compile(r"[ \t\r\f\v]+")
+
+
+def collapse_whitespace(text):
+    """Collapse runs of inline whitespace and drop blank lines."""
+    lines = (_INLINE_WHITESPACE.sub(" ", line).strip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+class _TextCollector:
+    """Turns start/end/data events into text pieces, dropping skipped subtrees."""
+
+    def __init__(self):
+        self.pieces = []
+        self.open_tags = []
+        self.skip_depth = 0
+
+    def start(self, tag):
+        if tag in _BLOCK and not self.skip_depth:
+            self.pieces.append("\n")
+        if tag in VOID_TAGS:
+            return
+        self.open_tags.append(tag)
+        if tag in _SKIPPED:
+            self.skip_depth += 1
+
+    def end(self, tag):
+        open_tags = self.open_tags
+        for position in range(len(open_tags) - 1, -1, -1):
+            if open_tags[position] == tag:
+                break
+        else:
+            return  # Stray end tag.
+        closed = open_tags[position:]
+        del open_tags[position:]
+        if self.skip_depth:
+            self.skip_depth -= sum(1 for name in closed if name in _SKIPPED)
+            if self.skip_depth:
+                return
+        # Every closed block element ends its line, unless it sat inside a closed skipped element.
+        for name in closed:
+            if name in _SKIPPED:
+                break
+            if name in _BLOCK:
+                self.pieces.append("\n")
+                break
+
+    def data(self, text):
+        if not self.skip_depth:
+            self.pieces.append(text)
+
+
+class StreamingTextExtractor(HTMLParser):
+    """`html.parser` based extractor: feed markup in any number of chunks, then call `close` and read `text`."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.collector = _TextCollector()
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.collector.start(tag)
+        if tag not in VOID_TAGS:
+            self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+    def unknown_decl(self, data):
+        if data.startswith("CDATA["):
+            self.collector.data(data[len("CDATA["):])
+
+    @property
+    def text(self):
+        return "".join(self.collector.pieces)
+
+
+class _LxmlTarget(_TextCollector):
+    """Parser target for lxml's event interface (no tree is built)."""
+
+    def start(self, tag, attrib=None):
+        super().start(tag)
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return self
+
+
+def stream_text(html):
+    """
+    Extract raw text from `html` in one streaming pass (lxml when installed, else `html.parser`).
+
+    Returns:
+        A `(text, balanced)` tuple; `balanced` is False when a skipped element was left open at the end, in which
+        case everything after its start tag was dropped.
+    """
+    if etree is not None:
+        collector = _LxmlTarget()
+        parser = etree.HTMLParser(target=collector)
+        for start in range(0, len(html), FEED_CHARS):
+            parser.feed(html[start:start + FEED_CHARS])
+        if html:
+            parser.close()
+    else:
+        extractor = StreamingTextExtractor()
+        for start in range(0, len(html), FEED_CHARS):
+            extractor.feed(html[start:start + FEED_CHARS])
+        extractor.close()
+        collector = extractor.collector
+    return "".join(collector.pieces), not collector.skip_depth
+
+
+def soup_text(html):
+    """Extract raw text from `html` through a BeautifulSoup document tree."""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(SKIPPED_TAGS):
+        tag.decompose()
+    for tag in soup(BLOCK_TAGS):
+        tag.insert_before("\n")
+        tag.append("\n")
+    return soup.get_text()
+
+
+def clean_html_tags(html, engine=ENGINE_AUTO):
+    """
+    Strip HTML markup from `html` and return its readable text.
+
+    Block-level boundaries become newlines; whitespace is collapsed.
+
+    Args:
+        html: The page markup.
+        engine: "auto" (streaming, falling back to BeautifulSoup for malformed markup), "stream" or "soup".
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; expected one of {', '.join(ENGINES)}")
+    if engine != ENGINE_SOUP:
+        try:
+            text, balanced = stream_text(html)
+        except Exception as exc:
+            if engine == ENGINE_STREAM:
+                raise
+            logger.debug("Streaming extraction failed (%s); using BeautifulSoup", exc)
+        else:
+            if balanced or engine == ENGINE_STREAM:
+                return collapse_whitespace(text)
+            logger.debug("Unclosed skipped element; using BeautifulSoup")
+    return collapse_whitespace(soup_text(html))
@@ -0,0 +1,204 @@
+"""
+Module: cleaning_dispatcher.py
+
+Purpose:
+- Manages document flow through the cleaning sub-pipeline of the Aussie NLP Toolkit.
+- Applies each cleaning stage to a stream of `Document` records in memory, so a document is read once and written once.
+
+Frameworks/Tools:
+- Built-in Python libraries only; stage logic lives in the individual `preprocessing/` modules.
+
+Expected Inputs:
+- An iterable of `Document` records, typically from `data_loader_dispatcher.load_documents`.
+
+Expected Outputs:
+- A generator of cleaned `Document` records.
+- Optional checkpoint files:
+  - After selected stages: "data/cleaned/cleaning/<doc_id>_<stage>.txt".
+  - After the final stage: "data/preprocessed/<doc_id>_preprocessed.txt".
+
+Behavior:
+- Runs the stages in `CLEANING_STAGES` order: HTML tag removal, Unicode normalisation, boilerplate removal,
+  Australian spelling normalisation and language filtering.
+- Stages restricted to certain file types (e.g., HTML tag removal) are skipped for other documents.
+- Documents whose text becomes empty are dropped from the stream.
+- Stage failures are logged and the document is skipped, so one bad document cannot halt a batch.
+- With a `StageCache`, each stage's output is looked up by (input text hash, stage name, version, configuration),
+  so reruns only recompute stages whose input or configuration changed.
+- Two-pass boilerplate removal: `build_line_sketch` runs the stages up to boilerplate removal and counts lines per
+  site; passing the result as `line_sketch` to `run_cleaning` adds a stage that strips lines repeated across the
+  site's documents. With a cache, the second pass reuses the first pass's stage outputs.
+
+Planned Test Approach:
+- Verify stage order and per-filetype stage selection.
+- Confirm checkpoints are only written for configured stages.
+- Confirm emptied and failing documents are dropped without stopping the stream.
+- Confirm cached stages are not re-executed on a rerun.
+- Confirm two-pass boilerplate removal strips lines shared across a site's documents.
+"""
+
+import functools
+from collections import namedtuple
+
+from constants import CLEANING_CHECKPOINT_DIR, FILETYPE_HTML, PREPROCESSED_DIR
+from document import write_checkpoint
+from preprocessing.aussie_spelling_normaliser import normalise_spelling
+from preprocessing.boilerplate_remover import (
+    LineFrequencySketch,
+    document_domain,
+    remove_boilerplate,
+    remove_frequent_lines,
+)
+from preprocessing.clean_html_tags import clean_html_tags
+from preprocessing.language_filter import filter_language
+from preprocessing.normalise_unicode import normalise_unicode
+from utils.error_handling import StageError
+from utils.logging import get_logger, get_metrics
+
+logger = get_logger("cleaning_dispatcher")
+
+# A cleaning stage: `func` maps text -> text; `filetypes` limits the stage to those file types (None means all).
+# Bump `version` whenever a stage's behaviour changes so cached outputs are not reused.
+# Stages with `document_level` set receive the whole `Document` (e.g., to read its metadata) and are never cached,
+# since their output depends on more than the text.
+Stage = namedtuple("Stage", ["name", "func", "filetypes", "version", "document_level"], defaults=(None, "1", False))
+
+CLEANING_STAGES = (
+    Stage("clean_html_tags", clean_html_tags, frozenset({FILETYPE_HTML}), "2"),
+    Stage("normalise_unicode", normalise_unicode, None),
+    Stage("boilerplate_remover", remove_boilerplate, None),
+    Stage("aussie_spelling_normaliser", normalise_spelling, None),
+    Stage("language_filter", filter_language, None, "3"),
+)
+
+# Suffix for the final output written to `data/preprocessed/`.
+PREPROCESSED_SUFFIX = "preprocessed"
+# The frequency-based boilerplate stage runs right after this stage.
+LINE_SKETCH_AFTER = "boilerplate_remover"
+LINE_SKETCH_STAGE = "boilerplate_frequency"
+
+
+def apply_stage(stage, document, cache=None):
+    """Apply a single stage to `document`, returning the updated document (unchanged if the stage does not apply)."""
+    if stage.filetypes is not None and document.filetype not in stage.filetypes:
+        return document
+    with get_metrics().timer(stage.name, len(document.text)):
+        try:
+            if stage.document_level:
+                text = stage.func(document)
+            elif cache is None:
+                text = stage.func(document.text)
+            else:
+                text = cache.cached_call(stage.name, stage.version, stage.func, document.text)
+        except Exception as exc:
+            raise StageError(stage.name, document.doc_id, exc) from exc
+    return document.replace(text=text)
+
+
+def clean_document(
+    document, stages=CLEANING_STAGES, checkpoints=(), checkpoint_dir=CLEANING_CHECKPOINT_DIR, cache=None
+):
+    """
+    Run `document` through `stages`.
+
+    Args:
+        document: The `Document` to clean.
+        stages: Ordered sequence of `Stage` tuples.
+        checkpoints: Names of stages whose output should be written to `checkpoint_dir`.
+        checkpoint_dir: Directory for intermediate checkpoints.
+        cache: Optional `StageCache` for stage outputs.
+
+    Returns:
+        The cleaned `Document`, or None if its text was emptied by a stage.
+    """
+    for stage in stages:
+        document = apply_stage(stage, document, cache)
+        if not document.text.strip():
+            logger.debug("Dropped %s: empty after %s", document.doc_id, stage.name)
+            get_metrics().count(stage.name, dropped=1)
+            return None
+        if stage.name in checkpoints:
+            write_checkpoint(document, checkpoint_dir, stage.name)
+    return document
+
+
+def run_cleaning(
+    documents,
+    stages=CLEANING_STAGES,
+    checkpoints=(),
+    checkpoint_dir=CLEANING_CHECKPOINT_DIR,
+    output_dir=PREPROCESSED_DIR,
+    cache=None,
+    line_sketch=None,
+):
+    """
+    Clean a stream of documents lazily.
+
+    Args:
+        documents: Iterable of `Document` records.
+        stages: Ordered sequence of `Stage` tuples.
+        checkpoints: Names of stages whose intermediate output should be written to `checkpoint_dir`.
+        checkpoint_dir: Directory for intermediate checkpoints.
+        output_dir: Directory for the final preprocessed text; None keeps the stream fully in memory.
+        cache: Optional `StageCache`; stage outputs for previously seen inputs are reused instead of recomputed.
+        line_sketch: Optional `LineFrequencySketch` from `build_line_sketch`; enables frequency-based boilerplate
+            removal.
+
+    Yields:
+        Cleaned `Document` records.
+    """
+    if line_sketch is not None:
+        stages = with_line_sketch(stages, line_sketch)
+    checkpoints = frozenset(checkpoints)
+    unknown = checkpoints - {stage.name for stage in stages}
+    if unknown:
+        raise ValueError(f"Unknown checkpoint stage(s): {', '.join(sorted(unknown))}")
+
+    for document in documents:
+        try:
+            cleaned = clean_document(document, stages, checkpoints, checkpoint_dir, cache)
+        except StageError as exc:
+            logger.error("%s", exc)
+            continue
+        if cleaned is None:
+            continue
+        if output_dir is not None:
+            write_checkpoint(cleaned, output_dir, PREPROCESSED_SUFFIX)
+        yield cleaned
+
+
+def _line_sketch_position(stages):
+    names = [stage.name for stage in stages]
+    return names.index(LINE_SKETCH_AFTER) + 1 if LINE_SKETCH_AFTER in names else len(stages)
+
+
+def with_line_sketch(stages, line_sketch, **thresholds):
+    """Return `stages` with a frequency-based boilerplate stage using `line_sketch` after boilerplate removal."""
+    func = functools.partial(remove_frequent_lines, sketch=line_sketch, **thresholds)
+    position = _line_sketch_position(stages)
+    stage = Stage(LINE_SKETCH_STAGE, func, None, document_level=True)
+    return tuple(stages[:position]) + (stage,) + tuple(stages[position:])
+
+
+def build_line_sketch(documents, stages=CLEANING_STAGES, sketch=None, cache=None):
+    """
+    First pass of two-pass boilerplate removal: count the lines of every document per site.
+
+    Documents are cleaned with the stages that precede the frequency stage, so counts are taken on the same text the
+    second pass will see.
+
+    Returns:
+        The updated `LineFrequencySketch` (a new one when `sketch` is None).
+    """
+    sketch = sketch if sketch is not None else LineFrequencySketch()
+    before = stages[:_line_sketch_position(stages)]
+    for document in documents:
+        try:
+            cleaned = clean_document(document, before, cache=cache)
+        except StageError as exc:
+            logger.error("%s", exc)
+            continue
+        if cleaned is not None:
+            sketch.add_document(cleaned.text, document_domain(cleaned))
+    return sketch
+
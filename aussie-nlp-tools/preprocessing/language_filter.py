@@ -5,27 +5,368 @@ Purpose:
 - Filters text based on language, ensuring only content in the specified target language is processed further in the Aussie NLP pipeline.
 
 Frameworks/Tools:
-- Utilizes language detection libraries such as `langdetect` or `langid` for efficient identification.
+- `numpy` for a built-in character n-gram language scorer; profiles are built from `language_samples.py`.
+- Language detection libraries such as `langid` or `langdetect` (optional) for blocks the scorer cannot decide;
+  without them a built-in English function-word heuristic decides those blocks.
 
 Expected Inputs:
-- File path to a cleaned text file in `data/cleaned/`.
-  - Example: "data/cleaned/<original_filename>_cleaned.txt".
+- Document text as a string, passed in memory by `cleaning_dispatcher.py`.
 
 Expected Outputs:
-- A language-specific text file in `data/cleaned/`, containing only content in the target language.
-  - Example: "data/cleaned/<original_filename>_filtered.txt".
-- Deletes the input file in `data/cleaned/` after successful filtering.
+- Returns the text with blocks that are not in the target language removed.
+- Profile files (`.npz`) that can be saved and reloaded, e.g. after training on a larger corpus.
 
 Behavior:
-- Detects the language of each line or block of text within the file.
+- Detects the language of each line (block) of text.
 - Retains only content in the target language (e.g., Australian English).
-- Logs excluded content and potential ambiguous language cases for review.
+- Keeps short blocks that carry too little evidence either way, so headings and list items survive.
+- Blocks with enough letters, mostly outside the Latin alphabet, are rejected without scoring.
+- Scoring: each block is lower-cased, non-letters become spaces, and its character 1-3-grams are hashed into a fixed
+  number of buckets in one vectorised pass over the code points of all blocks. `LanguageProfiles` holds a
+  `(buckets, languages)` matrix of smoothed log-probabilities, so scoring a batch of blocks is a single gather and
+  per-block sum (a sparse n-gram count matrix times the profile matrix). A block is confidently English or confidently
+  not English when the mean log-probability per n-gram of English and of the best other language differ by at least
+  `CONFIDENT_MARGIN`. Ambiguous blocks made up mostly of capitalised or numeric tokens (place names, addresses,
+  contact lines) are kept; only the remaining ambiguous blocks fall through to the external detector.
+- Verdicts are cached per process by block hash (`LanguageIdentifier`, LRU), since boilerplate lines and headings
+  repeat across documents; the distinct uncached blocks of a document are scored as one batch.
+- Documents longer than `PREFIX_CHARS` are first judged on a prefix sample: when no prefix block is rejected and
+  confidently English blocks make up at least `PREFIX_CONFIDENT_SHARE` of the prefix, the document is kept whole
+  without scoring the rest.
 
 Planned Test Approach:
-- Test with text files containing:
+- Test with text containing:
   - Monolingual content in the target language (e.g., all Australian English).
   - Mixed-language content (e.g., sentences in English, French, and Mandarin).
   - Edge cases, such as language ambiguity or unsupported languages.
 - Verify that filtered output matches the expected language while retaining formatting and accuracy.
-- Confirm that the original cleaned file is deleted after processing.
+- Verify that cached and batched verdicts match single-block verdicts, that confidently English documents are
+  short-circuited, and that only ambiguous blocks reach the external detector.
+- Benchmark throughput and fall-through rates with `benchmarks/bench_language_filter.py`.
 """
+
+import os
+import re
+import tempfile
+from collections import Counter, OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from preprocessing.language_samples import LANGUAGE_SAMPLES
+
+try:
+    import langid
+except ImportError:  # Optional: ambiguous blocks are decided by the function-word heuristic.
+    langid = None
+
+try:
+    import langdetect
+except ImportError:  # Optional.
+    langdetect = None
+
+TARGET_LANGUAGE = "en"
+
+ENGLISH_FUNCTION_WORDS = frozenset(
+    "a about after all also an and are as at be been but by can could do for from had has have he her his i if in "
+    "into is it its more no not of on one or our she so than that the their there they this to was we were what when "
+    "which who will with would you your".split()
+)
+
+# Blocks with fewer words than this are kept: there is not enough evidence to reject them.
+MIN_WORDS_TO_JUDGE = 6
+# Minimum share of function words for a block to count as English.
+MIN_FUNCTION_WORD_RATIO = 0.15
+
+# Share of capitalised or numeric tokens at which an ambiguous block counts as names, addresses or contact details.
+MIN_NAME_TOKEN_RATIO = 0.6
+
+# Blocks with at least this many letters, mostly outside the Latin alphabet, are rejected outright.
+MIN_LETTERS_TO_JUDGE_SCRIPT = 12
+
+# Character n-gram orders and the number of hash buckets they share.
+NGRAM_ORDERS = (1, 2, 3)
+NUM_BUCKETS = 1 << 14
+# Add-alpha smoothing for profile probabilities.
+PROFILE_SMOOTHING = 0.1
+# Difference in mean log-probability per n-gram between English and the best other language needed for a verdict.
+CONFIDENT_MARGIN = 0.2
+
+# Characters of a document judged before deciding whether the rest needs scoring.
+PREFIX_CHARS = 2000
+# Share of prefix characters that must sit in confidently English blocks to keep the document whole.
+PREFIX_CONFIDENT_SHARE = 0.8
+DEFAULT_CACHE_SIZE = 1 << 16
+
+# Block verdicts; anything but REJECTED is kept.
+REJECTED = 0
+CONFIDENT = 1
+KEPT = 2
+
+_WORD = re.compile(r"[^\W\d_]+")
+_LATIN_LETTER = re.compile(r"[A-Za-z\u00c0-\u024f]")
+_NON_LETTERS = re.compile(r"[\W\d_]+")
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_CODE_MULTIPLIER = np.uint64(0x100000001B3)
+
+
+def normalise_block(block):
+    """Lower-case `block` and reduce it to letters separated by single spaces, padded with a space each side."""
+    return f" {_NON_LETTERS.sub(' ', block.lower()).strip()} "
+
+
+def ngram_buckets(texts, buckets=NUM_BUCKETS):
+    """
+    Hash the character n-grams of every normalised block (`normalise_block`) in one pass.
+
+    Returns:
+        `(bucket_ids, owners)`: intp arrays holding one entry per n-gram; `owners` is the index of its block.
+    """
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.intp, count=len(texts))
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    owner_of = np.repeat(np.arange(len(texts), dtype=np.intp), lengths)
+    shift = np.uint64(64 - (buckets.bit_length() - 1))
+    bucket_parts, owner_parts = [], []
+    for order in NGRAM_ORDERS:
+        count = len(codes) - order + 1
+        if count <= 0:
+            continue
+        keys = codes[:count] + np.uint64(order)
+        for offset in range(1, order):
+            keys = keys * _CODE_MULTIPLIER + codes[offset:offset + count]
+        valid = owner_of[:count] == owner_of[order - 1:order - 1 + count]
+        if order == 1:
+            valid &= codes[:count] != np.uint64(ord(" "))
+        bucket_parts.append(((keys[valid] * _HASH_MULTIPLIER) >> shift).astype(np.intp))
+        owner_parts.append(owner_of[:count][valid])
+    if not bucket_parts:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    return np.concatenate(bucket_parts), np.concatenate(owner_parts)
+
+
+class LanguageProfiles:
+    """Smoothed character n-gram log-probabilities per language, as a `(buckets, languages)` float32 matrix."""
+
+    def __init__(self, languages, log_probs):
+        self.languages = tuple(languages)
+        self.log_probs = np.ascontiguousarray(log_probs, dtype=np.float32)
+        self.buckets = self.log_probs.shape[0]
+
+    @classmethod
+    def from_samples(cls, samples, buckets=NUM_BUCKETS, smoothing=PROFILE_SMOOTHING):
+        """Build profiles from `samples`, a mapping of language code -> sample text (or list of texts)."""
+        if buckets & (buckets - 1):
+            raise ValueError(f"buckets must be a power of two, got {buckets}")
+        languages = list(samples)
+        counts = np.zeros((buckets, len(languages)), dtype=np.float64)
+        for column, language in enumerate(languages):
+            texts = samples[language]
+            texts = [texts] if isinstance(texts, str) else texts
+            bucket_ids, _ = ngram_buckets([normalise_block(text) for text in texts], buckets)
+            counts[:, column] = np.bincount(bucket_ids, minlength=buckets)
+        probabilities = (counts + smoothing) / (counts.sum(axis=0) + smoothing * buckets)
+        return cls(languages, np.log(probabilities))
+
+    def score(self, blocks, normalised=False):
+        """
+        Score a batch of blocks (already passed through `normalise_block` if `normalised`) against every language.
+
+        Returns:
+            `(means, ngrams)`: a `(len(blocks), languages)` array of mean log-probabilities per n-gram, and the
+            number of n-grams in each block (blocks without any score zero everywhere).
+        """
+        texts = blocks if normalised else [normalise_block(block) for block in blocks]
+        bucket_ids, owners = ngram_buckets(texts, self.buckets)
+        ngrams = np.bincount(owners, minlength=len(blocks))
+        gathered = self.log_probs[bucket_ids]
+        totals = np.empty((len(blocks), len(self.languages)), dtype=np.float64)
+        for column in range(len(self.languages)):
+            totals[:, column] = np.bincount(owners, weights=gathered[:, column], minlength=len(blocks))
+        return totals / np.maximum(ngrams, 1)[:, None], ngrams
+
+    def margins(self, blocks, language=TARGET_LANGUAGE, normalised=False):
+        """Mean log-probability per n-gram of `language` minus that of the best other language, per block."""
+        means, _ = self.score(blocks, normalised)
+        column = self.languages.index(language)
+        others = np.delete(means, column, axis=1)
+        return means[:, column] - others.max(axis=1)
+
+    def save(self, path):
+        """Write the profiles to `path` (`.npz`) atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            np.savez(handle, log_probs=self.log_probs, languages=np.array(self.languages))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load profiles written by `save`."""
+        with np.load(path) as data:
+            return cls([str(language) for language in data["languages"]], data["log_probs"])
+
+
+def has_english_function_words(block):
+    """Function-word heuristic: True if enough of the words in `block` are common English function words."""
+    words = _WORD.findall(block)
+    if not words:
+        return True
+    hits = sum(1 for word in words if word.lower() in ENGLISH_FUNCTION_WORDS)
+    return hits / len(words) >= MIN_FUNCTION_WORD_RATIO
+
+
+def is_mostly_names(block):
+    """True if most whitespace-separated tokens of `block` are capitalised or contain a digit (names, addresses)."""
+    tokens = block.split()
+    if not tokens:
+        return False
+    hits = sum(1 for token in tokens if token[:1].isupper() or token[1:2].isupper() or any(map(str.isdigit, token)))
+    return hits / len(tokens) >= MIN_NAME_TOKEN_RATIO
+
+
+def external_is_english(block):
+    """Decide an ambiguous block with `langid` or `langdetect` when installed, else the function-word heuristic."""
+    if langid is not None:
+        return langid.classify(block)[0] == TARGET_LANGUAGE
+    if langdetect is not None:
+        try:
+            return langdetect.detect(block) == TARGET_LANGUAGE
+        except langdetect.LangDetectException:
+            return True
+    return has_english_function_words(block)
+
+
+def prejudge(text):
+    """Return a verdict for a normalised block that needs no scoring (non-Latin script, too short), else None."""
+    words = text.count(" ") - 1 if len(text) > 2 else 0
+    if not text.isascii():
+        letters = len(text) - words - 1
+        if letters >= MIN_LETTERS_TO_JUDGE_SCRIPT and len(_LATIN_LETTER.findall(text)) < letters / 2:
+            return REJECTED
+    if words < MIN_WORDS_TO_JUDGE:
+        return KEPT
+    return None
+
+
+class LanguageIdentifier:
+    """
+    Batched, cached English identification of text blocks.
+
+    Args:
+        profiles: `LanguageProfiles` including the target language (default: built from `LANGUAGE_SAMPLES`).
+        fallback: Callable deciding blocks the scorer finds ambiguous (default: `external_is_english`).
+        cache_size: Maximum number of cached block verdicts (0 disables the cache).
+        prefix_chars: Length of the prefix sample judged first in `filter` (0 disables the short circuit).
+    """
+
+    def __init__(self, profiles=None, fallback=None, cache_size=DEFAULT_CACHE_SIZE, prefix_chars=PREFIX_CHARS):
+        self.profiles = profiles or _default_profiles()
+        self.fallback = fallback or external_is_english
+        self.cache_size = cache_size
+        self.prefix_chars = prefix_chars
+        self.cache = OrderedDict()
+        # Counts of blocks by how they were decided, and of short-circuited documents.
+        self.stats = Counter()
+
+    def verdicts(self, blocks):
+        """Return a verdict (`REJECTED`, `CONFIDENT` or `KEPT`) for each of `blocks`, scoring misses as one batch."""
+        cache = self.cache
+        results = [None] * len(blocks)
+        pending = {}
+        for index, block in enumerate(blocks):
+            key = hash(block)
+            verdict = cache.get(key)
+            if verdict is not None:
+                cache.move_to_end(key)
+                results[index] = verdict
+                self.stats["cache_hits"] += 1
+            else:
+                pending.setdefault(key, (block, []))[1].append(index)
+        if not pending:
+            return results
+
+        decided = {}
+        to_score, texts = [], []
+        for key, (block, _) in pending.items():
+            text = normalise_block(block)
+            verdict = prejudge(text)
+            if verdict is None:
+                to_score.append(key)
+                texts.append(text)
+            else:
+                decided[key] = verdict
+        self.stats["prejudged"] += len(decided)
+        if to_score:
+            margins = self.profiles.margins(texts, normalised=True)
+            for key, margin in zip(to_score, margins):
+                if margin >= CONFIDENT_MARGIN:
+                    decided[key] = CONFIDENT
+                elif margin <= -CONFIDENT_MARGIN:
+                    decided[key] = REJECTED
+                elif is_mostly_names(pending[key][0]):
+                    # Place names, addresses and contact lines score ambiguously and have few function words.
+                    self.stats["names"] += 1
+                    decided[key] = KEPT
+                else:
+                    self.stats["fallback"] += 1
+                    decided[key] = KEPT if self.fallback(pending[key][0]) else REJECTED
+            self.stats["scored"] += len(to_score)
+
+        for key, verdict in decided.items():
+            for index in pending[key][1]:
+                results[index] = verdict
+            cache[key] = verdict
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return results
+
+    def is_english(self, block):
+        return self.verdicts([block])[0] != REJECTED
+
+    def filter(self, text):
+        """Return `text` with non-English lines removed, keeping confidently English documents whole."""
+        lines = text.split("\n")
+        if self.prefix_chars and len(text) > self.prefix_chars:
+            prefix, size = [], 0
+            for line in lines:
+                prefix.append(line)
+                size += len(line) + 1
+                if size >= self.prefix_chars:
+                    break
+            verdicts = self.verdicts(prefix)
+            confident = sum(len(line) + 1 for line, verdict in zip(prefix, verdicts) if verdict == CONFIDENT)
+            if REJECTED not in verdicts and confident >= PREFIX_CONFIDENT_SHARE * size:
+                self.stats["short_circuits"] += 1
+                return text
+        verdicts = self.verdicts(lines)
+        return "\n".join(line for line, verdict in zip(lines, verdicts) if verdict != REJECTED)
+
+
+_PROFILES = None
+_IDENTIFIER = None
+
+
+def _default_profiles():
+    global _PROFILES
+    if _PROFILES is None:
+        _PROFILES = LanguageProfiles.from_samples(LANGUAGE_SAMPLES)
+    return _PROFILES
+
+
+def default_identifier():
+    """Return the per-process `LanguageIdentifier` used by `is_english` and `filter_language`."""
+    global _IDENTIFIER
+    if _IDENTIFIER is None:
+        _IDENTIFIER = LanguageIdentifier()
+    return _IDENTIFIER
+
+
+def is_english(block):
+    """Return True if `block` looks like English or is too short to judge."""
+    return default_identifier().is_english(block)
+
+
+def filter_language(text):
+    """Return `text` with non-English lines removed."""
+    return default_identifier().filter(text)
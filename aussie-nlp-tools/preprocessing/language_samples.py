@@ -0,0 +1,155 @@
+"""
+Module: language_samples.py
+
+Purpose:
+- Provides the sample text from which `language_filter.py` builds its character n-gram language profiles.
+
+Frameworks/Tools:
+- None (data only).
+
+Expected Inputs:
+- None.
+
+Expected Outputs:
+- `LANGUAGE_SAMPLES`: ISO 639-1 language code -> sample text.
+
+Behavior:
+- English is the target language; the other samples cover Latin-script languages commonly found in Australian web
+  crawls, so their blocks are recognised as "not English" rather than merely "unlike English". Blocks written mostly
+  in other scripts are rejected by `language_filter.py` before n-gram scoring.
+- Profiles trained on a larger corpus can be saved with `LanguageProfiles.save` and loaded instead.
+
+Planned Test Approach:
+- Covered by the language filter tests: each sample's own sentences must be identified as its language.
+"""
+
+LANGUAGE_SAMPLES = {
+    "en": (
+        "The weather in Melbourne is changeable at this time of year, so it is worth taking a jacket when you head "
+        "out. We went to the beach on Saturday and it was a great day for the whole family. The council has "
+        "announced that the new library will open next month, and residents are invited to the launch. According "
+        "to the Bureau of Meteorology, the bushfire season is expected to start earlier than usual this year. "
+        "Students who would like to apply for the scholarship should send their application before the end of "
+        "March. The government said it would invest more money in public transport, schools and hospitals across "
+        "the state. There were thousands of people at the football on the weekend, and the traffic afterwards was "
+        "terrible. If you have any questions about your account, please contact our customer service team. Many "
+        "farmers in Queensland are worried about the drought and what it will mean for their crops. She said that "
+        "the report had been written by a group of researchers from the university. They have been working on the "
+        "project for more than three years and hope to finish it soon. What would you do if you could travel "
+        "anywhere in the world? This is one of the most important decisions that our community will make. Which "
+        "of these options do you think is the best value for money? Our neighbours have lived here since the "
+        "seventies and know everyone in the street. The company reported a strong profit, although sales were "
+        "lower than expected during the winter months. Please read the terms and conditions carefully before you "
+        "sign the agreement. He was born in Adelaide but moved to Perth when he was young."
+    ),
+    "fr": (
+        "Nous sommes allés à la plage samedi et c'était une belle journée pour toute la famille. Le gouvernement a "
+        "annoncé que la nouvelle bibliothèque ouvrira le mois prochain et les habitants sont invités à "
+        "l'inauguration. Selon les services météorologiques, la saison des incendies devrait commencer plus tôt "
+        "que d'habitude cette année. Les étudiants qui souhaitent obtenir une bourse doivent envoyer leur dossier "
+        "avant la fin du mois de mars. Il y avait des milliers de personnes au match ce week-end et la circulation "
+        "était terrible après. Si vous avez des questions sur votre compte, veuillez contacter notre service "
+        "client. Elle a dit que le rapport avait été écrit par un groupe de chercheurs de l'université. Que "
+        "feriez-vous si vous pouviez voyager n'importe où dans le monde? C'est l'une des décisions les plus "
+        "importantes que notre communauté prendra. Nos voisins habitent ici depuis longtemps et connaissent tout "
+        "le monde dans la rue."
+    ),
+    "de": (
+        "Wir sind am Samstag an den Strand gefahren und es war ein schöner Tag für die ganze Familie. Die Regierung "
+        "hat angekündigt, dass die neue Bibliothek nächsten Monat eröffnet wird, und die Bewohner sind zur "
+        "Eröffnung eingeladen. Nach Angaben des Wetterdienstes wird die Waldbrandsaison in diesem Jahr früher als "
+        "üblich beginnen. Studierende, die sich für das Stipendium bewerben möchten, sollten ihre Unterlagen vor "
+        "Ende März schicken. Am Wochenende waren tausende Menschen beim Fußball und danach war der Verkehr "
+        "schrecklich. Wenn Sie Fragen zu Ihrem Konto haben, wenden Sie sich bitte an unseren Kundendienst. Sie "
+        "sagte, dass der Bericht von einer Gruppe von Forschern der Universität geschrieben wurde. Was würden Sie "
+        "tun, wenn Sie überall auf der Welt hinreisen könnten? Das ist eine der wichtigsten Entscheidungen, die "
+        "unsere Gemeinde treffen wird. Unsere Nachbarn wohnen schon seit vielen Jahren hier und kennen jeden in der "
+        "Straße."
+    ),
+    "es": (
+        "Fuimos a la playa el sábado y fue un día estupendo para toda la familia. El gobierno anunció que la nueva "
+        "biblioteca abrirá el próximo mes y los vecinos están invitados a la inauguración. Según el servicio "
+        "meteorológico, la temporada de incendios comenzará antes de lo habitual este año. Los estudiantes que "
+        "quieran solicitar la beca deben enviar su solicitud antes de finales de marzo. Había miles de personas en "
+        "el partido el fin de semana y el tráfico después fue terrible. Si tiene alguna pregunta sobre su cuenta, "
+        "póngase en contacto con nuestro servicio de atención al cliente. Ella dijo que el informe había sido "
+        "escrito por un grupo de investigadores de la universidad. ¿Qué harías si pudieras viajar a cualquier "
+        "lugar del mundo? Esta es una de las decisiones más importantes que tomará nuestra comunidad. Nuestros "
+        "vecinos viven aquí desde hace muchos años y conocen a todo el mundo en la calle."
+    ),
+    "it": (
+        "Siamo andati al mare sabato ed è stata una bella giornata per tutta la famiglia. Il governo ha annunciato "
+        "che la nuova biblioteca aprirà il mese prossimo e i residenti sono invitati all'inaugurazione. Secondo il "
+        "servizio meteorologico, la stagione degli incendi inizierà prima del solito quest'anno. Gli studenti che "
+        "desiderano richiedere la borsa di studio devono inviare la domanda entro la fine di marzo. C'erano "
+        "migliaia di persone alla partita nel fine settimana e il traffico dopo era terribile. Se avete domande sul "
+        "vostro conto, contattate il nostro servizio clienti. Ha detto che il rapporto era stato scritto da un "
+        "gruppo di ricercatori dell'università. Che cosa faresti se potessi viaggiare ovunque nel mondo? Questa è "
+        "una delle decisioni più importanti che la nostra comunità prenderà. I nostri vicini abitano qui da molti "
+        "anni e conoscono tutti nella strada."
+    ),
+    "pt": (
+        "Fomos à praia no sábado e foi um dia ótimo para toda a família. O governo anunciou que a nova biblioteca "
+        "vai abrir no próximo mês e os moradores estão convidados para a inauguração. Segundo o serviço de "
+        "meteorologia, a temporada de incêndios deve começar mais cedo do que o habitual este ano. Os estudantes "
+        "que quiserem pedir a bolsa devem enviar a candidatura até ao final de março. Havia milhares de pessoas no "
+        "jogo no fim de semana e o trânsito depois foi terrível. Se tiver alguma dúvida sobre a sua conta, entre "
+        "em contacto com o nosso serviço de apoio ao cliente. Ela disse que o relatório tinha sido escrito por um "
+        "grupo de investigadores da universidade. O que você faria se pudesse viajar para qualquer lugar do mundo? "
+        "Esta é uma das decisões mais importantes que a nossa comunidade vai tomar. Os nossos vizinhos moram aqui "
+        "há muitos anos e conhecem toda a gente na rua."
+    ),
+    "nl": (
+        "We zijn zaterdag naar het strand gegaan en het was een mooie dag voor het hele gezin. De regering heeft "
+        "aangekondigd dat de nieuwe bibliotheek volgende maand opengaat en de bewoners zijn uitgenodigd voor de "
+        "opening. Volgens de weerdienst begint het bosbrandseizoen dit jaar eerder dan normaal. Studenten die de "
+        "beurs willen aanvragen, moeten hun aanvraag voor het einde van maart opsturen. Er waren duizenden mensen "
+        "bij de wedstrijd in het weekend en het verkeer was daarna verschrikkelijk. Als u vragen hebt over uw "
+        "rekening, neem dan contact op met onze klantenservice. Ze zei dat het rapport was geschreven door een "
+        "groep onderzoekers van de universiteit. Wat zou je doen als je overal ter wereld naartoe kon reizen? Dit "
+        "is een van de belangrijkste beslissingen die onze gemeenschap zal nemen. Onze buren wonen hier al vele "
+        "jaren en kennen iedereen in de straat."
+    ),
+    "id": (
+        "Kami pergi ke pantai pada hari Sabtu dan itu adalah hari yang indah untuk seluruh keluarga. Pemerintah "
+        "mengumumkan bahwa perpustakaan baru akan dibuka bulan depan dan warga diundang ke acara peresmian. Menurut "
+        "badan meteorologi, musim kebakaran hutan tahun ini diperkirakan akan dimulai lebih awal dari biasanya. "
+        "Mahasiswa yang ingin mendaftar beasiswa harus mengirimkan lamaran mereka sebelum akhir bulan Maret. Ada "
+        "ribuan orang yang menonton pertandingan sepak bola akhir pekan lalu dan lalu lintas setelahnya sangat "
+        "macet. Jika Anda memiliki pertanyaan tentang akun Anda, silakan hubungi layanan pelanggan kami. Dia "
+        "mengatakan bahwa laporan itu ditulis oleh sekelompok peneliti dari universitas. Apa yang akan kamu "
+        "lakukan jika kamu bisa bepergian ke mana saja di dunia? Ini adalah salah satu keputusan terpenting yang "
+        "akan diambil oleh masyarakat kita. Tetangga kami sudah tinggal di sini selama bertahun-tahun."
+    ),
+    "tl": (
+        "Pumunta kami sa dalampasigan noong Sabado at napakagandang araw iyon para sa buong pamilya. Inanunsyo ng "
+        "pamahalaan na magbubukas ang bagong aklatan sa susunod na buwan at iniimbitahan ang mga residente sa "
+        "pagbubukas. Ayon sa ahensya ng panahon, mas maagang magsisimula ang panahon ng sunog ngayong taon. Ang "
+        "mga estudyanteng gustong mag-aplay para sa iskolarsip ay dapat magpadala ng kanilang aplikasyon bago "
+        "matapos ang Marso. Libu-libong tao ang nanood ng laro noong katapusan ng linggo at napakasikip ng trapiko "
+        "pagkatapos. Kung mayroon kayong tanong tungkol sa inyong account, makipag-ugnayan po sa aming serbisyo sa "
+        "kustomer. Sinabi niya na ang ulat ay isinulat ng isang grupo ng mga mananaliksik mula sa unibersidad. Ano "
+        "ang gagawin mo kung makakapaglakbay ka kahit saan sa mundo? Ang aming mga kapitbahay ay nakatira rito nang "
+        "maraming taon na."
+    ),
+    "mi": (
+        "I haere mātou ki te tātahi i te Rāhoroi, ā, he rā pai rawa atu mō te whānau katoa. Kua pānuitia e te "
+        "kāwanatanga ka tuwhera te whare pukapuka hou ā tērā marama, ā, kua pōwhiritia ngā kainoho ki te "
+        "whakatuwheratanga. E ai ki te ratonga huarere, ka tīmata wawe mai te wā ahi i tēnei tau. Ko ngā ākonga e "
+        "hiahia ana ki te tono mō te karahipi me tuku i ā rātou tono i mua i te mutunga o Poutūterangi. He mano "
+        "tini ngā tāngata i te kēmu i te mutunga wiki, ā, he kino rawa te waka i muri mai. Mēnā he pātai āu mō tō "
+        "pūkete, whakapā mai ki tā mātou ratonga kiritaki. I kī ia nā tētahi rōpū kairangahau o te whare wānanga "
+        "te pūrongo i tuhi. He aha tāu mahi mēnā ka taea e koe te haere ki hea rānei o te ao? Kua noho ō mātou "
+        "hoa tata ki konei mō ngā tau maha."
+    ),
+    "vi": (
+        "Chúng tôi đã đi biển vào thứ Bảy và đó là một ngày tuyệt vời cho cả gia đình. Chính phủ đã thông báo rằng "
+        "thư viện mới sẽ mở cửa vào tháng tới và người dân được mời đến dự lễ khai trương. Theo cơ quan khí tượng, "
+        "mùa cháy rừng năm nay dự kiến sẽ bắt đầu sớm hơn bình thường. Những sinh viên muốn xin học bổng cần gửi "
+        "đơn trước cuối tháng Ba. Có hàng nghìn người đến xem trận đấu vào cuối tuần và giao thông sau đó rất tệ. "
+        "Nếu bạn có bất kỳ câu hỏi nào về tài khoản của mình, vui lòng liên hệ với bộ phận chăm sóc khách hàng "
+        "của chúng tôi. Cô ấy nói rằng bản báo cáo được viết bởi một nhóm các nhà nghiên cứu của trường đại học. "
+        "Bạn sẽ làm gì nếu có thể đi du lịch đến bất cứ nơi nào trên thế giới? Hàng xóm của chúng tôi đã sống ở "
+        "đây nhiều năm rồi."
+    ),
+}
@@ -9,24 +9,51 @@ Frameworks/Tools:
 - Utilizes Python's built-in `unicodedata` module for Unicode normalization.
 
 Expected Inputs:
-- File path to a cleaned text file in `data/cleaned/`, created by a previous cleaning module.
-  - Example: "data/cleaned/<original_filename>_cleaned.txt".
+- Document text as a string, passed in memory by `cleaning_dispatcher.py`.
 
 Expected Outputs:
-- A normalized text file in `data/cleaned/`, where all Unicode characters are standardized.
-  - Example: "data/cleaned/<original_filename>_unicode_normalized.txt".
-- Deletes the input file in `data/cleaned/` after successful normalization.
+- Returns the normalized text string.
 
 Behavior:
+- Applies Unicode normalization (NFKC by default) so compatibility characters (e.g., ligatures, full-width forms) are unified.
 - Converts accented characters (e.g., "é" to "e") to their closest ASCII equivalents if required.
-- Ensures consistent handling of special symbols, whitespace, and encoding across text data.
-- Handles edge cases such as malformed input or unsupported encodings.
+- Ensures consistent handling of special symbols, whitespace, and line endings across text data.
+- Removes control characters other than newlines and tabs.
 
 Planned Test Approach:
-- Test with varied text files containing:
+- Test with varied text containing:
   - Accented characters (e.g., `é`, `ü`).
   - Special symbols (e.g., currency symbols, mathematical notations).
-  - Texts in multiple encodings (e.g., UTF-8, ISO-8859-1).
+  - Windows line endings and non-breaking spaces.
 - Verify that normalized text matches the expected standard.
-- Confirm that the original cleaned file is deleted after processing.
 """
+
+import re
+import unicodedata
+
+_LINE_ENDINGS = re.compile(r"\r\n?")
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_SPACE_VARIANTS = re.compile(r"[\u00a0\u2000-\u200a\u202f\u205f\u3000]")
+_ZERO_WIDTH = re.compile(r"[\u200b-\u200d\u2060\ufeff]")
+
+
+def normalise_unicode(text, form="NFKC", ascii_fold=False):
+    """
+    Normalise Unicode in `text`.
+
+    Args:
+        text: Input text.
+        form: Unicode normalisation form passed to `unicodedata.normalize`.
+        ascii_fold: If True, strip combining marks so accented letters fold to ASCII.
+
+    Returns:
+        The normalised text.
+    """
+    text = _LINE_ENDINGS.sub("\n", text)
+    text = _ZERO_WIDTH.sub("", text)
+    text = _SPACE_VARIANTS.sub(" ", text)
+    text = _CONTROL_CHARS.sub("", text)
+    if ascii_fold:
+        decomposed = unicodedata.normalize("NFKD", text)
+        text = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return unicodedata.normalize(form, text)
@@ -1 +1,94 @@
-"""Detects and tokenises Aussie slang."""
\ No newline at end of file
+"""
+Module: aussie_slang_tokeniser.py
+
+Purpose:
+- Detects and tokenises Aussie slang, keeping multi-word expressions (e.g., "fair dinkum", "no worries") as single tokens.
+- Provides the word-level tokeniser used by `tokenising_dispatcher.py`.
+
+Frameworks/Tools:
+- Built-in Python `re` module and a custom slang lexicon.
+- The shared Aho–Corasick matcher in `utils/aho_corasick.py`.
+
+Expected Inputs:
+- A sentence or document text as a string.
+
+Expected Outputs:
+- A list of token strings; multi-word slang expressions are joined with a single space.
+
+Behavior:
+- Splits text into words (keeping internal apostrophes, e.g., "she'll") and punctuation.
+- Merges consecutive words that form a multi-word lexicon entry, preferring the longest match, in a single pass
+  whose cost does not grow with the lexicon size.
+- Matching is case-insensitive; tokens keep their original casing.
+
+Planned Test Approach:
+- Test with sentences containing single and multi-word slang, mixed case and punctuation.
+- Verify that slang expressions are kept intact and other words are split normally.
+"""
+
+from utils.aho_corasick import TOKEN_PATTERN, AhoCorasickMatcher
+
+# Australian slang terms and expressions, lower case.
+SLANG_LEXICON = frozenset(
+    [
+        "arvo",
+        "avo",
+        "barbie",
+        "bogan",
+        "brekkie",
+        "chockers",
+        "fair dinkum",
+        "fair go",
+        "flat out like a lizard drinking",
+        "g'day",
+        "good on ya",
+        "hooroo",
+        "maccas",
+        "no worries",
+        "not happy jan",
+        "reckon",
+        "servo",
+        "she'll be right",
+        "stubby",
+        "sunnies",
+        "thongs",
+        "too right",
+        "ute",
+    ]
+)
+
+
+def build_phrase_index(lexicon=SLANG_LEXICON):
+    """Compile `lexicon` into a matcher for `tokenise` and `detect_slang`."""
+    return AhoCorasickMatcher(lexicon, TOKEN_PATTERN)
+
+
+_DEFAULT_INDEX = build_phrase_index()
+
+
+def tokenise(text, phrase_index=None):
+    """
+    Tokenise `text`, merging multi-word slang expressions into single tokens.
+
+    Args:
+        text: Input text.
+        phrase_index: Optional result of `build_phrase_index` (or `aho_corasick.load_or_compile`) for a custom lexicon.
+
+    Returns:
+        A list of tokens.
+    """
+    words, matches = (phrase_index or _DEFAULT_INDEX).scan(text)
+    tokens = []
+    cursor = 0
+    for first, end, _ in matches:
+        tokens.extend(words[cursor:first])
+        tokens.append(" ".join(words[first:end]))
+        cursor = end
+    tokens.extend(words[cursor:])
+    return tokens
+
+
+def detect_slang(text, phrase_index=None):
+    """Return the lexicon entries found in `text`, in order of appearance."""
+    _, matches = (phrase_index or _DEFAULT_INDEX).scan(text)
+    return [entry for _, _, entry in matches]
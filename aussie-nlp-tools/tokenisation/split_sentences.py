@@ -1 +1,52 @@
-"""Splits text into sentences."""
\ No newline at end of file
+"""
+Module: split_sentences.py
+
+Purpose:
+- Splits text into sentences ahead of word and subword tokenisation in the Aussie NLP pipeline.
+
+Frameworks/Tools:
+- Built-in Python `re` module; no external models are required.
+
+Expected Inputs:
+- Document text as a string, passed in memory by `tokenising_dispatcher.py`.
+
+Expected Outputs:
+- A list of sentence strings, in document order.
+
+Behavior:
+- Splits on sentence-final punctuation (`.`, `!`, `?`) followed by whitespace, and on line breaks.
+- Does not split after common abbreviations, including Australian ones (e.g., "Pty.", "Vic.", "N.S.W.").
+
+Planned Test Approach:
+- Test with text containing abbreviations, initials, quotes and multiple paragraphs.
+- Verify that sentence boundaries match expected results.
+"""
+
+import re
+
+ABBREVIATIONS = frozenset(
+    "mr mrs ms dr prof st mt rd ave no vs etc e.g i.e approx dept govt pty ltd co inc jan feb mar apr jun jul aug "
+    "sep sept oct nov dec vic qld tas n.s.w w.a s.a n.t a.c.t".split()
+)
+
+_BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+
+
+def split_sentences(text):
+    """Split `text` into a list of sentences."""
+    sentences = []
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        start = 0
+        for match in _BOUNDARY.finditer(line):
+            candidate = line[start:match.start()]
+            last_word = candidate.rsplit(None, 1)[-1].rstrip(".").lower() if candidate.strip() else ""
+            if last_word in ABBREVIATIONS or (len(last_word) == 1 and last_word.isalpha()):
+                continue
+            sentences.append(line[start:match.end()].strip())
+            start = match.end()
+        if start < len(line):
+            sentences.append(line[start:].strip())
+    return sentences
@@ -0,0 +1,99 @@
+"""
+Module: tokenising_dispatcher.py
+
+Purpose:
+- Orchestrates the tokenisation sub-pipeline of the Aussie NLP Toolkit.
+- Turns a stream of cleaned `Document` records into tokenised records, in memory.
+
+Frameworks/Tools:
+- Built-in Python libraries only; tokenisation logic lives in the individual `tokenisation/` modules.
+
+Expected Inputs:
+- An iterable of `Document` records, typically from `cleaning_dispatcher.run_cleaning`.
+
+Expected Outputs:
+- A generator of `Document` records with `tokens` set to a list of sentences, each a list of tokens.
+- Tokenised files in `data/processed/`: "<doc_id>_tokenised.json".
+
+Behavior:
+- Splits each document into sentences with `split_sentences.py`, then tokenises each sentence with
+  `aussie_slang_tokeniser.py` so multi-word slang stays intact.
+- Failures are logged and the document is skipped, so one bad document cannot halt a batch.
+- With a `StageCache`, tokens are looked up by (text hash, splitter and tokeniser fingerprints, version), so a rerun
+  with unchanged text and tokenisers does no work.
+
+Planned Test Approach:
+- Verify sentence and token structure for representative documents.
+- Confirm output files are written only when an output directory is configured.
+"""
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+from constants import PROCESSED_DIR
+from tokenisation.aussie_slang_tokeniser import tokenise
+from tokenisation.split_sentences import split_sentences
+from utils.logging import get_logger, get_metrics
+from utils.stage_cache import callable_fingerprint
+
+logger = get_logger("tokenising_dispatcher")
+
+# Suffix for tokenised output written to `data/processed/`.
+TOKENISED_SUFFIX = "tokenised"
+# Cache namespace and version for tokenised output; bump the version when tokenisation behaviour changes.
+TOKENISING_STAGE = "tokenising"
+TOKENISING_VERSION = "1"
+
+
+def tokenise_document(document, sentence_splitter=split_sentences, tokeniser=tokenise, cache=None):
+    """Return a copy of `document` with `tokens` populated, using `cache` when given."""
+    key = None
+    if cache is not None:
+        fingerprint = f"{callable_fingerprint(sentence_splitter)}|{callable_fingerprint(tokeniser)}"
+        key = cache.make_key(TOKENISING_STAGE, TOKENISING_VERSION, fingerprint, document.text)
+        tokens = cache.get(key)
+        if tokens is not None:
+            return document.replace(tokens=tokens)
+    tokens = [tokeniser(sentence) for sentence in sentence_splitter(document.text)]
+    if key is not None:
+        cache.put(key, tokens)
+    return document.replace(tokens=tokens)
+
+
+def write_tokenised(document, output_dir):
+    """Write a tokenised document as JSON to `<output_dir>/<doc_id>_tokenised.json` and return the path."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{document.filename_stem}_{TOKENISED_SUFFIX}.json"
+    path.write_text(json.dumps(asdict(document), ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def run_tokenising(
+    documents, sentence_splitter=split_sentences, tokeniser=tokenise, output_dir=PROCESSED_DIR, cache=None
+):
+    """
+    Tokenise a stream of documents lazily.
+
+    Args:
+        documents: Iterable of `Document` records.
+        sentence_splitter: Callable mapping text to a list of sentences.
+        tokeniser: Callable mapping a sentence to a list of tokens.
+        output_dir: Directory for tokenised output; None keeps the stream fully in memory.
+        cache: Optional `StageCache` for tokenised output.
+
+    Yields:
+        Tokenised `Document` records.
+    """
+    metrics = get_metrics()
+    for document in documents:
+        try:
+            with metrics.timer(TOKENISING_STAGE, len(document.text)):
+                tokenised = tokenise_document(document, sentence_splitter, tokeniser, cache)
+        except Exception as exc:
+            logger.error("Tokenising failed on %s: %s", document.doc_id, exc)
+            continue
+        if output_dir is not None:
+            write_tokenised(tokenised, output_dir)
+        yield tokenised
@@ -1 +1,277 @@
-"""Tokenises text into subwords (e.g., BPE)."""
\ No newline at end of file
+"""
+Module: wordpiece_tokeniser.py
+
+Purpose:
+- Tokenises text into subwords (e.g., BPE) and encodes them as integer ids for model training.
+- Trains subword vocabularies on Australian text without an external tokeniser library or service.
+
+Frameworks/Tools:
+- Built-in Python libraries (`heapq`, `functools`) and `numpy` for batched output.
+
+Expected Inputs:
+- Document or sentence text as strings; a vocabulary file (one token per line) or training texts.
+
+Expected Outputs:
+- `encode`: a list of token ids; `encode_batch`: an `EncodedBatch` of contiguous NumPy `ids` and `offsets`
+  (document `i` is `ids[offsets[i]:offsets[i + 1]]`).
+- `train_bpe`: a vocabulary list in WordPiece form, written by `WordPieceTokeniser.save` as "vocab.txt".
+
+Behavior:
+- Text is optionally lower-cased and split into words and punctuation; each word is split greedily into the longest
+  vocabulary pieces using a character trie, with non-initial pieces marked by the "##" prefix. A word that cannot be
+  covered by the vocabulary becomes the unknown token.
+- Word -> ids results are kept in a per-process LRU cache, so frequent words are split once.
+- `train_bpe` learns merges with a max-heap of pair counts that is updated incrementally: each merge only revisits
+  the words containing the merged pair instead of recounting the corpus.
+
+Planned Test Approach:
+- Verify longest-match splitting, unknown handling and round-tripping through `decode`.
+- Verify `encode_batch` offsets against per-document `encode`.
+- Verify that training learns frequent pairs first and reaches the requested vocabulary size.
+"""
+
+import functools
+import heapq
+import re
+from collections import Counter, defaultdict, namedtuple
+from pathlib import Path
+
+import numpy as np
+
+UNK_TOKEN = "[UNK]"
+CONTINUATION_PREFIX = "##"
+DEFAULT_CACHE_SIZE = 1 << 16
+# Longer "words" (e.g., URLs or base64 blobs) are not split and map to the unknown token.
+MAX_WORD_CHARS = 100
+
+_PRE_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+# Token ids of a batch of documents: `ids` (int32) holds every document's ids back to back; `offsets` (int64, one
+# longer than the batch) marks where each document starts.
+EncodedBatch = namedtuple("EncodedBatch", ["ids", "offsets"])
+
+
+def pre_tokenise(text, lowercase=True):
+    """Split `text` into the words and punctuation marks that subword splitting operates on."""
+    return _PRE_TOKEN.findall(text.lower() if lowercase else text)
+
+
+class _Trie:
+    """Character trie stored as parallel arrays: per-node child maps and token ids (-1 for non-terminal nodes)."""
+
+    def __init__(self):
+        self.children = [{}]
+        self.token_ids = [-1]
+
+    def insert(self, piece, token_id):
+        node = 0
+        for char in piece:
+            child = self.children[node].get(char)
+            if child is None:
+                child = len(self.children)
+                self.children[node][char] = child
+                self.children.append({})
+                self.token_ids.append(-1)
+            node = child
+        self.token_ids[node] = token_id
+
+    def longest_match(self, word, start):
+        """Return `(token id, end)` of the longest vocabulary piece at `word[start:]`, or `(-1, start)`."""
+        children, token_ids = self.children, self.token_ids
+        node = 0
+        best_id, best_end = -1, start
+        for position in range(start, len(word)):
+            node = children[node].get(word[position])
+            if node is None:
+                break
+            if token_ids[node] != -1:
+                best_id, best_end = token_ids[node], position + 1
+        return best_id, best_end
+
+
+class WordPieceTokeniser:
+    """Greedy longest-match subword tokeniser over a fixed vocabulary."""
+
+    def __init__(self, vocab, unk_token=UNK_TOKEN, lowercase=True, cache_size=DEFAULT_CACHE_SIZE):
+        self.vocab = list(vocab)
+        self.token_to_id = {token: index for index, token in enumerate(self.vocab)}
+        if unk_token not in self.token_to_id:
+            raise ValueError(f"Vocabulary has no unknown token {unk_token!r}")
+        self.unk_token = unk_token
+        self.unk_id = self.token_to_id[unk_token]
+        self.lowercase = lowercase
+        self.cache_size = cache_size
+        self._initial = _Trie()
+        self._continuation = _Trie()
+        for token, index in self.token_to_id.items():
+            if token.startswith(CONTINUATION_PREFIX) and len(token) > len(CONTINUATION_PREFIX):
+                self._continuation.insert(token[len(CONTINUATION_PREFIX):], index)
+            else:
+                self._initial.insert(token, index)
+        self._reset_cache()
+
+    def _reset_cache(self):
+        self.encode_word = functools.lru_cache(maxsize=self.cache_size)(self._split_word)
+
+    def __getstate__(self):
+        # The cache is per process: drop it when the tokeniser is sent to a worker.
+        state = self.__dict__.copy()
+        del state["encode_word"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset_cache()
+
+    def __len__(self):
+        return len(self.vocab)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(vocab_size={len(self)}, lowercase={self.lowercase})"
+
+    def _split_word(self, word):
+        """Return the token ids of a single pre-tokenised word as a tuple."""
+        if len(word) > MAX_WORD_CHARS:
+            return (self.unk_id,)
+        token_id, end = self._initial.longest_match(word, 0)
+        if token_id == -1:
+            return (self.unk_id,)
+        ids = [token_id]
+        while end < len(word):
+            token_id, end = self._continuation.longest_match(word, end)
+            if token_id == -1:
+                return (self.unk_id,)
+            ids.append(token_id)
+        return tuple(ids)
+
+    def encode(self, text):
+        """Return the token ids of `text` as a list."""
+        ids = []
+        for word in pre_tokenise(text, self.lowercase):
+            ids.extend(self.encode_word(word))
+        return ids
+
+    def encode_batch(self, texts):
+        """Encode many texts into one contiguous `EncodedBatch`."""
+        encode_word = self.encode_word
+        ids = []
+        offsets = [0]
+        for text in texts:
+            for word_ids in map(encode_word, pre_tokenise(text, self.lowercase)):
+                ids += word_ids
+            offsets.append(len(ids))
+        return EncodedBatch(np.array(ids, dtype=np.int32), np.array(offsets, dtype=np.int64))
+
+    def tokenise(self, text):
+        """Return the subword strings of `text`."""
+        return [self.vocab[index] for index in self.encode(text)]
+
+    def decode(self, ids):
+        """Join token ids back into text; continuation pieces attach to the previous piece."""
+        words = []
+        for index in ids:
+            token = self.vocab[int(index)]
+            if token.startswith(CONTINUATION_PREFIX) and words:
+                words[-1] += token[len(CONTINUATION_PREFIX):]
+            else:
+                words.append(token)
+        return " ".join(words)
+
+    def save(self, path):
+        """Write the vocabulary, one token per line (the "vocab.txt" format)."""
+        Path(path).write_text("\n".join(self.vocab) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Load a vocabulary file written by `save`."""
+        vocab = Path(path).read_text(encoding="utf-8").splitlines()
+        return cls([token for token in vocab if token], **kwargs)
+
+
+def _symbols(word):
+    return [word[0]] + [CONTINUATION_PREFIX + char for char in word[1:]]
+
+
+def _merge_symbols(left, right):
+    return left + right[len(CONTINUATION_PREFIX):]
+
+
+def train_bpe(texts, vocab_size, min_frequency=2, lowercase=True, special_tokens=(UNK_TOKEN,)):
+    """
+    Learn a subword vocabulary with byte-pair-encoding style merges.
+
+    Args:
+        texts: Iterable of training texts.
+        vocab_size: Target vocabulary size, including special tokens and the initial characters.
+        min_frequency: Pairs seen fewer times than this are never merged.
+        lowercase: Lower-case text before training (must match the tokeniser).
+        special_tokens: Tokens placed at the start of the vocabulary.
+
+    Returns:
+        The vocabulary as a list: special tokens, then initial and "##" continuation characters, then merged
+        tokens in the order they were learned.
+    """
+    word_counts = Counter()
+    for text in texts:
+        word_counts.update(pre_tokenise(text, lowercase))
+    words = [_symbols(word) for word in word_counts]
+    counts = list(word_counts.values())
+
+    vocab = list(special_tokens)
+    seen = set(vocab)
+    for symbols in words:
+        for symbol in symbols:
+            if symbol not in seen:
+                seen.add(symbol)
+                vocab.append(symbol)
+
+    pair_counts = defaultdict(int)
+    pair_words = defaultdict(set)
+    for index, symbols in enumerate(words):
+        for pair in zip(symbols, symbols[1:]):
+            pair_counts[pair] += counts[index]
+            pair_words[pair].add(index)
+    # Max-heap of (-count, pair); entries whose count no longer matches `pair_counts` are stale and skipped.
+    heap = [(-count, pair) for pair, count in pair_counts.items()]
+    heapq.heapify(heap)
+
+    while len(vocab) < vocab_size and heap:
+        negative_count, pair = heapq.heappop(heap)
+        if pair_counts.get(pair, 0) != -negative_count:
+            continue
+        if -negative_count < min_frequency:
+            break
+        merged = _merge_symbols(*pair)
+        if merged not in seen:
+            seen.add(merged)
+            vocab.append(merged)
+
+        changed = set()
+        for index in pair_words.pop(pair):
+            symbols, count = words[index], counts[index]
+            for old in zip(symbols, symbols[1:]):
+                pair_counts[old] -= count
+                changed.add(old)
+            rebuilt = []
+            position = 0
+            while position < len(symbols):
+                if position + 1 < len(symbols) and (symbols[position], symbols[position + 1]) == pair:
+                    rebuilt.append(merged)
+                    position += 2
+                else:
+                    rebuilt.append(symbols[position])
+                    position += 1
+            words[index] = rebuilt
+            for new in zip(rebuilt, rebuilt[1:]):
+                pair_counts[new] += count
+                pair_words[new].add(index)
+                changed.add(new)
+        for changed_pair in changed:
+            count = pair_counts[changed_pair]
+            if count <= 0:
+                pair_counts.pop(changed_pair, None)
+                pair_words.pop(changed_pair, None)
+            elif changed_pair != pair:
+                heapq.heappush(heap, (-count, changed_pair))
+        pair_counts.pop(pair, None)
+    return vocab
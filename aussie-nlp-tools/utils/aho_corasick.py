@@ -0,0 +1,232 @@
+"""
+Module: aho_corasick.py
+
+Purpose:
+- Shared multi-pattern dictionary matcher for lexicon-driven stages (`aussie_spelling_normaliser.py`,
+  `aussie_slang_tokeniser.py`).
+- Finds every lexicon entry in a document in one linear pass, regardless of lexicon size.
+
+Frameworks/Tools:
+- Built-in Python libraries (`re`, `pickle`, `hashlib`).
+
+Expected Inputs:
+- A lexicon: a mapping of phrase -> value, or an iterable of phrases (each phrase is its own value).
+- Document text as a string.
+
+Expected Outputs:
+- Non-overlapping, leftmost-longest matches as `(start, end, value)` character spans (`find`) or token-index spans
+  (`scan`).
+- Optional compiled matcher files (pickled automaton tables) that load without rebuilding the automaton.
+
+Behavior:
+- Text is split into word tokens with a configurable regular expression; the automaton's alphabet is case-folded
+  tokens (lower case, with curly apostrophes folded to straight ones), so matches always fall on word boundaries
+  and runs of whitespace or line breaks between words do not matter.
+- Phrases are tokenised with the same expression, so a multi-word entry matches its words wherever they appear
+  consecutively.
+- `load_or_compile` reuses a compiled file when its lexicon digest matches and rebuilds it otherwise.
+
+Planned Test Approach:
+- Verify case-insensitive, word-bounded, leftmost-longest matching of single and multi-word entries.
+- Verify that a saved matcher loads back with identical results and that a changed lexicon is recompiled.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from collections import deque
+from pathlib import Path
+
+from utils.logging import get_logger
+
+logger = get_logger("aho_corasick")
+
+# Words (keeping internal apostrophes, e.g., "she'll") and single punctuation marks.
+TOKEN_PATTERN = re.compile(r"\w+(?:['’]\w+)*|[^\w\s]")
+# Bump when the compiled file layout changes; older files are then rebuilt.
+COMPILED_FORMAT = 1
+
+
+def fold_token(token):
+    """Case-fold a token for matching."""
+    return token.lower().replace("’", "'")
+
+
+class AhoCorasickMatcher:
+    """Aho–Corasick automaton over case-folded word tokens."""
+
+    def __init__(self, lexicon, token_pattern=TOKEN_PATTERN):
+        self.token_pattern = token_pattern
+        items = lexicon.items() if isinstance(lexicon, dict) else ((phrase, phrase) for phrase in lexicon)
+        entries = sorted((phrase, value) for phrase, value in items)
+        self.digest = lexicon_digest(entries, token_pattern)
+        self._build(entries)
+
+    def _build(self, entries):
+        # goto[state] maps a folded token to the next state; each state records the entry ending there (or -1)
+        # and a dictionary-suffix link to the next state on its failure chain that ends an entry.
+        goto = [{}]
+        output = [-1]
+        self._entries = []
+        interned = {}
+        for phrase, value in entries:
+            tokens = [fold_token(token) for token in self.token_pattern.findall(phrase)]
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                token = interned.setdefault(token, token)
+                following = goto[state].get(token)
+                if following is None:
+                    following = len(goto)
+                    goto[state][token] = following
+                    goto.append({})
+                    output.append(-1)
+                state = following
+            if output[state] == -1:
+                output[state] = len(self._entries)
+                self._entries.append((len(tokens), value))
+
+        fail = [0] * len(goto)
+        suffix = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, following in goto[state].items():
+                queue.append(following)
+                link = fail[state]
+                while link and token not in goto[link]:
+                    link = fail[link]
+                link = goto[link].get(token, 0)
+                fail[following] = link
+                suffix[following] = link if output[link] != -1 else suffix[link]
+        self._goto, self._fail, self._output, self._suffix = goto, fail, output, suffix
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        # Stable across processes, so stage cache fingerprints of partials holding a matcher stay valid.
+        return f"{type(self).__name__}(entries={len(self)}, digest={self.digest[:16]})"
+
+    def _all_matches(self, folded):
+        goto, fail, output, suffix, entries = self._goto, self._fail, self._output, self._suffix, self._entries
+        root = goto[0]
+        matches = []
+        state = 0
+        for position, token in enumerate(folded):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = (goto[state] if state else root).get(token, 0)
+            if not state:
+                continue
+            hit = state if output[state] != -1 else suffix[state]
+            while hit:
+                length, value = entries[output[hit]]
+                matches.append((position + 1 - length, position + 1, value))
+                hit = suffix[hit]
+        return matches
+
+    @staticmethod
+    def _fold_tokens(tokens):
+        # Fold the tokens of the original text rather than tokenising folded text: folding can turn a character
+        # the pattern skips into one it matches (e.g. the Kelvin sign into "k"), which would misalign the spans.
+        # One `lower` call over the joined tokens is much cheaper than one per token.
+        folded = "\0".join(tokens).lower().replace("’", "'").split("\0")
+        if len(folded) == len(tokens):
+            return folded
+        return [fold_token(token) for token in tokens]
+
+    def scan(self, text):
+        """
+        Tokenise `text` and match it against the lexicon.
+
+        Returns:
+            `(tokens, matches)`: the token strings and the leftmost-longest, non-overlapping matches as
+            `(first token index, end token index, value)` tuples in order.
+        """
+        tokens = self.token_pattern.findall(text)
+        return tokens, _leftmost_longest(self._all_matches(self._fold_tokens(tokens)))
+
+    def find(self, text):
+        """Return leftmost-longest, non-overlapping matches in `text` as `(start, end, value)` character spans."""
+        found = list(self.token_pattern.finditer(text))
+        matches = _leftmost_longest(self._all_matches(self._fold_tokens([match.group() for match in found])))
+        return [(found[first].start(), found[last - 1].end(), value) for first, last, value in matches]
+
+    def save(self, path):
+        """Write the compiled automaton to `path` atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "format": COMPILED_FORMAT,
+            "pattern": self.token_pattern.pattern,
+            "flags": self.token_pattern.flags,
+            "digest": self.digest,
+            "tables": (self._goto, self._fail, self._output, self._suffix, self._entries),
+        }
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            pickle.dump(state, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a matcher written by `save`. Compiled files are trusted local build artefacts (they are pickles).
+
+        Raises:
+            ValueError: If the file was written by an incompatible version.
+        """
+        with open(path, "rb") as handle:
+            state = pickle.load(handle)
+        if state.get("format") != COMPILED_FORMAT:
+            raise ValueError(f"{path}: unsupported compiled matcher format {state.get('format')!r}")
+        matcher = cls.__new__(cls)
+        matcher.token_pattern = re.compile(state["pattern"], state["flags"])
+        matcher.digest = state["digest"]
+        matcher._goto, matcher._fail, matcher._output, matcher._suffix, matcher._entries = state["tables"]
+        return matcher
+
+
+def _leftmost_longest(matches):
+    matches.sort(key=lambda match: (match[0], -match[1]))
+    selected = []
+    cursor = 0
+    for match in matches:
+        if match[0] >= cursor:
+            selected.append(match)
+            cursor = match[1]
+    return selected
+
+
+def lexicon_digest(entries, token_pattern=TOKEN_PATTERN):
+    """SHA-256 digest of sorted `(phrase, value)` entries and the token pattern, identifying a compiled matcher."""
+    digest = hashlib.sha256(f"{COMPILED_FORMAT}\0{token_pattern.pattern}\0{token_pattern.flags}\0".encode("utf-8"))
+    for phrase, value in entries:
+        digest.update(f"{phrase}\0{value!r}\0".encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def load_or_compile(lexicon, path, token_pattern=TOKEN_PATTERN):
+    """
+    Return a matcher for `lexicon`, loading it from `path` when that file was compiled from the same lexicon.
+
+    Otherwise the automaton is built and written to `path` for next time.
+    """
+    items = lexicon.items() if isinstance(lexicon, dict) else ((phrase, phrase) for phrase in lexicon)
+    digest = lexicon_digest(sorted(items), token_pattern)
+    try:
+        matcher = AhoCorasickMatcher.load(path)
+        if matcher.digest == digest:
+            return matcher
+        logger.info("Lexicon changed; recompiling %s", path)
+    except FileNotFoundError:
+        pass
+    except (ValueError, pickle.UnpicklingError, EOFError) as exc:
+        logger.warning("Ignoring unreadable compiled matcher %s: %s", path, exc)
+    matcher = AhoCorasickMatcher(lexicon, token_pattern)
+    matcher.save(path)
+    return matcher
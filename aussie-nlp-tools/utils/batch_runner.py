@@ -0,0 +1,383 @@
+"""
+Module: batch_runner.py
+
+Purpose:
+- Runs the detect → load → preprocess → tokenise pipeline over every file in `data/raw/` using all available cores.
+- Shards the discovered files into work units and executes them on a `ProcessPoolExecutor`.
+
+Frameworks/Tools:
+- Built-in Python `concurrent.futures` and `multiprocessing`.
+
+Expected Inputs:
+- A raw data directory (default `data/raw/`), or an explicit list of file paths.
+
+Expected Outputs:
+- Preprocessed and tokenised files written by the cleaning and tokenising dispatchers.
+- A generator of `ShardResult` records, always in input order regardless of which worker finishes first.
+- A run manifest (`manifest.jsonl`) listing every processed document and failed file in input order.
+
+Behavior:
+- Files are discovered recursively and sorted, then split into contiguous shards so output ordering is deterministic.
+  Document ids are qualified by each file's path relative to the raw directory, so same-stem files never share
+  output files.
+- Backpressure: at most `max_pending` shards are in flight; the next shard is only submitted once the oldest
+  shard's result has been consumed.
+- Failure isolation: errors on a single file are caught inside the worker and reported as failures, and the outputs
+  already written for that file are deleted. Only corrupt files (`CorruptFileError`) are moved into `data/failed/`;
+  other errors (e.g., a missing optional dependency) leave the raw file in place so a rerun retries it. If a worker
+  process dies (e.g., a parser segfault), the affected shard is retried one file at a time in a fresh single-use
+  process, and only the file that still crashes is quarantined.
+- PDF page extraction pools are sized from the worker count (`page_workers_per_worker`), so each worker runs a small
+  page pool (at least one process, which keeps per-page timeouts) instead of a full pool per core.
+- With `cache_dir` set, workers share a `StageCache` so reruns skip unchanged cleaning and tokenising work.
+- Two-pass boilerplate removal: `build_boilerplate_sketch` counts lines per site on the process pool (each task
+  returns a partial `LineFrequencySketch`, which the parent merges); `run_batch(sketch_path=...)` then strips the
+  frequent lines, with each worker loading the saved sketch once.
+
+Planned Test Approach:
+- Verify discovery, sharding and ordering with more shards than workers.
+- Verify that a failing file is reported without losing the rest of its shard, and that only corrupt files are
+  quarantined.
+- Verify that the parallel first pass produces the same sketch as a sequential one.
+"""
+
+import json
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from constants import FILETYPE_CORRUPT, PREPROCESSED_DIR, PROCESSED_DIR, RAW_DIR
+from data_loader.data_loader_dispatcher import load_documents
+from data_loader.data_loader_pdf import set_page_workers
+from data_loader.detect_filetype import discover_files
+from preprocessing.boilerplate_remover import DEFAULT_SKETCH_DEPTH, DEFAULT_SKETCH_WIDTH, LineFrequencySketch
+from preprocessing.cleaning_dispatcher import PREPROCESSED_SUFFIX, build_line_sketch, run_cleaning
+from tokenisation.tokenising_dispatcher import TOKENISED_SUFFIX, run_tokenising
+from utils.error_handling import CorruptFileError, quarantine_file
+from utils.logging import MetricsRegistry, enable_stage_profiling, get_logger, get_metrics
+from utils.stage_cache import DEFAULT_MAX_BYTES, StageCache
+
+logger = get_logger("batch_runner")
+
+DEFAULT_SHARD_SIZE = 16
+MANIFEST_NAME = "manifest.jsonl"
+RUN_REPORT_NAME = "run_report.json"
+BOILERPLATE_SKETCH_NAME = "boilerplate_sketch.npz"
+# First-pass tasks per worker: enough for load balancing while keeping the number of partial sketches small.
+SKETCH_TASKS_PER_WORKER = 4
+
+# Result of one shard: `documents` are (doc_id, source) pairs; `failures` are (path, error message) pairs;
+# `metrics` is the worker's `MetricsRegistry` snapshot for the shard.
+ShardResult = namedtuple("ShardResult", ["index", "documents", "failures", "metrics"], defaults=(None,))
+
+# One `StageCache` per worker process and cache directory, so the directory is only scanned once per process.
+_worker_caches = {}
+# Line sketches loaded by this worker process, keyed by path and modification time.
+_worker_sketches = {}
+
+
+def _worker_cache(cache_dir, cache_bytes):
+    if cache_dir is None:
+        return None
+    key = (str(cache_dir), cache_bytes)
+    if key not in _worker_caches:
+        _worker_caches[key] = StageCache(cache_dir, cache_bytes)
+    return _worker_caches[key]
+
+
+def _worker_sketch(sketch_path):
+    if sketch_path is None:
+        return None
+    key = (str(sketch_path), os.stat(sketch_path).st_mtime_ns)
+    if key not in _worker_sketches:
+        _worker_sketches[key] = LineFrequencySketch.load(sketch_path)
+    return _worker_sketches[key]
+
+
+def page_workers_per_worker(workers):
+    """Return the PDF page extraction workers each of `workers` batch workers should use: a share of the cores."""
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def make_shards(paths, shard_size=DEFAULT_SHARD_SIZE):
+    """Split `paths` into contiguous shards of at most `shard_size` files."""
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+    return [paths[start:start + shard_size] for start in range(0, len(paths), shard_size)]
+
+
+def _track_stems(documents, stems):
+    """Yield `documents`, appending each one's file name stem to `stems`."""
+    for document in documents:
+        stems.append(document.filename_stem)
+        yield document
+
+
+def _remove_outputs(stems, preprocessed_dir, processed_dir):
+    """Delete the preprocessed and tokenised outputs written for documents with these file name `stems`."""
+    for stem in stems:
+        if preprocessed_dir is not None:
+            Path(preprocessed_dir, f"{stem}_{PREPROCESSED_SUFFIX}.txt").unlink(missing_ok=True)
+        if processed_dir is not None:
+            Path(processed_dir, f"{stem}_{TOKENISED_SUFFIX}.json").unlink(missing_ok=True)
+
+
+def process_shard(
+    index,
+    paths,
+    preprocessed_dir=PREPROCESSED_DIR,
+    processed_dir=PROCESSED_DIR,
+    failed_root=None,
+    cache_dir=None,
+    cache_bytes=DEFAULT_MAX_BYTES,
+    sketch_path=None,
+    profile_stage=None,
+    profile_dir=None,
+    profile_memory=False,
+    page_workers=None,
+    raw_root=None,
+):
+    """
+    Worker entry point: run the full pipeline over one shard of files.
+
+    Each file is processed independently, so an exception only affects that file: its documents are dropped and any
+    outputs already written for it are deleted. Only corrupt files are quarantined. With `raw_root`, document ids
+    (and so output file names) include each file's path relative to it, keeping same-stem files apart.
+    """
+    if profile_stage is not None:
+        enable_stage_profiling(profile_stage, profile_dir, profile_memory)
+    set_page_workers(page_workers)
+    cache = _worker_cache(cache_dir, cache_bytes)
+    line_sketch = _worker_sketch(sketch_path)
+    documents = []
+    failures = []
+    for path in paths:
+        # File name stems of every document cleaned from this file, so its outputs can be removed if it fails.
+        written = []
+        file_documents = []
+        try:
+            loaded = load_documents([path], failed_root=failed_root, root=raw_root)
+            cleaned = run_cleaning(loaded, output_dir=preprocessed_dir, cache=cache, line_sketch=line_sketch)
+            for document in run_tokenising(_track_stems(cleaned, written), output_dir=processed_dir, cache=cache):
+                file_documents.append((document.doc_id, document.source))
+        except Exception as exc:
+            logger.error("Failed on %s: %s", path, exc)
+            failures.append((str(path), f"{type(exc).__name__}: {exc}"))
+            _remove_outputs(written, preprocessed_dir, processed_dir)
+            if isinstance(exc, CorruptFileError) and Path(path).exists():
+                quarantine_file(path, FILETYPE_CORRUPT, failed_root)
+            continue
+        documents.extend(file_documents)
+    metrics = get_metrics()
+    if profile_stage is not None:
+        metrics.write_profile()
+    return ShardResult(index, documents, failures, metrics.drain())
+
+
+def _run_isolated(index, path, options):
+    """Re-run a single file in a fresh, single-use worker process."""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(process_shard, index, [path], **options).result()
+
+
+def _recover_shard(index, paths, options):
+    """Retry a shard whose worker died, one file at a time, quarantining files that still fail."""
+    documents = []
+    failures = []
+    metrics = MetricsRegistry()
+    for path in paths:
+        try:
+            result = _run_isolated(index, path, options)
+        except Exception as exc:
+            logger.error("Worker crashed on %s: %s", path, exc)
+            failures.append((str(path), f"{type(exc).__name__}: {exc}"))
+            if Path(path).exists():
+                quarantine_file(path, FILETYPE_CORRUPT, options.get("failed_root"))
+            continue
+        documents.extend(result.documents)
+        failures.extend(result.failures)
+        metrics.merge(result.metrics)
+    return ShardResult(index, documents, failures, metrics)
+
+
+def run_batch(
+    paths=None,
+    raw_dir=RAW_DIR,
+    workers=None,
+    shard_size=DEFAULT_SHARD_SIZE,
+    max_pending=None,
+    preprocessed_dir=PREPROCESSED_DIR,
+    processed_dir=PROCESSED_DIR,
+    failed_root=None,
+    cache_dir=None,
+    cache_bytes=DEFAULT_MAX_BYTES,
+    sketch_path=None,
+    profile_stage=None,
+    profile_dir=None,
+    profile_memory=False,
+):
+    """
+    Process files in parallel and yield one `ShardResult` per shard, in input order.
+
+    Worker metrics are merged into this process's `get_metrics()` registry as shards complete, together with
+    "pending_shards" (shards in flight) and "ready_shards" (finished but not yet consumed) queue-depth gauges.
+
+    Args:
+        paths: Files to process; discovered under `raw_dir` when omitted.
+        raw_dir: Directory searched when `paths` is None.
+        workers: Number of worker processes; defaults to the CPU count.
+        shard_size: Files per shard.
+        max_pending: Maximum shards in flight; defaults to twice the worker count.
+        preprocessed_dir: Output directory for the cleaning sub-pipeline.
+        processed_dir: Output directory for the tokenising sub-pipeline.
+        failed_root: Optional override for the `data/failed/` directory.
+        cache_dir: Directory of a shared `StageCache` (e.g., `CACHE_DIR`); None disables caching.
+        cache_bytes: Size limit of the stage cache.
+        sketch_path: Saved `LineFrequencySketch` from `build_boilerplate_sketch`; enables frequency-based
+            boilerplate removal.
+        profile_stage: Name of a stage to profile in every worker (see `enable_stage_profiling`).
+        profile_dir: Directory for the per-worker profiles.
+        profile_memory: Also trace memory allocations of the profiled stage.
+    """
+    paths = discover_files(raw_dir) if paths is None else [Path(path) for path in paths]
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    options = {
+        "preprocessed_dir": preprocessed_dir,
+        "processed_dir": processed_dir,
+        "failed_root": failed_root,
+        "cache_dir": cache_dir,
+        "cache_bytes": cache_bytes,
+        "sketch_path": sketch_path,
+        "profile_stage": profile_stage,
+        "profile_dir": profile_dir,
+        "profile_memory": profile_memory,
+        "page_workers": page_workers_per_worker(workers),
+        "raw_root": raw_dir,
+    }
+    metrics = get_metrics()
+    shards = iter(enumerate(make_shards(paths, shard_size)))
+    logger.info("Processing %d files with %d workers", len(paths), workers)
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+
+    def submit_next():
+        for index, shard in shards:
+            pending.append((index, shard, executor.submit(process_shard, index, shard, **options)))
+            return
+
+    try:
+        for _ in range(max_pending):
+            submit_next()
+        while pending:
+            metrics.gauge("pending_shards", len(pending))
+            metrics.gauge("ready_shards", sum(entry[2].done() for entry in pending))
+            index, shard, future = pending.popleft()
+            try:
+                result = future.result()
+            except Exception as exc:
+                logger.error("Shard %d failed (%s); retrying file by file", index, exc)
+                result = _recover_shard(index, shard, options)
+                if isinstance(exc, BrokenProcessPool):
+                    # A dead worker breaks the whole pool: restart it and resubmit shards that did not finish.
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = ProcessPoolExecutor(max_workers=workers)
+                    in_flight = list(pending)
+                    pending.clear()
+                    for other_index, other_shard, other_future in in_flight:
+                        if not other_future.done() or other_future.exception() is not None:
+                            other_future = executor.submit(process_shard, other_index, other_shard, **options)
+                        pending.append((other_index, other_shard, other_future))
+            metrics.merge(result.metrics)
+            submit_next()
+            yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def sketch_shard(
+    paths,
+    cache_dir=None,
+    cache_bytes=DEFAULT_MAX_BYTES,
+    width=DEFAULT_SKETCH_WIDTH,
+    depth=DEFAULT_SKETCH_DEPTH,
+    page_workers=None,
+):
+    """Worker entry point for the first boilerplate pass: return a `LineFrequencySketch` of `paths`."""
+    set_page_workers(page_workers)
+    cache = _worker_cache(cache_dir, cache_bytes)
+    sketch = LineFrequencySketch(width, depth)
+    for path in paths:
+        try:
+            # Unreadable files are left in place; the second pass quarantines them.
+            build_line_sketch(load_documents([path], quarantine=False), sketch=sketch, cache=cache)
+        except Exception as exc:
+            logger.error("Sketching failed on %s: %s", path, exc)
+    return sketch
+
+
+def build_boilerplate_sketch(
+    paths=None,
+    raw_dir=RAW_DIR,
+    workers=None,
+    sketch_path=None,
+    cache_dir=None,
+    cache_bytes=DEFAULT_MAX_BYTES,
+    width=DEFAULT_SKETCH_WIDTH,
+    depth=DEFAULT_SKETCH_DEPTH,
+):
+    """
+    First pass of two-pass boilerplate removal over many files, in parallel.
+
+    Args:
+        paths: Files to count; discovered under `raw_dir` when omitted.
+        raw_dir: Directory searched when `paths` is None.
+        workers: Number of worker processes; defaults to the CPU count.
+        sketch_path: Where to save the merged sketch for `run_batch`; not saved when None.
+        cache_dir: Directory of a shared `StageCache`, so the second pass reuses first-pass stage outputs.
+        cache_bytes: Size limit of the stage cache.
+        width, depth: Sketch dimensions.
+
+    Returns:
+        The merged `LineFrequencySketch`.
+    """
+    paths = discover_files(raw_dir) if paths is None else [Path(path) for path in paths]
+    workers = workers or os.cpu_count() or 1
+    tasks = make_shards(paths, max(1, -(-len(paths) // (workers * SKETCH_TASKS_PER_WORKER))))
+    merged = LineFrequencySketch(width, depth)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        page_workers = page_workers_per_worker(workers)
+        futures = [
+            executor.submit(sketch_shard, task, cache_dir, cache_bytes, width, depth, page_workers) for task in tasks
+        ]
+        for future in as_completed(futures):
+            merged.merge(future.result())
+    documents = sum(merged.domain_documents.values())
+    logger.info("Counted lines of %d documents across %d sites", documents, len(merged.domain_documents))
+    if sketch_path is not None:
+        merged.save(sketch_path)
+    return merged
+
+
+def write_manifest(results, manifest_path):
+    """
+    Write shard results to a JSON Lines manifest, one line per document or failure, in input order.
+
+    Returns:
+        A `(documents, failures)` count tuple.
+    """
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    n_documents = n_failures = 0
+    with manifest_path.open("w", encoding="utf-8") as handle:
+        for result in results:
+            for doc_id, source in result.documents:
+                handle.write(json.dumps({"doc_id": doc_id, "source": source, "status": "ok"}) + "\n")
+                n_documents += 1
+            for source, error in result.failures:
+                handle.write(json.dumps({"source": source, "status": "failed", "error": error}) + "\n")
+                n_failures += 1
+    return n_documents, n_failures
@@ -1 +1,72 @@
-"""Manages custom exceptions and recovery."""
\ No newline at end of file
+"""
+Module: error_handling.py
+
+Purpose:
+- Manages custom exceptions and recovery for the Aussie NLP Toolkit.
+- Moves files that cannot be processed into `data/failed/` so they are not retried on every run.
+
+Frameworks/Tools:
+- Built-in Python libraries (`shutil`, `pathlib`).
+
+Expected Inputs:
+- Exceptions raised by loader, cleaning and tokenising modules.
+- File paths of inputs that failed detection or loading.
+
+Expected Outputs:
+- Toolkit exception types.
+- Quarantined files in `data/failed/corrupt/` or `data/failed/unsupported/`.
+"""
+
+import shutil
+from pathlib import Path
+
+from constants import FAILED_CORRUPT_DIR, FAILED_UNSUPPORTED_DIR, FILETYPE_CORRUPT
+from utils.logging import get_logger
+
+logger = get_logger("error_handling")
+
+
+class AussieNLPError(Exception):
+    """Base class for all toolkit errors."""
+
+
+class UnsupportedFileTypeError(AussieNLPError):
+    """Raised when a file type is not handled by any loader."""
+
+
+class CorruptFileError(AussieNLPError):
+    """Raised when a file's contents do not match its declared type."""
+
+
+class StageError(AussieNLPError):
+    """Raised when a pipeline stage fails on a document."""
+
+    def __init__(self, stage, doc_id, cause):
+        super().__init__(f"Stage '{stage}' failed on document '{doc_id}': {cause}")
+        self.stage = stage
+        self.doc_id = doc_id
+        self.cause = cause
+
+
+def quarantine_file(file_path, filetype, failed_root=None):
+    """
+    Move a file that failed detection or loading into `data/failed/`.
+
+    Args:
+        file_path: Path of the offending file.
+        filetype: `FILETYPE_CORRUPT` routes to `corrupt/`; anything else to `unsupported/`.
+        failed_root: Optional override for the `data/failed/` directory (used by tests and batch runs).
+
+    Returns:
+        The new path of the file.
+    """
+    file_path = Path(file_path)
+    if failed_root is None:
+        target_dir = FAILED_CORRUPT_DIR if filetype == FILETYPE_CORRUPT else FAILED_UNSUPPORTED_DIR
+    else:
+        target_dir = Path(failed_root) / ("corrupt" if filetype == FILETYPE_CORRUPT else "unsupported")
+    target_dir.mkdir(parents=True, exist_ok=True)
+    target = target_dir / file_path.name
+    shutil.move(str(file_path), str(target))
+    logger.warning("Quarantined %s -> %s", file_path, target)
+    return target
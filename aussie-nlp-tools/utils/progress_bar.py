@@ -1 +1,116 @@
-"""Tracks pipeline progress."""
\ No newline at end of file
+"""
+Module: progress_bar.py
+
+Purpose:
+- Tracks pipeline progress.
+- Shows a live, single-line view of a batch run: completed work units, rate, ETA and per-stage throughput.
+
+Frameworks/Tools:
+- Built-in Python `sys` and `time`.
+
+Expected Inputs:
+- A total (e.g., number of shards) and `update` calls as units complete; optionally a run report's stage metrics
+  from `utils.logging.get_metrics()`.
+
+Expected Outputs:
+- A line such as "pipeline [########------] 12/20 shards 3.1/s ETA 0:00:03 | clean_html_tags 850 docs/s",
+  redrawn in place on a terminal.
+
+Behavior:
+- Redraws at most every `min_interval` seconds, so updating per record is cheap.
+- On a non-interactive stream (e.g., a log file) only the final line is written by `close`.
+
+Planned Test Approach:
+- Verify rendering, ETA and throttling with an in-memory stream.
+"""
+
+import sys
+import time
+
+BAR_WIDTH = 24
+DEFAULT_MIN_INTERVAL = 0.5
+# Stages shown in the live view, slowest first.
+MAX_STAGES_SHOWN = 3
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def format_stage_rates(stages, limit=MAX_STAGES_SHOWN):
+    """Summarise run report `stages` as "<stage> <n> docs/s" entries, slowest stages first."""
+    rates = [(summary["docs_per_second"], name) for name, summary in stages.items() if summary["docs_per_second"]]
+    return " · ".join(f"{name} {rate:,.0f} docs/s" for rate, name in sorted(rates)[:limit])
+
+
+class ProgressBar:
+    """
+    Throttled progress line:
+
+        with ProgressBar(total=len(shards), unit="shards") as progress:
+            for result in results:
+                progress.update(1, postfix=f"{documents} docs")
+    """
+
+    def __init__(
+        self, total=None, description="pipeline", unit="items", stream=None, min_interval=DEFAULT_MIN_INTERVAL
+    ):
+        self.total = total
+        self.description = description
+        self.unit = unit
+        self.stream = stream if stream is not None else sys.stderr
+        self.min_interval = min_interval
+        self.live = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.count = 0
+        self.postfix = ""
+        self.start = time.perf_counter()
+        self._last_render = None
+        self._last_width = 0
+
+    def render(self):
+        """Return the progress line for the current state."""
+        elapsed = time.perf_counter() - self.start
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        parts = [self.description]
+        if self.total:
+            filled = min(BAR_WIDTH, BAR_WIDTH * self.count // self.total)
+            parts.append(f"[{'#' * filled}{'-' * (BAR_WIDTH - filled)}] {self.count}/{self.total} {self.unit}")
+        else:
+            parts.append(f"{self.count} {self.unit}")
+        parts.append(f"{rate:.1f}/s")
+        if self.total and rate > 0:
+            parts.append(f"ETA {format_duration(max(0, self.total - self.count) / rate)}")
+        else:
+            parts.append(f"elapsed {format_duration(elapsed)}")
+        line = " ".join(parts)
+        return f"{line} | {self.postfix}" if self.postfix else line
+
+    def update(self, n=1, postfix=None):
+        self.count += n
+        if postfix is not None:
+            self.postfix = postfix
+        if not self.live:
+            return
+        now = time.perf_counter()
+        if self._last_render is not None and now - self._last_render < self.min_interval:
+            return
+        self._last_render = now
+        self._draw(self.render(), end="")
+
+    def close(self):
+        self._draw(self.render(), end="\n")
+
+    def _draw(self, line, end):
+        # Pad with spaces to overwrite a longer previous line.
+        padding = " " * max(0, self._last_width - len(line))
+        self._last_width = len(line)
+        prefix = "\r" if self.live else ""
+        self.stream.write(f"{prefix}{line}{padding}{end}")
+        self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
@@ -0,0 +1,144 @@
+"""
+Module: stage_cache.py
+
+Purpose:
+- Content-addressed cache for cleaning and tokenising stage outputs, so reruns skip work on unchanged documents.
+- Re-running the pipeline after changing one stage only recomputes that stage and the stages after it.
+
+Frameworks/Tools:
+- Built-in Python libraries (`hashlib`, `json`, `os`).
+
+Expected Inputs:
+- A stage fingerprint (stage name, version and configuration) and the stage's input text.
+
+Expected Outputs:
+- Cached stage outputs stored as JSON files under `data/cache/` (fanned out by the first two hex digits of the key).
+
+Behavior:
+- Keys are SHA-256 digests of (stage name, stage version, callable fingerprint, input text). Changing a stage's
+  version string or its configuration (e.g., `functools.partial` keywords) produces new keys.
+- A hit refreshes the entry's modification time; when the cache grows past `max_bytes`, the least recently used
+  entries are deleted until it is back under 90% of the limit.
+- Writes are atomic (temporary file + `os.replace`), so several worker processes can share one cache directory.
+
+Planned Test Approach:
+- Verify hits, misses and that configuration changes invalidate entries.
+- Verify that eviction removes the least recently used entries first.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from constants import CACHE_DIR
+from utils.logging import get_logger
+
+logger = get_logger("stage_cache")
+
+DEFAULT_MAX_BYTES = 1 << 30
+# After eviction the cache is trimmed to this fraction of `max_bytes`, so eviction does not run on every write.
+EVICTION_LOW_WATER = 0.9
+
+
+def callable_fingerprint(func):
+    """Describe `func` (including `functools.partial` arguments) so configuration changes alter cache keys."""
+    if isinstance(func, functools.partial):
+        arguments = [repr(arg) for arg in func.args]
+        arguments += [f"{key}={value!r}" for key, value in sorted(func.keywords.items())]
+        return f"{callable_fingerprint(func.func)}({', '.join(arguments)})"
+    module = getattr(func, "__module__", None) or type(func).__module__
+    name = getattr(func, "__qualname__", None) or type(func).__qualname__
+    return f"{module}.{name}"
+
+
+class StageCache:
+    """Size-bounded, on-disk LRU cache of stage outputs keyed by content hash."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = sum(size for _, _, size in self._entries())
+
+    @staticmethod
+    def make_key(stage_name, version, fingerprint, text):
+        digest = hashlib.sha256(f"{stage_name}\0{version}\0{fingerprint}\0".encode("utf-8"))
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached value for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with path.open(encoding="utf-8") as handle:
+                value = json.load(handle)
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store `value` (any JSON-serialisable object) under `key`."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        try:
+            replaced = path.stat().st_size  # another worker, or a cache miss on corrupt JSON, may have written it
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp, path)
+        self._size += len(data) - replaced
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def cached_call(self, stage_name, version, func, text):
+        """Return `func(text)`, served from the cache when the same stage has already seen `text`."""
+        key = self.make_key(stage_name, version, callable_fingerprint(func), text)
+        value = self.get(key)
+        if value is None:
+            value = func(text)
+            self.put(key, value)
+        return value
+
+    def _entries(self):
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield entry.path, stat.st_mtime, stat.st_size
+
+    def evict(self):
+        """Delete least recently used entries until the cache is under the low-water mark."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * EVICTION_LOW_WATER
+        removed = 0
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._size = total
+        logger.info("Evicted %d cache entries; cache now %d bytes", removed, total)
@@ -0,0 +1,121 @@
+"""
+Benchmark: aho_corasick.py
+
+Compares the Aho–Corasick dictionary matcher with a regex alternation and per-position n-gram lookups as the
+lexicon grows (1k, 10k and 100k entries by default).
+
+Lexicons are synthetic: a mix of single words and two- to four-word phrases drawn from a fixed vocabulary, so
+documents built from the same vocabulary contain realistic numbers of hits. For each size the table reports build
+time, compiled-file size and load time, matches per document, and documents per second for each approach. Larger
+lexicons cover more of the vocabulary, so per-document cost grows with the number of matches reported, not with
+the number of entries searched.
+
+Usage:
+    python benchmarks/bench_aho_corasick.py [--sizes 1000 10000 100000] [--docs 2000] [--skip-regex]
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "aussie-nlp-tools"))
+
+from utils.aho_corasick import TOKEN_PATTERN, AhoCorasickMatcher, fold_token  # noqa: E402
+
+VOCABULARY_SIZE = 50_000
+DOC_WORDS = 300
+
+
+def make_lexicon(size, rng, vocabulary):
+    lexicon = set()
+    while len(lexicon) < size:
+        lexicon.add(" ".join(rng.choices(vocabulary, k=rng.choice((1, 1, 2, 3, 4)))))
+    return sorted(lexicon)
+
+
+def make_documents(docs, rng, vocabulary):
+    return [" ".join(rng.choices(vocabulary, k=DOC_WORDS)).capitalize() + "." for _ in range(docs)]
+
+
+def ngram_matcher(lexicon):
+    """The previous approach: at each token, try every phrase length from longest to shortest."""
+    phrases = {tuple(fold_token(token) for token in TOKEN_PATTERN.findall(phrase)) for phrase in lexicon}
+    longest = max(len(phrase) for phrase in phrases)
+
+    def count(text):
+        folded = [fold_token(token) for token in TOKEN_PATTERN.findall(text)]
+        hits, i = 0, 0
+        while i < len(folded):
+            for length in range(min(longest, len(folded) - i), 0, -1):
+                if tuple(folded[i : i + length]) in phrases:
+                    hits += 1
+                    i += length
+                    break
+            else:
+                i += 1
+        return hits
+
+    return count
+
+
+def regex_matcher(lexicon):
+    phrases = sorted(lexicon, key=len, reverse=True)
+    alternation = "|".join(re.escape(phrase).replace(r"\ ", r"\s+") for phrase in phrases)
+    pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+    return lambda text: len(pattern.findall(text))
+
+
+def throughput(count, documents):
+    start = time.perf_counter()
+    hits = sum(count(text) for text in documents)
+    return len(documents) / (time.perf_counter() - start), hits
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--skip-regex", action="store_true", help="Skip the regex alternation (slow to compile).")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    vocabulary = [f"w{i}" for i in range(VOCABULARY_SIZE)]
+    documents = make_documents(args.docs, rng, vocabulary)
+
+    print(
+        f"{'entries':>8} {'build s':>8} {'file KiB':>9} {'load s':>7} {'hits/doc':>9}"
+        f" {'AC doc/s':>9} {'n-gram doc/s':>13} {'regex doc/s':>12}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            lexicon = make_lexicon(size, rng, vocabulary)
+            start = time.perf_counter()
+            matcher = AhoCorasickMatcher(lexicon)
+            build = time.perf_counter() - start
+
+            path = Path(tmp) / f"lexicon-{size}.pkl"
+            matcher.save(path)
+            start = time.perf_counter()
+            matcher = AhoCorasickMatcher.load(path)
+            load = time.perf_counter() - start
+
+            ac_rate, ac_hits = throughput(lambda text: len(matcher.find(text)), documents)
+            ngram_rate, ngram_hits = throughput(ngram_matcher(lexicon), documents)
+            assert ac_hits == ngram_hits, (ac_hits, ngram_hits)
+            regex_rate = "-"
+            if not args.skip_regex:
+                regex_rate = f"{throughput(regex_matcher(lexicon), documents)[0]:.0f}"
+            print(
+                f"{size:>8} {build:>8.2f} {path.stat().st_size / 1024:>9.0f} {load:>7.3f}"
+                f" {ac_hits / len(documents):>9.1f}"
+                f" {ac_rate:>9.0f} {ngram_rate:>13.0f} {regex_rate:>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: clean_html_tags.py
+
+Compares the HTML text extraction engines on the same inputs:
+- stream: one streaming pass, no document tree (`html.parser`, or `lxml` when installed);
+- soup: BeautifulSoup document tree (the previous implementation);
+- auto: streaming with the BeautifulSoup fallback for malformed pages (the pipeline default).
+
+Three input sets are generated with a fixed seed:
+- pages: typical news pages with navigation, scripts and footer boilerplate (`synthetic_corpus.render_html`);
+- large: a few multi-megabyte pages, where peak traced memory per page is also reported;
+- malformed: tag soup with unclosed and stray tags, where the share of pages routed to BeautifulSoup is reported.
+
+For every set the outputs of `auto` and `soup` are compared, so a speed-up never hides a change in the text.
+
+Usage:
+    python benchmarks/bench_clean_html_tags.py [--pages 2000] [--large-mb 5] [--malformed 2000]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "aussie-nlp-tools"))
+
+from preprocessing import clean_html_tags as module  # noqa: E402
+from preprocessing.clean_html_tags import clean_html_tags, stream_text  # noqa: E402
+from synthetic_corpus import SITES, make_paragraphs, make_sentence, render_html  # noqa: E402
+
+ENGINES = ("stream", "soup", "auto")
+SOUP_TAGS = ("p", "div", "b", "nav", "script", "style", "li", "ul", "br", "span", "td", "tr", "a", "hr")
+
+
+def make_pages(count, rng):
+    pages = []
+    for i in range(count):
+        site = SITES[i % len(SITES)]
+        title = make_sentence(rng, 0.5).rstrip(".")
+        pages.append(render_html(site, title, make_paragraphs(rng, 0.5), f"https://www.{site}/news/{i}"))
+    return pages
+
+
+def make_large_pages(megabytes, rng, count=3):
+    paragraphs = make_paragraphs(rng, 0.5, paragraphs=(200, 200))
+    unit = render_html(SITES[0], "Large page", paragraphs, "https://www.abc.net.au/news/large")
+    body = unit[unit.index("<article>"):unit.index("</article>") + len("</article>")]
+    repeats = max(1, int(megabytes * 1e6 / len(body)))
+    return [unit.replace(body, body * repeats) for _ in range(count)]
+
+
+def make_malformed(count, rng):
+    pages = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(20, 200)):
+            roll, tag = rng.random(), rng.choice(SOUP_TAGS)
+            if roll < 0.3:
+                parts.append(f"<{tag}>")
+            elif roll < 0.5:
+                parts.append(f"</{tag}>")
+            else:
+                parts.append(make_sentence(rng, 0.5) + " ")
+        pages.append("".join(parts))
+    return pages
+
+
+def measure(pages, engine):
+    start = time.perf_counter()
+    for page in pages:
+        clean_html_tags(page, engine)
+    return time.perf_counter() - start
+
+
+def peak_memory(page, engine):
+    tracemalloc.start()
+    try:
+        clean_html_tags(page, engine)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def agreement(pages):
+    return sum(clean_html_tags(page) == clean_html_tags(page, "soup") for page in pages) / len(pages)
+
+
+def report(label, pages, memory=False):
+    megabytes = sum(len(page) for page in pages) / 1e6
+    fallbacks = sum(not stream_text(page)[1] for page in pages)
+    print(f"\n{label}: {len(pages)} pages, {megabytes:.1f} MB; auto == soup on {agreement(pages):.1%}; "
+          f"auto falls back on {fallbacks / len(pages):.1%}")
+    header = f"{'engine':<8} {'pages/s':>10} {'MB/s':>8}"
+    print(header + (f" {'peak MB/page':>13}" if memory else ""))
+    rates = {}
+    for engine in ENGINES:
+        elapsed = measure(pages, engine)
+        rates[engine] = len(pages) / elapsed
+        line = f"{engine:<8} {rates[engine]:>10,.1f} {megabytes / elapsed:>8.1f}"
+        if memory:
+            line += f" {peak_memory(pages[0], engine) / 1e6:>13.1f}"
+        print(line)
+    print(f"stream speed-up over soup: {rates['stream'] / rates['soup']:.1f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--large-mb", type=float, default=5.0)
+    parser.add_argument("--malformed", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    print(f"streaming parser: {'lxml' if module.etree is not None else 'html.parser'}")
+    report("pages", make_pages(args.pages, rng))
+    report("large", make_large_pages(args.large_mb, rng), memory=True)
+    report("malformed", make_malformed(args.malformed, rng))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: data_loader_txt.py
+
+Compares ways of loading the same large plain text file:
+- read+decode: `Path.read_bytes()` then `decode` (the previous implementation; holds the raw bytes and the text);
+- mmap: `read_text`, decoding straight from the memory-mapped file;
+- mmap parts: `iter_text_parts`, decoding `--part-mb` slices one at a time (what `load_txt` does for files over its
+  `max_document_bytes` limit).
+
+For each method the report shows MB/s (best of `--repeat`) and the peak Python heap allocation traced while loading.
+Mapped pages live in the page cache, not on the heap, so they are not counted. Caching makes reads after the first
+fast; the comparison is between CPU and copy costs, not disk speed.
+
+Usage:
+    python benchmarks/bench_data_loader_txt.py [--mb 200] [--part-mb 16] [--repeat 3]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "aussie-nlp-tools"))
+
+from data_loader.data_loader_txt import iter_text_parts, read_text  # noqa: E402
+from synthetic_corpus import make_paragraphs  # noqa: E402
+
+
+def write_archive(path, megabytes, rng):
+    paragraphs = make_paragraphs(rng, 0.5, paragraphs=(2000, 2000))
+    block = ("\n\n".join(paragraphs) + "\n\n").encode("utf-8")
+    with open(path, "wb") as handle:
+        for _ in range(max(1, int(megabytes * 1e6 / len(block)))):
+            handle.write(block)
+
+
+def read_and_decode(path):
+    return len(Path(path).read_bytes().decode("utf-8-sig"))
+
+
+def mmap_whole(path):
+    return len(read_text(path))
+
+
+def mmap_parts(path, part_bytes):
+    return sum(len(text) for _, text in iter_text_parts(path, part_bytes))
+
+
+def measure(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=200.0)
+    parser.add_argument("--part-mb", type=float, default=16.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "archive.txt"
+        write_archive(path, args.mb, random.Random(args.seed))
+        megabytes = path.stat().st_size / 1e6
+        print(f"{megabytes:.0f} MB file\n")
+        methods = {
+            "read+decode": lambda: read_and_decode(path),
+            "mmap": lambda: mmap_whole(path),
+            "mmap parts": lambda: mmap_parts(path, int(args.part_mb * 1e6)),
+        }
+        print(f"{'method':<14} {'MB/s':>8} {'peak heap MB':>13}")
+        for name, func in methods.items():
+            elapsed, peak = measure(func, args.repeat)
+            print(f"{name:<14} {megabytes / elapsed:>8.0f} {peak / 1e6:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
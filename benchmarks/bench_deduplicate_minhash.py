@@ -0,0 +1,77 @@
+"""
+Benchmark: deduplicate_minhash.py
+
+Measures recall, precision and throughput of MinHash + LSH deduplication across band/row settings.
+
+A synthetic corpus of random-word documents is generated with a fixed seed; a share of them are near-duplicates
+made by substituting a fraction of the words of an earlier document. Recall is the share of planted duplicates
+removed; precision is the share of removed documents that were planted duplicates.
+
+Usage:
+    python benchmarks/bench_deduplicate_minhash.py [--docs 20000] [--dup-rate 0.2] [--edit-rate 0.01]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "aussie-nlp-tools"))
+
+from deduplication.deduplicate_minhash import MinHashLSH, deduplicate_documents, optimal_bands_rows  # noqa: E402
+from document import Document  # noqa: E402
+
+VOCABULARY_SIZE = 5000
+DOC_WORDS = 200
+# (bands, rows) settings for 128 permutations, from recall-oriented to precision-oriented.
+SETTINGS = [(32, 4), (21, 6), (16, 8), (12, 10), (8, 16)]
+
+
+def make_corpus(docs, dup_rate, edit_rate, seed=13):
+    """Return `(documents, planted duplicate ids)`."""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(VOCABULARY_SIZE)]
+    texts, duplicates = [], set()
+    for i in range(docs):
+        if texts and rng.random() < dup_rate:
+            words = rng.choice(texts).split()
+            for position in rng.sample(range(len(words)), int(len(words) * edit_rate)):
+                words[position] = rng.choice(vocabulary)
+            duplicates.add(f"d{i}")
+        else:
+            words = rng.choices(vocabulary, k=DOC_WORDS)
+        texts.append(" ".join(words))
+    return [Document(f"d{i}", text) for i, text in enumerate(texts)], duplicates
+
+
+def run(documents, duplicates, threshold, bands, rows):
+    index = MinHashLSH(threshold=threshold, bands=bands, rows=rows)
+    start = time.perf_counter()
+    kept = {document.doc_id for document in deduplicate_documents(documents, index)}
+    elapsed = time.perf_counter() - start
+    removed = {document.doc_id for document in documents} - kept
+    recall = len(removed & duplicates) / len(duplicates) if duplicates else 1.0
+    precision = len(removed & duplicates) / len(removed) if removed else 1.0
+    return recall, precision, len(documents) / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--dup-rate", type=float, default=0.2)
+    parser.add_argument("--edit-rate", type=float, default=0.01)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args(argv)
+
+    documents, duplicates = make_corpus(args.docs, args.dup_rate, args.edit_rate)
+    settings = SETTINGS + [optimal_bands_rows(args.threshold, 128)]
+    print(f"{len(documents)} documents, {len(duplicates)} planted near-duplicates (edit rate {args.edit_rate})")
+    print(f"{'bands':>5} {'rows':>4} {'recall':>7} {'precision':>9} {'docs/s':>9}")
+    for bands, rows in settings:
+        recall, precision, throughput = run(documents, duplicates, args.threshold, bands, rows)
+        print(f"{bands:>5} {rows:>4} {recall:>7.3f} {precision:>9.3f} {throughput:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
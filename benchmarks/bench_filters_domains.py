@@ -0,0 +1,113 @@
+"""
+Benchmark: filters_domains.py
+
+Compares domain filtering of the same crawl-like URL batches:
+- per-record: `urlsplit` on every URL, then every rule checked with `endswith` (most specific match wins);
+- vectorised: `DomainFilter.mask_urls` (regex host extraction over the column, factorising, one suffix-trie lookup per
+  distinct host, NumPy take and bincount).
+
+URLs are drawn from a Zipf-like distribution over generated `.au` and international hosts, as in a crawl where a few
+sites contribute most pages. Rule sets of increasing size mix allow rules, deny rules and `*.` wildcards. The
+per-record baseline runs on a sample (`--sample`) since it slows down with the number of rules. Both methods must
+agree on every sampled record.
+
+Usage:
+    python benchmarks/bench_filters_domains.py [--records 1000000] [--hosts 50000] [--rules 10,1000,10000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "aussie-nlp-tools"))
+
+from filters.filters_domains import DEFAULT_BATCH_SIZE, DomainFilter, parse_pattern  # noqa: E402
+
+SUFFIXES = ("com.au", "net.au", "org.au", "gov.au", "edu.au", "nsw.gov.au", "vic.gov.au", "com", "org", "co.uk")
+WORDS = ("news", "shop", "footy", "surf", "bush", "harbour", "outback", "local", "daily", "coast", "uni", "health")
+
+
+def make_hosts(count, rng):
+    hosts = set()
+    while len(hosts) < count:
+        name = rng.choice(WORDS) + rng.choice(WORDS) + str(rng.randrange(1000))
+        prefix = rng.choice(("", "www.", "m.", "blog."))
+        hosts.add(f"{prefix}{name}.{rng.choice(SUFFIXES)}")
+    return sorted(hosts)
+
+
+def make_urls(hosts, count, rng):
+    weights = 1.0 / np.arange(1, len(hosts) + 1)
+    picks = np.random.default_rng(rng.randrange(1 << 32)).choice(len(hosts), size=count, p=weights / weights.sum())
+    return [f"https://{hosts[index]}/page/{position}" for position, index in enumerate(picks)]
+
+
+def make_rules(hosts, count, rng):
+    allow, deny = set(SUFFIXES[:5]), {"*.nsw.gov.au"}
+    while len(allow) + len(deny) < count:
+        domain = rng.choice(hosts).split(".", 1)[1] if rng.random() < 0.5 else rng.choice(hosts)
+        (deny if rng.random() < 0.5 else allow).add(("*." if rng.random() < 0.1 else "") + domain)
+    allow -= {pattern for pattern in allow if pattern in deny}
+    return sorted(allow), sorted(deny)
+
+
+def per_record(urls, allow, deny):
+    rules = []
+    for patterns, decision in ((allow, True), (deny, False)):
+        for pattern in patterns:
+            labels, wildcard = parse_pattern(pattern)
+            rules.append((".".join(reversed(labels)), wildcard, decision))
+    keep = []
+    for url in urls:
+        host = (urlsplit(url).hostname or "").rstrip(".")
+        best, decision = -1, False
+        for domain, wildcard, allowed in rules:
+            matched = host.endswith("." + domain) or (not wildcard and host == domain)
+            depth = domain.count(".") * 2 + (wildcard and host != domain)
+            if matched and depth > best:
+                best, decision = depth, allowed
+        keep.append(decision)
+    return np.array(keep)
+
+
+def vectorised(urls, allow, deny):
+    domain_filter = DomainFilter(allow, deny)
+    batches = (urls[start:start + DEFAULT_BATCH_SIZE] for start in range(0, len(urls), DEFAULT_BATCH_SIZE))
+    return np.concatenate([domain_filter.mask_urls(batch) for batch in batches])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--hosts", type=int, default=50_000)
+    parser.add_argument("--rules", default="10,1000,10000")
+    parser.add_argument("--sample", type=int, default=20_000, help="Records checked by the per-record baseline.")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    hosts = make_hosts(args.hosts, rng)
+    urls = make_urls(hosts, args.records, rng)
+    sample = urls[:args.sample]
+    print(f"{len(urls):,} URLs over {len(hosts):,} hosts\n")
+    print(f"{'rules':>7} {'per-record rec/s':>17} {'vectorised rec/s':>17} {'speed-up':>9}")
+    for count in (int(value) for value in args.rules.split(",")):
+        allow, deny = make_rules(hosts, count, rng)
+        start = time.perf_counter()
+        expected = per_record(sample, allow, deny)
+        baseline = len(sample) / (time.perf_counter() - start)
+        start = time.perf_counter()
+        keep = vectorised(urls, allow, deny)
+        rate = len(urls) / (time.perf_counter() - start)
+        if not np.array_equal(keep[:len(sample)], expected):
+            raise SystemExit(f"{count} rules: vectorised and per-record decisions differ")
+        print(f"{len(allow) + len(deny):>7} {baseline:>17,.0f} {rate:>17,.0f} {rate / baseline:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: language_filter.py
+
+Compares ways of filtering the same documents to English:
+- per-line: one scorer call per line, no cache and no prefix short circuit (the per-call pattern of an external
+  detector, with the built-in scorer standing in for it);
+- batched: each document's lines scored as one batch, no cache and no short circuit;
+- batched+cache: as above, with verdicts cached by line hash;
+- default: batched+cache with the prefix short circuit (the pipeline setting, `filter_language`);
+- langid per-line: `langid.classify` on every line, when `langid` is installed.
+
+Documents are generated with a fixed seed: English news text with repeated site boilerplate lines (from
+`synthetic_corpus.py`), a share of English documents with foreign-language lines mixed in, and a share of wholly
+foreign documents, using sentences from the language samples. The report shows docs/s for each mode, how blocks were
+decided (cache hits, pre-judged short/non-Latin blocks, scored, fallen through to the external detector), how many
+documents were short-circuited, and how often the default mode's output differs from batched scoring of every line.
+
+Usage:
+    python benchmarks/bench_language_filter.py [--docs 2000] [--mixed 0.1] [--foreign 0.05]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "aussie-nlp-tools"))
+
+from preprocessing.language_filter import REJECTED, LanguageIdentifier, langid  # noqa: E402
+from preprocessing.language_samples import LANGUAGE_SAMPLES  # noqa: E402
+from synthetic_corpus import SITE_HEADER, make_paragraphs  # noqa: E402
+
+FOOTER = ("Privacy Policy | Terms of Use | Contact Us", "Copyright 2025. All rights reserved.")
+_SENTENCE = re.compile(r"(?<=[.?!])\s+")
+
+
+def foreign_sentences():
+    return {
+        language: _SENTENCE.split(text) for language, text in LANGUAGE_SAMPLES.items() if language != "en"
+    }
+
+
+def make_documents(count, mixed, foreign, rng):
+    sentences = foreign_sentences()
+    languages = sorted(sentences)
+    documents = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < foreign:
+            language = rng.choice(languages)
+            body = [" ".join(rng.sample(sentences[language], 3)) for _ in range(rng.randint(3, 8))]
+        else:
+            body = make_paragraphs(rng, 0.5)
+            if roll < foreign + mixed:
+                language = rng.choice(languages)
+                for _ in range(rng.randint(1, 3)):
+                    body.insert(rng.randrange(len(body) + 1), rng.choice(sentences[language]))
+        documents.append("\n".join([*SITE_HEADER, *body, *FOOTER]))
+    return documents
+
+
+def per_line(identifier, text):
+    lines = text.split("\n")
+    return "\n".join(line for line in lines if identifier.verdicts([line])[0] != REJECTED)
+
+
+def batched(identifier, text):
+    lines = text.split("\n")
+    return "\n".join(line for line, verdict in zip(lines, identifier.verdicts(lines)) if verdict != REJECTED)
+
+
+def langid_per_line(text):
+    return "\n".join(line for line in text.split("\n") if langid.classify(line)[0] == "en")
+
+
+def measure(documents, func):
+    start = time.perf_counter()
+    outputs = [func(document) for document in documents]
+    return len(documents) / (time.perf_counter() - start), outputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--mixed", type=float, default=0.1, help="Share of English documents with foreign lines.")
+    parser.add_argument("--foreign", type=float, default=0.05, help="Share of wholly foreign documents.")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    documents = make_documents(args.docs, args.mixed, args.foreign, random.Random(args.seed))
+    megabytes = sum(len(document) for document in documents) / 1e6
+    print(f"{len(documents)} documents, {megabytes:.1f} MB\n")
+
+    modes = {
+        "per-line": LanguageIdentifier(cache_size=0, prefix_chars=0),
+        "batched": LanguageIdentifier(cache_size=0, prefix_chars=0),
+        "batched+cache": LanguageIdentifier(prefix_chars=0),
+        "default": LanguageIdentifier(),
+    }
+    print(f"{'mode':<16} {'docs/s':>10} {'MB/s':>8}")
+    outputs = {}
+    for name, identifier in modes.items():
+        if name == "per-line":
+            func = lambda text, identifier=identifier: per_line(identifier, text)  # noqa: E731
+        elif name == "default":
+            func = identifier.filter
+        else:
+            func = lambda text, identifier=identifier: batched(identifier, text)  # noqa: E731
+        rate, outputs[name] = measure(documents, func)
+        print(f"{name:<16} {rate:>10,.1f} {rate * megabytes / len(documents):>8.2f}")
+    if langid is not None:
+        rate, _ = measure(documents, langid_per_line)
+        print(f"{'langid per-line':<16} {rate:>10,.1f} {rate * megabytes / len(documents):>8.2f}")
+    else:
+        print("langid not installed; external detector rate not measured")
+
+    stats = modes["default"].stats
+    blocks = sum(stats[key] for key in ("cache_hits", "prejudged", "scored"))
+    print(f"\ndefault mode: {blocks} blocks judged, {stats['short_circuits']} documents short-circuited")
+    for key in ("cache_hits", "prejudged", "scored", "fallback"):
+        print(f"  {key:<12} {stats[key]:>8} ({stats[key] / max(blocks, 1):.1%})")
+    differing = sum(a != b for a, b in zip(outputs["default"], outputs["batched"]))
+    print(f"default output differs from scoring every line on {differing} documents")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: write_sqlite.py
+
+Compares SQLite write throughput (rows per second) of:
+- naive: one autocommitted `INSERT` per row, default journal and sync settings, indexes present during the load;
+- bulk: `write_documents` (WAL, tuned pragmas, batched `executemany` transactions, indexes built afterwards);
+- writer thread: `SQLiteWriter` fed by several producer threads through its queue.
+
+The naive approach syncs on every row, so it runs on a smaller sample (`--naive-rows`) and is reported as a rate.
+
+Usage:
+    python benchmarks/bench_write_sqlite.py [--rows 100000] [--naive-rows 2000] [--producers 4] [--batch-size 5000]
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "aussie-nlp-tools"))
+
+from document import Document  # noqa: E402
+from output.write_sqlite import (  # noqa: E402
+    CREATE_TABLE,
+    INDEXES,
+    INSERT_ROW,
+    SQLiteWriter,
+    document_row,
+    write_documents,
+)
+
+
+def make_documents(rows):
+    text = "G'day, this is a fair dinkum sentence about the arvo footy at the MCG. " * 8
+    return [
+        Document(f"doc{i}", text, source=f"data/raw/file{i % 100}.txt", metadata={"n": i}, tokens=[["G'day", ","]])
+        for i in range(rows)
+    ]
+
+
+def naive(documents, db_path):
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    connection.execute(CREATE_TABLE)
+    for statement in INDEXES.values():
+        connection.execute(statement)
+    for document in documents:
+        connection.execute(INSERT_ROW, document_row(document))
+    connection.close()
+
+
+def threaded(documents, db_path, producers, batch_size):
+    chunks = [documents[start::producers] for start in range(producers)]
+    with SQLiteWriter(db_path, batch_size=batch_size) as writer:
+        threads = [threading.Thread(target=lambda chunk=chunk: [writer.put(d) for d in chunk]) for chunk in chunks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+
+def timed(label, func, rows):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {rows:>8} rows {rows / elapsed:>12,.0f} rows/s")
+    return rows / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--naive-rows", type=int, default=2000)
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--dir", type=Path, default=None, help="Directory for the databases (default: a temp dir).")
+    args = parser.parse_args(argv)
+
+    documents = make_documents(args.rows)
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        tmp = Path(tmp)
+        sample = documents[: args.naive_rows]
+        baseline = timed("naive (autocommit per row)", lambda: naive(sample, tmp / "naive.db"), len(sample))
+        bulk = timed(
+            "bulk write_documents", lambda: write_documents(documents, tmp / "bulk.db", args.batch_size), args.rows
+        )
+        writer = timed(
+            f"SQLiteWriter ({args.producers} producers)",
+            lambda: threaded(documents, tmp / "threaded.db", args.producers, args.batch_size),
+            args.rows,
+        )
+    print(f"speed-up over naive: bulk {bulk / baseline:.1f}x, writer thread {writer / baseline:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
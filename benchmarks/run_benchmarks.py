@@ -0,0 +1,260 @@
+"""
+Benchmark suite: per-stage and end-to-end pipeline performance on a synthetic corpus, checked against a baseline.
+
+Steps:
+1. Generates a deterministic corpus with `synthetic_corpus.py` (HTML with boilerplate, JSONL, CSV, PDF-style text,
+   planted near-duplicates, mixed US/AU spelling) in a temporary directory.
+2. Per-stage pass, in this process: loads, cleans, deduplicates and tokenises the corpus one phase at a time and
+   reads each stage's docs/s from the pipeline metrics (`utils.logging.get_metrics`). The best of `--repeat` runs
+   is kept for each metric.
+3. Memory pass: reruns each phase under `tracemalloc` and records its peak traced allocation.
+4. End-to-end pass: `run_batch` over the corpus with `--workers` processes, recording docs/s, MB/s and the peak RSS
+   of any pipeline process.
+5. Quality checks: near-duplicate recall/precision against the planted duplicates, and US spellings left after
+   cleaning.
+
+Results are written as JSON (default `benchmarks/results/<timestamp>.json`) and compared with
+`benchmarks/baseline.json`: a throughput or quality metric that drops, or a memory/latency metric that grows, by
+more than `--tolerance` is reported as a regression and the exit status is 1 (latencies under 1 ms are not gated).
+`--save-baseline` stores the run as the new baseline. Baselines are machine-specific; they are only compared when
+the corpus and worker settings match.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--docs 2000] [--workers 4] [--repeat 3] [--tolerance 0.2] [--save-baseline]
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / "aussie-nlp-tools"))
+
+from data_loader.data_loader_dispatcher import load_documents  # noqa: E402
+from data_loader.detect_filetype import discover_files  # noqa: E402
+from deduplication.deduplicate_minhash import deduplicate_documents  # noqa: E402
+from preprocessing.aussie_spelling_normaliser import AU_SPELLING_LEXICON  # noqa: E402
+from preprocessing.cleaning_dispatcher import run_cleaning  # noqa: E402
+from synthetic_corpus import generate_corpus  # noqa: E402
+from tokenisation.tokenising_dispatcher import run_tokenising  # noqa: E402
+from utils.batch_runner import run_batch  # noqa: E402
+from utils.logging import get_metrics  # noqa: E402
+
+BASELINE_PATH = BENCHMARKS_DIR / "baseline.json"
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+DEFAULT_TOLERANCE = 0.2
+# Quality metrics are fractions, compared with an absolute tolerance.
+QUALITY_TOLERANCE = 0.02
+HIGHER_IS_BETTER = ("_per_second", "_recall", "_precision")
+LOWER_IS_BETTER = ("_bytes", "_ms", "_remaining")
+# Latencies below this are within timer and histogram-bucket noise and are not gated.
+MIN_GATED_LATENCY_MS = 1.0
+
+_US_SPELLING = re.compile(r"\b(" + "|".join(sorted(AU_SPELLING_LEXICON, key=len, reverse=True)) + r")\b")
+
+
+def _phases(paths):
+    """(name, func) pairs; each func maps the previous phase's documents to this phase's documents."""
+    return (
+        ("load", lambda _: list(load_documents(paths, quarantine=False))),
+        ("clean", lambda documents: list(run_cleaning(documents, output_dir=None))),
+        ("deduplicate", lambda documents: list(deduplicate_documents(documents))),
+        ("tokenise", lambda documents: list(run_tokenising(documents, output_dir=None))),
+    )
+
+
+def run_stages(paths):
+    """Run each phase over the whole corpus in turn; return (metrics, outputs of each phase)."""
+    registry = get_metrics()
+    registry.reset()
+    metrics = {}
+    outputs = {}
+    documents = None
+    for name, func in _phases(paths):
+        start = time.perf_counter()
+        documents = func(documents)
+        elapsed = time.perf_counter() - start
+        outputs[name] = documents
+        metrics[f"phase.{name}.docs_per_second"] = len(documents) / elapsed if elapsed else 0.0
+    for name, summary in registry.report()["stages"].items():
+        if summary["docs_per_second"]:
+            metrics[f"stage.{name}.docs_per_second"] = summary["docs_per_second"]
+            metrics[f"stage.{name}.p99_ms"] = summary["latency_ms"]["p99"]
+    return metrics, outputs
+
+
+def run_memory(paths, outputs):
+    """Peak traced allocation of each phase, each run on the previous phase's stored output."""
+    metrics = {}
+    previous = None
+    for name, func in _phases(paths):
+        tracemalloc.start()
+        try:
+            func(previous)
+            metrics[f"phase.{name}.peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        previous = outputs[name]
+    return metrics
+
+
+def run_end_to_end(paths, corpus_bytes, workers, work_dir):
+    registry = get_metrics()
+    registry.reset()
+    start = time.perf_counter()
+    documents = 0
+    for result in run_batch(
+        paths=paths,
+        workers=workers,
+        preprocessed_dir=work_dir / "preprocessed",
+        processed_dir=work_dir / "processed",
+        failed_root=work_dir / "failed",
+    ):
+        documents += len(result.documents)
+    elapsed = time.perf_counter() - start
+    return {
+        "end_to_end.docs_per_second": documents / elapsed,
+        "end_to_end.mb_per_second": corpus_bytes / elapsed / 1e6,
+        "end_to_end.peak_rss_bytes": registry.report()["peak_rss_bytes"],
+    }
+
+
+def quality_metrics(outputs, planted):
+    """
+    Deduplication recall and precision against the planted `{duplicate: source}` pairs, and US spellings left.
+
+    Either document of a pair may be the one removed (whichever is processed second), so a pair counts as found when
+    one of them is removed, and a removal is correct when the document belongs to any planted pair.
+    """
+    cleaned = {document.doc_id for document in outputs["clean"]}
+    removed = cleaned - {document.doc_id for document in outputs["deduplicate"]}
+    pairs = [(duplicate, source) for duplicate, source in planted.items() if {duplicate, source} <= cleaned]
+    found = sum(1 for pair in pairs if removed.intersection(pair))
+    related = set(planted) | set(planted.values())
+    remaining = sum(len(_US_SPELLING.findall(document.text)) for document in outputs["clean"])
+    return {
+        "quality.dedup_recall": found / len(pairs) if pairs else 1.0,
+        "quality.dedup_precision": len(removed & related) / len(removed) if removed else 1.0,
+        "quality.us_spellings_remaining": remaining,
+    }
+
+
+def _direction(name):
+    if name.endswith(HIGHER_IS_BETTER):
+        return 1
+    if name.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare metric dicts; returns `(rows, regressions)` where each row is `(name, baseline, current, change, status)`.
+
+    `change` is relative for performance metrics and absolute for `quality.*` metrics.
+    """
+    rows, regressions = [], []
+    for name in sorted(set(current) & set(baseline)):
+        old, new = baseline[name], current[name]
+        direction = _direction(name)
+        if name.startswith("quality."):
+            change = new - old
+            limit = QUALITY_TOLERANCE
+        else:
+            change = (new - old) / old if old else 0.0
+            limit = tolerance
+        if name.endswith("_ms") and max(old, new) < MIN_GATED_LATENCY_MS:
+            direction = 0
+        status = "ok"
+        if direction and change * direction < -limit:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif direction and change * direction > limit:
+            status = "improved"
+        rows.append((name, old, new, change, status))
+    return rows, regressions
+
+
+def run_suite(docs, seed, workers, repeat, memory=True):
+    config = {"docs": docs, "seed": seed, "workers": workers}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        corpus = generate_corpus(tmp / "raw", docs=docs, seed=seed)
+        paths = discover_files(tmp / "raw")
+        metrics = {}
+        outputs = None
+        for _ in range(repeat):
+            run, outputs = run_stages(paths)
+            for name, value in run.items():
+                better = max if _direction(name) >= 0 else min
+                metrics[name] = better(metrics.get(name, value), value)
+        if memory:
+            metrics.update(run_memory(paths, outputs))
+        metrics.update(run_end_to_end(paths, corpus["bytes"], workers, tmp))
+        metrics.update(quality_metrics(outputs, corpus["duplicates"]))
+    return {
+        "config": config,
+        "corpus": {key: corpus[key] for key in ("documents", "files", "bytes")},
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "metrics": {name: round(value, 6) for name, value in metrics.items()},
+    }
+
+
+def _print_rows(rows):
+    print(f"{'metric':<52} {'baseline':>14} {'current':>14} {'change':>9}  status")
+    for name, old, new, change, status in rows:
+        change_text = f"{change:+.3f}" if name.startswith("quality.") else f"{change:+.1%}"
+        print(f"{name:<52} {old:>14,.2f} {new:>14,.2f} {change_text:>9}  {status}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--repeat", type=int, default=3, help="Per-stage runs; the best value of each is kept.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--output", type=Path, default=None, help="Results file (default: benchmarks/results/).")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline.")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.docs, args.seed, args.workers, args.repeat, memory=not args.no_memory)
+    output = args.output or RESULTS_DIR / f"{results['timestamp'].replace(':', '')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"wrote results to {output}")
+
+    status = 0
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline["config"] != results["config"]:
+            print(f"baseline settings {baseline['config']} differ from this run {results['config']}; not compared")
+        else:
+            rows, regressions = compare(results["metrics"], baseline["metrics"], args.tolerance)
+            _print_rows(rows)
+            if regressions:
+                print(f"{len(regressions)} regression(s) beyond tolerance: {', '.join(regressions)}")
+                status = 1
+    else:
+        for name, value in sorted(results["metrics"].items()):
+            print(f"{name:<52} {value:>14,.2f}")
+        if not args.save_baseline:
+            print(f"no baseline at {args.baseline}; run with --save-baseline to store one")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"saved baseline to {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Synthetic Australian corpus generator for the benchmarks.
+
+Writes a deterministic, scalable raw corpus in the layout of `data/raw/`:
+- HTML pages grouped by site, each wrapped in the site's navigation, cookie banner and footer boilerplate, with a
+  canonical URL so two-pass boilerplate removal can group them;
+- JSON Lines and CSV files holding many records each (a `text` field/column plus metadata);
+- "PDFs as text": multi-page reports as extracted text, with running page headers/footers and form feeds.
+
+Document text is built from templated English sentences with Australian slang. A share of the words with US/AU
+spelling variants (`--us-rate`) is written in US spelling, and a share of documents (`--dup-rate`) are near-duplicates
+of an earlier document with `--edit-rate` of their words replaced. The same seed always produces the same bytes.
+
+A manifest (".corpus.json", hidden so the pipeline does not load it) records the parameters, file and byte counts,
+and each planted near-duplicate's doc id mapped to the doc id it was copied from, in the loaders' doc id format
+(`<stem>` or `<stem>:<record>`).
+
+Usage:
+    python benchmarks/synthetic_corpus.py OUTPUT_DIR [--docs 2000] [--seed 7] [--dup-rate 0.1] [--us-rate 0.5]
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "aussie-nlp-tools"))
+
+from preprocessing.aussie_spelling_normaliser import AU_SPELLING_LEXICON  # noqa: E402
+
+MANIFEST_NAME = ".corpus.json"
+# Share of documents written in each format.
+FORMAT_MIX = (("html", 0.4), ("jsonl", 0.25), ("csv", 0.15), ("pdf_text", 0.2))
+RECORDS_PER_FILE = 100
+PAGES_PER_REPORT = 4
+SITES = ("abc.net.au", "smh.com.au", "theage.com.au", "news.com.au", "sbs.com.au", "brisbanetimes.com.au")
+STATES = ("NSW", "VIC", "QLD", "WA", "SA", "TAS", "ACT", "NT")
+PLACES = (
+    "servo", "footy oval", "beach", "pub", "bottle-o", "Bunnings", "MCG", "Gabba", "harbour", "outback station",
+    "caravan park", "surf club", "local council", "train station", "footpath",
+)
+PEOPLE = ("mate", "bloke", "sheila", "tradie", "ranger", "journo", "pollie", "neighbour", "ambo", "firie")
+THINGS = (
+    "ute", "esky", "barbie", "thongs", "sunnies", "snag", "brekkie", "cuppa", "swag", "stubby", "budgie smugglers",
+    "lamington", "pavlova", "meat pie", "flat white",
+)
+ADJECTIVES = ("ripper", "bonza", "crook", "stoked", "flat out", "heaps good", "dodgy", "fair dinkum", "chockers")
+TIMES = ("this arvo", "last arvo", "on the weekend", "at brekkie", "after the footy", "this morning", "tonight")
+TEMPLATES = (
+    "The {person} at the {place} said the {thing} was {adjective} {time}.",
+    "We took the {thing} down to the {place} {time} and it was {adjective}.",
+    "A {person} from {state} reckons the {place} is {adjective} and they want to {verb} the {topic}.",
+    "It is not every day that a {person} has to {verb} the {topic} near the {place}.",
+    "Locals in {state} said they would {verb} the {topic} before the {place} gets too {adjective}.",
+    "There was a {thing} on the {place} {time}, so the {person} had to {verb} it with the {topic}.",
+    "The {topic} at the {place} has been {adjective} for a while, according to the {person}.",
+)
+VERBS = ("organise", "recognise", "analyse", "realise", "check", "fix", "sort out", "move", "report")
+TOPICS = (
+    "colour", "behaviour", "centre", "harbour", "neighbours", "organisation", "theatre", "catalogue", "defence",
+    "flavour", "jewellery", "weather", "bushfire season", "council rates", "school holidays",
+)
+# Words with US/AU spelling variants, AU spelling -> US spelling.
+SPELLING_VARIANTS = {au: us for us, au in AU_SPELLING_LEXICON.items()}
+
+SITE_HEADER = (
+    "Skip to content", "Home", "Menu", "Search", "Subscribe", "This site uses cookies to improve your visit."
+)
+REPORT_TITLE = "Community Report {year}"
+
+
+def _spelling(word, rng, us_rate):
+    return SPELLING_VARIANTS[word] if word in SPELLING_VARIANTS and rng.random() < us_rate else word
+
+
+def make_sentence(rng, us_rate):
+    fields = {
+        "person": rng.choice(PEOPLE),
+        "place": rng.choice(PLACES),
+        "thing": rng.choice(THINGS),
+        "adjective": rng.choice(ADJECTIVES),
+        "time": rng.choice(TIMES),
+        "state": rng.choice(STATES),
+        "verb": _spelling(rng.choice(VERBS), rng, us_rate),
+        "topic": _spelling(rng.choice(TOPICS), rng, us_rate),
+    }
+    return rng.choice(TEMPLATES).format(**fields)
+
+
+def make_paragraphs(rng, us_rate, paragraphs=(3, 8), sentences=(2, 6)):
+    return [
+        " ".join(make_sentence(rng, us_rate) for _ in range(rng.randint(*sentences)))
+        for _ in range(rng.randint(*paragraphs))
+    ]
+
+
+def near_duplicate(paragraphs, rng, edit_rate, us_rate):
+    """Copy `paragraphs`, replacing `edit_rate` of the words with words from a fresh sentence."""
+    filler = make_sentence(rng, us_rate).split()
+    edited = []
+    for paragraph in paragraphs:
+        words = paragraph.split(" ")
+        for position in rng.sample(range(len(words)), int(len(words) * edit_rate)):
+            words[position] = rng.choice(filler)
+        edited.append(" ".join(words))
+    return edited
+
+
+def format_plan(docs, rng):
+    """Assign a format to each of `docs` documents in the `FORMAT_MIX` proportions, in shuffled order."""
+    plan = []
+    for name, share in FORMAT_MIX:
+        plan.extend([name] * round(docs * share))
+    plan = (plan + [FORMAT_MIX[0][0]] * docs)[:docs]
+    rng.shuffle(plan)
+    return plan
+
+
+def render_html(site, title, paragraphs, url):
+    body = "\n".join(f"<p>{paragraph}</p>" for paragraph in paragraphs)
+    nav = "\n".join(f"<li>{item}</li>" for item in SITE_HEADER)
+    return (
+        f"<!DOCTYPE html>\n<html lang=\"en-AU\">\n<head>\n<meta charset=\"utf-8\">\n<title>{title}</title>\n"
+        f"<link rel=\"canonical\" href=\"{url}\">\n<script>window.analytics = {{site: \"{site}\"}};</script>\n"
+        f"<style>body {{ font-family: sans-serif; }}</style>\n</head>\n<body>\n<nav><ul>\n{nav}\n</ul></nav>\n"
+        f"<div class=\"banner\">Breaking news and local stories from {site}</div>\n"
+        f"<article>\n<h1>{title}</h1>\n{body}\n</article>\n"
+        f"<footer>\n<p>Privacy Policy | Terms of Use | Contact Us</p>\n"
+        f"<p>We acknowledge the Traditional Owners of the land on which we work.</p>\n"
+        f"<p>Copyright 2025 {site}. All rights reserved.</p>\n</footer>\n</body>\n</html>\n"
+    )
+
+
+def render_report(paragraphs, year):
+    title = REPORT_TITLE.format(year=year)
+    per_page = max(1, -(-len(paragraphs) // PAGES_PER_REPORT))
+    pages = []
+    for number, start in enumerate(range(0, len(paragraphs), per_page), 1):
+        lines = [title, *paragraphs[start:start + per_page], f"Page {number}"]
+        pages.append("\n\n".join(lines))
+    return "\f".join(pages) + "\n"
+
+
+def generate_corpus(output_dir, docs=2000, seed=7, dup_rate=0.1, edit_rate=0.01, us_rate=0.5):
+    """
+    Write a synthetic raw corpus of `docs` documents to `output_dir` and return its manifest.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    plan = format_plan(docs, rng)
+
+    texts = []
+    doc_ids = []
+    duplicates = {}
+    pending = {"jsonl": [], "csv": []}
+    counters = {"html": 0, "jsonl": 0, "csv": 0, "pdf_text": 0}
+    files = {name: 0 for name in counters}
+
+    def flush(kind):
+        records = pending[kind]
+        if not records:
+            return
+        stem = f"{kind}_{files[kind]:05d}"
+        if kind == "jsonl":
+            content = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        else:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=list(records[0]), lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(records)
+            content = buffer.getvalue()
+        (output_dir / f"{stem}.{'jsonl' if kind == 'jsonl' else 'csv'}").write_text(content, encoding="utf-8")
+        files[kind] += 1
+        pending[kind] = []
+
+    for position, kind in enumerate(plan):
+        source = None
+        if texts and rng.random() < dup_rate:
+            source = rng.randrange(len(texts))
+            paragraphs = near_duplicate(texts[source], rng, edit_rate, us_rate)
+        else:
+            paragraphs = make_paragraphs(rng, us_rate)
+        texts.append(paragraphs)
+
+        if kind == "html":
+            site = SITES[counters["html"] % len(SITES)]
+            stem = f"{site.split('.')[0]}_{counters['html']:06d}"
+            url = f"https://www.{site}/news/{stem}"
+            title = make_sentence(rng, us_rate).rstrip(".")
+            markup = render_html(site, title, paragraphs, url)
+            (output_dir / f"{stem}.html").write_text(markup, encoding="utf-8")
+            files["html"] += 1
+            doc_id = stem
+        elif kind == "pdf_text":
+            stem = f"report_{counters['pdf_text']:06d}"
+            (output_dir / f"{stem}.txt").write_text(render_report(paragraphs, 2000 + position % 25), encoding="utf-8")
+            files["pdf_text"] += 1
+            doc_id = stem
+        else:
+            record = {
+                "id": position,
+                "state": rng.choice(STATES),
+                "author": rng.choice(PEOPLE),
+                "text": "\n".join(paragraphs),
+            }
+            doc_id = f"{kind}_{files[kind]:05d}:{len(pending[kind])}"
+            pending[kind].append(record)
+            if len(pending[kind]) >= RECORDS_PER_FILE:
+                flush(kind)
+        counters[kind] += 1
+        doc_ids.append(doc_id)
+        if source is not None:
+            duplicates[doc_id] = doc_ids[source]
+    for kind in pending:
+        flush(kind)
+
+    paths = sorted(path for path in output_dir.iterdir() if not path.name.startswith("."))
+    manifest = {
+        "seed": seed,
+        "documents": docs,
+        "dup_rate": dup_rate,
+        "edit_rate": edit_rate,
+        "us_rate": us_rate,
+        "files": files,
+        "bytes": sum(path.stat().st_size for path in paths),
+        "duplicates": duplicates,
+    }
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def load_manifest(corpus_dir):
+    return json.loads((Path(corpus_dir) / MANIFEST_NAME).read_text(encoding="utf-8"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--dup-rate", type=float, default=0.1)
+    parser.add_argument("--edit-rate", type=float, default=0.01)
+    parser.add_argument("--us-rate", type=float, default=0.5)
+    args = parser.parse_args(argv)
+    manifest = generate_corpus(args.output_dir, args.docs, args.seed, args.dup_rate, args.edit_rate, args.us_rate)
+    print(
+        f"wrote {manifest['documents']} documents ({manifest['bytes'] / 1e6:.1f} MB) in "
+        f"{sum(manifest['files'].values())} files to {args.output_dir}; "
+        f"{len(manifest['duplicates'])} planted near-duplicates"
+    )
+
+
+if __name__ == "__main__":
+    main()
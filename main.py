@@ -2,4 +2,101 @@
 # Dropping Ruffus for now and going back to dispatchers.
 # If decide to revisit Ruffus in the future, we can use this code as a reference - see main_ruffus.py for working (buggy) demo
 # Look at matplotlib for better visualisations eg file flow through pipeline with folders as nodes etc - ruffus visuals suck
-# Handle batch processing here
\ No newline at end of file
+# Batch processing is handled by utils/batch_runner.py: files in data/raw/ are sharded across a process pool.
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "aussie-nlp-tools"))
+
+from constants import CACHE_DIR, PROCESSED_DIR, RAW_DIR  # noqa: E402
+from data_loader.detect_filetype import discover_files  # noqa: E402
+from utils.batch_runner import (  # noqa: E402
+    BOILERPLATE_SKETCH_NAME,
+    DEFAULT_SHARD_SIZE,
+    MANIFEST_NAME,
+    RUN_REPORT_NAME,
+    build_boilerplate_sketch,
+    run_batch,
+    write_manifest,
+)
+from utils.logging import configure_logging, get_metrics, write_run_report  # noqa: E402
+from utils.progress_bar import ProgressBar, format_stage_rates  # noqa: E402
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Aussie NLP Toolkit pipeline over data/raw/.")
+    parser.add_argument("--raw-dir", type=Path, default=RAW_DIR, help="Directory of raw input files.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="Files per work shard.")
+    parser.add_argument("--max-pending", type=int, default=None, help="Shards in flight (default: 2 x workers).")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="Stage output cache directory.")
+    parser.add_argument("--cache-max-mb", type=int, default=1024, help="Stage cache size limit in MB.")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every stage instead of using the cache.")
+    parser.add_argument(
+        "--boilerplate-sketch",
+        action="store_true",
+        help="Run a first pass counting lines per site, then strip lines repeated across a site's documents.",
+    )
+    parser.add_argument(
+        "--report", type=Path, default=PROCESSED_DIR / RUN_REPORT_NAME, help="Where to write the JSON run report."
+    )
+    parser.add_argument("--no-progress", action="store_true", help="Do not show the live progress line.")
+    parser.add_argument("--profile-stage", default=None, help="Profile one stage (e.g. clean_html_tags) with cProfile.")
+    parser.add_argument("--profile-memory", action="store_true", help="Also trace allocations of the profiled stage.")
+    parser.add_argument(
+        "--profile-dir", type=Path, default=PROCESSED_DIR / "profiles", help="Directory for stage profiles."
+    )
+    return parser.parse_args(argv)
+
+
+def track(results, total, stream=None):
+    """Yield `results`, updating a live progress line with document counts and the slowest stages."""
+    documents = 0
+    with ProgressBar(total=total, unit="shards", stream=stream) as progress:
+        for result in results:
+            documents += len(result.documents)
+            stages = format_stage_rates(get_metrics().report()["stages"])
+            progress.update(1, postfix=f"{documents} docs" + (f" · {stages}" if stages else ""))
+            yield result
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logger = configure_logging()
+    cache_dir = None if args.no_cache else args.cache_dir
+    cache_bytes = args.cache_max_mb * 1024 * 1024
+    sketch_path = None
+    if args.boilerplate_sketch:
+        sketch_path = PROCESSED_DIR / BOILERPLATE_SKETCH_NAME
+        build_boilerplate_sketch(
+            raw_dir=args.raw_dir,
+            workers=args.workers,
+            sketch_path=sketch_path,
+            cache_dir=cache_dir,
+            cache_bytes=cache_bytes,
+        )
+    paths = discover_files(args.raw_dir)
+    results = run_batch(
+        paths=paths,
+        workers=args.workers,
+        shard_size=args.shard_size,
+        max_pending=args.max_pending,
+        cache_dir=cache_dir,
+        cache_bytes=cache_bytes,
+        sketch_path=sketch_path,
+        profile_stage=args.profile_stage,
+        profile_dir=args.profile_dir,
+        profile_memory=args.profile_memory,
+    )
+    if not args.no_progress:
+        results = track(results, -(-len(paths) // args.shard_size))
+    documents, failures = write_manifest(results, PROCESSED_DIR / MANIFEST_NAME)
+    logger.info("Processed %d documents; %d files failed", documents, failures)
+    write_run_report(args.report, files=len(paths), documents=documents, failures=failures)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
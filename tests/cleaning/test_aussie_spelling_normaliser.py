@@ -1 +1,16 @@
-"""Tests for aussie_spelling_normaliser.py."""
\ No newline at end of file
+"""Tests for aussie_spelling_normaliser.py."""
+
+from preprocessing.aussie_spelling_normaliser import normalise_spelling
+
+
+def test_converts_us_spellings():
+    assert normalise_spelling("The color of the theater") == "The colour of the theatre"
+
+
+def test_preserves_case():
+    assert normalise_spelling("Color COLOR color") == "Colour COLOUR colour"
+
+
+def test_leaves_australian_and_ambiguous_words():
+    text = "The Labor program at the organisation"
+    assert normalise_spelling(text) == text
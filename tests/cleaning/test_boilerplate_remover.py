@@ -1 +1,73 @@
-"""Tests for boilerplate_remover.py."""
\ No newline at end of file
+"""Tests for boilerplate_remover.py."""
+
+import numpy as np
+
+from document import Document
+from preprocessing.boilerplate_remover import (
+    LineFrequencySketch,
+    compile_boilerplate_patterns,
+    document_domain,
+    remove_boilerplate,
+    remove_frequent_lines,
+)
+
+
+def test_removes_common_footer_lines():
+    text = "Skip to content\nThe real article.\nCopyright 2025 Aussie NLP\nPrivacy Policy | Terms of Use"
+    assert remove_boilerplate(text) == "The real article."
+
+
+def test_keeps_content_mentioning_copyright():
+    text = "The copyright law changed in 2024."
+    assert remove_boilerplate(text) == text
+
+
+def test_custom_patterns():
+    pattern = compile_boilerplate_patterns([r"^advertisement$"])
+    assert remove_boilerplate("Advertisement\nNews", pattern) == "News"
+
+
+STORIES = ["Bushfire season starts early.", "Rates held steady.", "Cricket final tonight.", "Floods hit Lismore."]
+
+
+def _site_documents(count, domain="abc.net.au"):
+    return [
+        Document(
+            f"d{i}",
+            f"{STORIES[i % 4]} Story {i}.\nABC News  |  Updated {i} May 2025\nSubscribe to our newsletter",
+            metadata={"url": f"https://www.{domain}/news/{i}"},
+        )
+        for i in range(count)
+    ]
+
+
+def _sketch(documents, **kwargs):
+    sketch = LineFrequencySketch(width=1 << 12, **kwargs)
+    for document in documents:
+        sketch.add_document(document.text, document_domain(document))
+    return sketch
+
+
+def test_document_domain_ignores_non_string_urls():
+    assert document_domain(Document("a", "", source="https://www.abc.net.au/news", metadata={"url": 123})) == "abc.net.au"
+    assert document_domain(Document("b", "", source="feed.jsonl", metadata={"url": ["x"]})) == ""
+
+
+def test_frequent_lines_removed_per_site():
+    documents = _site_documents(10)
+    other = Document("x", "Subscribe to our newsletter\nOther site text.", metadata={"url": "https://news.com.au/a"})
+    sketch = _sketch(documents + [other])
+    assert remove_frequent_lines(documents[3], sketch) == "Floods hit Lismore. Story 3."
+    # The same line is rare on the other site, so it stays there.
+    assert remove_frequent_lines(other, sketch) == other.text
+
+
+def test_merged_shard_sketches_persist(tmp_path):
+    documents = _site_documents(12)
+    merged = _sketch(documents[:5]).merge(_sketch(documents[5:]))
+    merged.save(tmp_path / "sketch.npz")
+    loaded = LineFrequencySketch.load(tmp_path / "sketch.npz")
+    assert np.array_equal(loaded.sketch.table, merged.sketch.table)
+    assert loaded.domain_documents == {"abc.net.au": 12}
+    # Lines in 3 of 12 documents stay below the default minimum of 5 documents; shared lines go.
+    assert remove_frequent_lines(documents[0], loaded) == "Bushfire season starts early. Story 0."
@@ -1 +1,47 @@
-"""Tests for clean_html_tags.py."""
\ No newline at end of file
+"""Tests for clean_html_tags.py."""
+
+import pytest
+
+from preprocessing import clean_html_tags as clean_html_tags_module
+from preprocessing.clean_html_tags import clean_html_tags
+
+
+def test_strips_tags_and_keeps_text():
+    html = "<html><body><h1>G'day</h1><p>Welcome to <b>Sydney</b>.</p></body></html>"
+    assert clean_html_tags(html) == "G'day\nWelcome to Sydney."
+
+
+def test_drops_script_style_and_nav():
+    html = "<nav>Home | About</nav><script>var x = 1;</script><style>p {}</style><p>Content</p>"
+    assert clean_html_tags(html) == "Content"
+
+
+def test_handles_malformed_html():
+    assert clean_html_tags("<div><p>Unclosed paragraph<div>Another") == "Unclosed paragraph\nAnother"
+
+
+def test_engines_agree_on_misnested_markup():
+    html = "<div><nav>Menu</div>Body</nav> after<b><ul>List</b>Tail"
+    expected = "Body after\nList\nTail"
+    assert clean_html_tags(html, "stream") == clean_html_tags(html, "soup") == expected
+
+
+def test_auto_falls_back_to_soup_for_unclosed_script():
+    html = "<p>Kept</p><script>var x = 1;"
+    assert clean_html_tags(html, "stream") == "Kept"
+    assert clean_html_tags(html) == clean_html_tags(html, "soup")
+
+
+def test_auto_falls_back_when_streaming_fails(monkeypatch):
+    def fail(html):
+        raise RuntimeError("parser error")
+
+    monkeypatch.setattr(clean_html_tags_module, "stream_text", fail)
+    assert clean_html_tags("<p>Fair dinkum</p>") == "Fair dinkum"
+    with pytest.raises(RuntimeError):
+        clean_html_tags("<p>Fair dinkum</p>", "stream")
+
+
+def test_rejects_unknown_engine():
+    with pytest.raises(ValueError):
+        clean_html_tags("<p>x</p>", "dom")
@@ -0,0 +1,83 @@
+"""Tests for cleaning_dispatcher.py."""
+
+import pytest
+
+from constants import FILETYPE_HTML, FILETYPE_TEXT
+from document import Document
+from preprocessing.cleaning_dispatcher import (
+    CLEANING_STAGES,
+    Stage,
+    build_line_sketch,
+    run_cleaning,
+    with_line_sketch,
+)
+from utils.stage_cache import StageCache
+
+
+def test_cleans_html_document_in_memory():
+    doc = Document("page", "<p>The color is great.</p><footer>Copyright 2025 Foo</footer>", filetype=FILETYPE_HTML)
+    [cleaned] = run_cleaning([doc], output_dir=None)
+    assert cleaned.text == "The colour is great."
+
+
+def test_html_stage_skipped_for_text_documents():
+    doc = Document("note", "Use a <b> tag for the color.", filetype=FILETYPE_TEXT)
+    [cleaned] = run_cleaning([doc], output_dir=None)
+    assert cleaned.text == "Use a <b> tag for the colour."
+
+
+def test_writes_only_final_output_by_default(tmp_path):
+    checkpoint_dir = tmp_path / "cleaning"
+    output_dir = tmp_path / "preprocessed"
+    list(run_cleaning([Document("a", "Hello")], checkpoint_dir=checkpoint_dir, output_dir=output_dir))
+    assert not checkpoint_dir.exists()
+    assert (output_dir / "a_preprocessed.txt").read_text() == "Hello"
+
+
+def test_writes_configured_checkpoints(tmp_path):
+    list(run_cleaning([Document("a", "Hello")], checkpoints=["normalise_unicode"], checkpoint_dir=tmp_path, output_dir=None))
+    assert [p.name for p in tmp_path.iterdir()] == ["a_normalise_unicode.txt"]
+
+
+def test_unknown_checkpoint_rejected():
+    with pytest.raises(ValueError):
+        list(run_cleaning([], checkpoints=["nope"]))
+
+
+def test_drops_empty_and_failing_documents():
+    def explode(text):
+        if text == "boom":
+            raise RuntimeError("bad input")
+        return text
+
+    stages = CLEANING_STAGES + (Stage("explode", explode, None),)
+    docs = [Document("a", "Copyright 2025 Foo"), Document("b", "boom"), Document("c", "kept")]
+    assert [d.doc_id for d in run_cleaning(docs, stages=stages, output_dir=None)] == ["c"]
+
+
+def test_cache_skips_unchanged_stages(tmp_path):
+    calls = []
+
+    def counting(text):
+        calls.append(text)
+        return text
+
+    stages = (Stage("first", counting), Stage("second", str.upper))
+    cache = StageCache(tmp_path)
+    list(run_cleaning([Document("a", "hello")], stages=stages, output_dir=None, cache=cache))
+    changed = (Stage("first", counting), Stage("second", str.lower, version="2"))
+    [doc] = run_cleaning([Document("a", "hello")], stages=changed, output_dir=None, cache=cache)
+    assert doc.text == "hello"
+    assert calls == ["hello"]
+
+
+def test_line_sketch_stage_runs_after_boilerplate_remover():
+    docs = [
+        Document(f"p{i}", f"<p>Story {letter} about the color.</p><p>Proudly Aussie owned</p>", filetype=FILETYPE_HTML)
+        for i, letter in enumerate("abcdef")
+    ]
+    sketch = build_line_sketch(docs)
+    cleaned = list(run_cleaning(docs, output_dir=None, line_sketch=sketch))
+    assert [doc.text for doc in cleaned][:2] == ["Story a about the colour.", "Story b about the colour."]
+    names = [stage.name for stage in with_line_sketch(CLEANING_STAGES, sketch)]
+    assert names.index("boilerplate_frequency") == names.index("boilerplate_remover") + 1
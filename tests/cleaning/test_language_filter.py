@@ -1 +1,102 @@
-"""Tests for language_filter.py."""
\ No newline at end of file
+"""Tests for language_filter.py."""
+
+import numpy as np
+
+from preprocessing.language_filter import (
+    CONFIDENT,
+    KEPT,
+    REJECTED,
+    LanguageIdentifier,
+    LanguageProfiles,
+    filter_language,
+    is_english,
+)
+from preprocessing.language_samples import LANGUAGE_SAMPLES
+
+
+def test_keeps_english_lines():
+    assert is_english("The weather in Melbourne is changeable at this time of year.")
+
+
+def test_drops_other_languages():
+    text = "\n".join(
+        [
+            "We went to the beach on Saturday and it was a great day.",
+            "Nous sommes allés à la plage samedi et c'était une belle journée.",
+            "我们星期六去了海滩，那是美好的一天。",
+        ]
+    )
+    assert filter_language(text) == "We went to the beach on Saturday and it was a great day."
+
+
+def test_keeps_short_blocks():
+    assert is_english("Bonjour")
+
+
+ENGLISH = "The weather in Melbourne is changeable at this time of year."
+FRENCH = "Nous sommes allés à la plage samedi et c'était une belle journée."
+
+
+def test_sample_languages_are_told_apart():
+    profiles = LanguageProfiles.from_samples(LANGUAGE_SAMPLES)
+    sentences = {language: text.split(". ")[1] for language, text in LANGUAGE_SAMPLES.items()}
+    margins = profiles.margins(list(sentences.values()))
+    for language, margin in zip(sentences, margins):
+        assert (margin > 0) == (language == "en"), language
+
+
+def test_batched_verdicts_match_single_blocks_and_are_cached():
+    identifier = LanguageIdentifier()
+    blocks = [ENGLISH, FRENCH, "Bonjour", ENGLISH]
+    single = [LanguageIdentifier().verdicts([block])[0] for block in blocks]
+    assert identifier.verdicts(blocks) == single == [CONFIDENT, REJECTED, KEPT, CONFIDENT]
+    assert identifier.verdicts([FRENCH]) == [REJECTED]
+    assert identifier.stats["cache_hits"] == 1
+    assert identifier.stats["scored"] == 2
+
+
+def test_only_ambiguous_blocks_reach_the_fallback():
+    calls = []
+
+    def fallback(block):
+        calls.append(block)
+        return False
+
+    identifier = LanguageIdentifier(fallback=fallback)
+    identifier.verdicts([ENGLISH, FRENCH])
+    assert calls == []
+    # With indistinguishable profiles every judged block is ambiguous.
+    same = LanguageProfiles.from_samples({"en": LANGUAGE_SAMPLES["en"], "xx": LANGUAGE_SAMPLES["en"]})
+    identifier = LanguageIdentifier(profiles=same, fallback=fallback)
+    assert identifier.verdicts([ENGLISH, "Short one"]) == [REJECTED, KEPT]
+    assert calls == [ENGLISH]
+
+
+def test_ambiguous_names_and_addresses_are_kept():
+    identifier = LanguageIdentifier(fallback=lambda block: False)
+    address = "Parliament House Canberra ACT 2600 Australia Phone (02) 6277 7111"
+    contact = "Level 3, 45 Collins Street Melbourne VIC 3000 Australia Ph 03 9600 1234"
+    assert identifier.verdicts([address, contact]) == [KEPT, KEPT]
+    assert identifier.stats["names"] == 2 and identifier.stats["fallback"] == 0
+    # Lower-case ambiguous prose still goes to the fallback.
+    same = LanguageProfiles.from_samples({"en": LANGUAGE_SAMPLES["en"], "xx": LANGUAGE_SAMPLES["en"]})
+    assert LanguageIdentifier(profiles=same, fallback=lambda block: False).verdicts([ENGLISH]) == [REJECTED]
+
+
+def test_confidently_english_documents_are_short_circuited():
+    text = "\n".join([ENGLISH] * 40 + [FRENCH])
+    identifier = LanguageIdentifier()
+    assert identifier.filter(text) == text
+    assert identifier.stats["short_circuits"] == 1
+    assert LanguageIdentifier(prefix_chars=0).filter(text) == "\n".join([ENGLISH] * 40)
+    mixed = "\n".join([FRENCH] + [ENGLISH] * 40)
+    assert LanguageIdentifier().filter(mixed) == "\n".join([ENGLISH] * 40)
+
+
+def test_profiles_round_trip(tmp_path):
+    profiles = LanguageProfiles.from_samples({"en": ENGLISH, "fr": FRENCH}, buckets=1 << 8)
+    path = tmp_path / "profiles.npz"
+    profiles.save(path)
+    loaded = LanguageProfiles.load(path)
+    assert loaded.languages == ("en", "fr")
+    np.testing.assert_array_equal(loaded.log_probs, profiles.log_probs)
@@ -1 +1,15 @@
-"""Tests for normalise_unicode.py."""
\ No newline at end of file
+"""Tests for normalise_unicode.py."""
+
+from preprocessing.normalise_unicode import normalise_unicode
+
+
+def test_normalises_compatibility_characters():
+    assert normalise_unicode("ﬁne ＡＢＣ") == "fine ABC"
+
+
+def test_normalises_whitespace_and_line_endings():
+    assert normalise_unicode("a b\r\nc​d") == "a b\ncd"
+
+
+def test_ascii_fold_strips_accents():
+    assert normalise_unicode("café über", ascii_fold=True) == "cafe uber"
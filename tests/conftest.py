@@ -0,0 +1,8 @@
+"""Shared pytest configuration: puts the `aussie-nlp-tools` source directory on the import path."""
+
+import sys
+from pathlib import Path
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent / "aussie-nlp-tools"
+if str(SOURCE_DIR) not in sys.path:
+    sys.path.insert(0, str(SOURCE_DIR))
@@ -1 +1,32 @@
-"""Tests for data_loader_csv.py."""
\ No newline at end of file
+"""Tests for data_loader_csv.py."""
+
+from constants import FILETYPE_CSV
+from data_loader import data_loader_csv
+from data_loader.data_loader_csv import load_csv
+from data_loader.detect_filetype import SniffResult
+
+
+def test_sniffs_delimiter_and_uses_text_column(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text("id;text\n1;first\n2;second\n")
+    docs = list(load_csv(path))
+    assert [(d.doc_id, d.text, d.metadata) for d in docs] == [
+        ("rows:0", "first", {"id": "1"}),
+        ("rows:1", "second", {"id": "2"}),
+    ]
+
+
+def test_chunked_reads_keep_row_ids_and_encoding(tmp_path):
+    path = tmp_path / "big.csv"
+    rows = "".join(f"{i}\tcafé {i}\n" for i in range(25))
+    path.write_bytes(("id\ttext\n" + rows).encode("cp1252"))
+    docs = list(load_csv(path, chunk_size=4))
+    assert len(docs) == 25
+    assert (docs[24].doc_id, docs[24].text, docs[24].metadata) == ("big:24", "café 24", {"id": "24"})
+
+
+def test_unsupported_sniffed_delimiter_falls_back_to_comma(tmp_path, monkeypatch):
+    path = tmp_path / "rows.csv"
+    path.write_text("id,text\n1,first\n")
+    monkeypatch.setattr(data_loader_csv, "sniff_file", lambda _: SniffResult(FILETYPE_CSV, "utf-8", "json"))
+    assert [(d.text, d.metadata) for d in load_csv(path)] == [("first", {"id": "1"})]
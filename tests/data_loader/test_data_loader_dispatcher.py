@@ -0,0 +1,49 @@
+"""Tests for data_loader_dispatcher.py."""
+
+import json
+
+from constants import FILETYPE_CSV, FILETYPE_HTML, FILETYPE_JSON, FILETYPE_TEXT
+from data_loader.data_loader_dispatcher import load_documents
+
+
+def test_routes_each_filetype(tmp_path):
+    (tmp_path / "a.txt").write_text("plain")
+    (tmp_path / "b.html").write_text("<title>T</title><p>page</p>")
+    (tmp_path / "c.jsonl").write_text(json.dumps({"text": "one"}) + "\n" + json.dumps({"text": "two"}) + "\n")
+    (tmp_path / "d.csv").write_text("id,text\n1,row\n")
+    paths = sorted(tmp_path.iterdir())
+    docs = list(load_documents(paths, quarantine=False))
+    assert [(d.doc_id, d.filetype) for d in docs] == [
+        ("a", FILETYPE_TEXT),
+        ("b", FILETYPE_HTML),
+        ("c:0", FILETYPE_JSON),
+        ("c:1", FILETYPE_JSON),
+        ("d:0", FILETYPE_CSV),
+    ]
+
+
+def test_root_qualifies_document_ids(tmp_path):
+    (tmp_path / "news").mkdir()
+    (tmp_path / "news" / "items.jsonl").write_text(json.dumps({"text": "one"}) + "\n")
+    (tmp_path / "items.txt").write_text("plain")
+    paths = [tmp_path / "news" / "items.jsonl", tmp_path / "items.txt"]
+    docs = list(load_documents(paths, quarantine=False, root=tmp_path))
+    assert [d.doc_id for d in docs] == ["news/items.jsonl:0", "items.txt"]
+    assert docs[0].filename_stem.startswith("news_items.jsonl_0-") and docs[1].filename_stem == "items.txt"
+
+
+def test_quarantines_unsupported_and_corrupt(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    (raw / "a.docx").write_bytes(b"PK")
+    (raw / "b.json").write_text("{not json")
+    docs = list(load_documents(sorted(raw.iterdir()), failed_root=tmp_path / "failed"))
+    assert docs == []
+    assert (tmp_path / "failed" / "unsupported" / "a.docx").exists()
+    assert (tmp_path / "failed" / "corrupt" / "b.json").exists()
+
+
+def test_optional_loaded_checkpoint(tmp_path):
+    (tmp_path / "a.txt").write_text("plain")
+    list(load_documents([tmp_path / "a.txt"], checkpoint_dir=tmp_path / "loaded"))
+    assert (tmp_path / "loaded" / "a_loaded.txt").read_text() == "plain"
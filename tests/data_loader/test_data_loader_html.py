@@ -1 +1,27 @@
-"""Tests for data_loader_html.py."""
\ No newline at end of file
+"""Tests for data_loader_html.py."""
+
+from constants import FILETYPE_HTML
+from data_loader.data_loader_html import load_html
+
+
+def test_loads_markup_and_title(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text("<html><head><title>ABC &amp; Co</title></head><body>Hi</body></html>")
+    [doc] = load_html(path)
+    assert doc.filetype == FILETYPE_HTML
+    assert doc.metadata == {"title": "ABC & Co"}
+    assert "<body>Hi</body>" in doc.text
+
+
+def test_records_canonical_url(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text('<head><link href="https://www.abc.net.au/news/1?a=1&amp;b=2" rel="canonical"></head>')
+    [doc] = load_html(path)
+    assert doc.metadata == {"url": "https://www.abc.net.au/news/1?a=1&b=2"}
+
+
+def test_ignores_title_in_body(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text("<html><head></head><body><svg><title>Icon</title></svg><p>Hi</p></body></html>")
+    [doc] = load_html(path)
+    assert doc.metadata == {}
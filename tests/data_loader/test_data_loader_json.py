@@ -1 +1,56 @@
-"""Tests for data_loader_json.py."""
\ No newline at end of file
+"""Tests for data_loader_json.py."""
+
+import io
+import json
+
+import pytest
+
+from data_loader.data_loader_json import iter_json_values, load_json
+from utils.error_handling import CorruptFileError
+
+
+def test_array_records_with_metadata(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps([{"text": "a", "url": "https://x.gov.au"}, {"title": "no text"}]))
+    docs = list(load_json(path))
+    assert docs[0].text == "a" and docs[0].metadata == {"url": "https://x.gov.au"}
+    assert docs[1].text == '{"title": "no text"}'
+
+
+def test_invalid_json_raises(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text("{oops")
+    with pytest.raises(CorruptFileError):
+        list(load_json(path))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_streams_arrays_across_chunk_boundaries(tmp_path, chunk_size):
+    records = [{"text": f"record {i}", "n": i * 1000} for i in range(50)]
+    path = tmp_path / "big.json"
+    path.write_text(json.dumps(records, indent=1))
+    docs = list(load_json(path, chunk_size=chunk_size))
+    assert [d.text for d in docs] == [r["text"] for r in records]
+    assert docs[-1].doc_id == "big:49" and docs[-1].metadata == {"n": 49000}
+    assert list(iter_json_values(io.StringIO("[1.5]"), chunk_size)) == [1.5]
+    assert list(iter_json_values(io.StringIO("[1e-3, -2.5E+2]"), chunk_size)) == [0.001, -250.0]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 6])
+def test_numbers_split_at_every_offset(chunk_size):
+    assert list(iter_json_values(io.StringIO("[0, 1.25]"), chunk_size)) == [0, 1.25]
+
+
+def test_jsonl_content_with_json_extension(tmp_path):
+    path = tmp_path / "lines.json"
+    path.write_text('{"text": "a"}\n{"text": "b"}\n')
+    assert [d.text for d in load_json(path)] == ["a", "b"]
+
+
+def test_records_before_an_error_are_yielded(tmp_path):
+    path = tmp_path / "half.jsonl"
+    path.write_text('{"text": "ok"}\n{broken\n')
+    stream = load_json(path)
+    assert next(stream).text == "ok"
+    with pytest.raises(CorruptFileError, match="line 2"):
+        next(stream)
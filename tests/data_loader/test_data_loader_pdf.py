@@ -1 +1,80 @@
-"""Tests for data_loader_pdf.py."""
\ No newline at end of file
+"""Tests for data_loader_pdf.py."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from data_loader import data_loader_pdf
+from data_loader.data_loader_pdf import PagePool, extract_pages, load_pdf
+from utils.error_handling import CorruptFileError
+
+
+def count_five(path):
+    return 5
+
+
+def extract_stub(path, index):
+    if "slow" in path and index in (1, 3):
+        time.sleep(30)
+    if "broken" in path and index == 2:
+        raise ValueError("bad content stream")
+    return f"page {index}"
+
+
+@pytest.fixture
+def pool():
+    pool = PagePool(2)
+    yield pool
+    pool.close()
+
+
+def test_pages_are_yielded_in_order(pool):
+    pages = list(extract_pages("fine.pdf", extract=extract_stub, count=count_five, pool=pool, workers=2))
+    assert pages == [(index, f"page {index}") for index in range(5)]
+
+
+def test_timed_out_pages_are_skipped_and_the_pool_recovers(pool):
+    pages = list(
+        extract_pages("slow.pdf", page_timeout=0.5, workers=2, extract=extract_stub, count=count_five, pool=pool)
+    )
+    assert pages == [(0, "page 0"), (1, None), (2, "page 2"), (3, None), (4, "page 4")]
+
+
+def test_too_many_timeouts_mark_the_file_corrupt(pool):
+    with pytest.raises(CorruptFileError):
+        list(
+            extract_pages(
+                "slow.pdf", page_timeout=0.5, workers=2, max_page_timeouts=1, extract=extract_stub,
+                count=count_five, pool=pool,
+            )
+        )
+
+
+def test_failing_pages_are_skipped(pool):
+    pages = dict(extract_pages("broken.pdf", workers=2, extract=extract_stub, count=count_five, pool=pool))
+    assert pages[2] is None
+    assert pages[3] == "page 3"
+
+
+def test_load_pdf_joins_pages_in_process(monkeypatch, tmp_path):
+    pages = [SimpleNamespace(extract_text=lambda text=text: text) for text in ("One", "", "Three")]
+    monkeypatch.setattr(data_loader_pdf, "_reader", lambda path: SimpleNamespace(pages=pages))
+    path = tmp_path / "report.pdf"
+    [doc] = load_pdf(path, workers=0)
+    assert doc.text == "One\n\n\n\nThree"
+    assert doc.metadata == {"pages": 3}
+    assert [doc.doc_id for doc in load_pdf(path, per_page=True, workers=0)] == ["report:0", "report:1", "report:2"]
+
+
+def test_load_pdf_splits_large_text_into_parts(monkeypatch, tmp_path):
+    pages = [SimpleNamespace(extract_text=lambda index=index: f"page {index} " * 10) for index in range(5)]
+    monkeypatch.setattr(data_loader_pdf, "_reader", lambda path: SimpleNamespace(pages=pages))
+    docs = list(load_pdf(tmp_path / "big.pdf", workers=0, max_document_bytes=150))
+    assert [doc.doc_id for doc in docs] == ["big:0", "big:1", "big:2"]
+    assert [doc.metadata for doc in docs] == [
+        {"part": 0, "first_page": 1, "pages": 2},
+        {"part": 1, "first_page": 3, "pages": 2},
+        {"part": 2, "first_page": 5, "pages": 1},
+    ]
+    assert docs[1].text.startswith("page 2 ")
@@ -1 +1,35 @@
-"""Tests for data_loader_txt.py."""
\ No newline at end of file
+"""Tests for data_loader_txt.py."""
+
+from data_loader.data_loader_txt import load_txt
+
+
+def test_loads_utf8(tmp_path):
+    path = tmp_path / "note.txt"
+    path.write_text("G'day, café", encoding="utf-8")
+    [doc] = load_txt(path)
+    assert (doc.doc_id, doc.text, doc.source) == ("note", "G'day, café", str(path))
+
+
+def test_falls_back_to_latin1(tmp_path):
+    path = tmp_path / "legacy.txt"
+    path.write_bytes("café".encode("latin-1"))
+    [doc] = load_txt(path)
+    assert doc.text == "café"
+
+
+def test_splits_large_files_at_paragraphs(tmp_path):
+    path = tmp_path / "archive.txt"
+    text = "First paragraph, café.\n\nSecond paragraph.\nStill second.\n\nThird paragraph here."
+    path.write_text(text, encoding="utf-8")
+    docs = list(load_txt(path, max_document_bytes=40))
+    assert [doc.doc_id for doc in docs] == ["archive:0", "archive:1", "archive:2"]
+    assert docs[0].text == "First paragraph, café.\n\n"
+    assert "".join(doc.text for doc in docs) == text
+    assert docs[1].metadata == {"part": 1, "offset": len("First paragraph, café.\n\n".encode("utf-8"))}
+
+
+def test_loads_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    [doc] = load_txt(path)
+    assert doc.text == ""
@@ -1 +1,90 @@
-"""Tests for detect_type.py."""
\ No newline at end of file
+"""Tests for detect_type.py."""
+
+import json
+import os
+
+import pytest
+
+from constants import (
+    FILETYPE_CORRUPT,
+    FILETYPE_CSV,
+    FILETYPE_HTML,
+    FILETYPE_JSON,
+    FILETYPE_PDF,
+    FILETYPE_TEXT,
+    FILETYPE_UNSUPPORTED,
+)
+from data_loader import detect_filetype as module
+from data_loader.detect_filetype import DetectionCache, classify_directory, classify_files, detect_filetype, sniff_file
+
+
+@pytest.mark.parametrize(
+    "name, content, expected",
+    [
+        ("a.html", b"<!DOCTYPE html><html><body>Hi</body></html>", FILETYPE_HTML),
+        ("a.json", b'{"text": "g\'day"}', FILETYPE_JSON),
+        ("a.csv", b"id,text\n1,hello\n2,world\n", FILETYPE_CSV),
+        ("a.pdf", b"%PDF-1.7\n...", FILETYPE_PDF),
+        ("a.txt", "Plain text, café".encode("cp1252"), FILETYPE_TEXT),
+        ("a.html", b'{"text": "json in disguise"}', FILETYPE_CORRUPT),
+        ("a.json", b"not json at all", FILETYPE_CORRUPT),
+        ("a.pdf", b"<html></html>", FILETYPE_CORRUPT),
+        ("a.txt", b"PK\x03\x04binary", FILETYPE_CORRUPT),
+        ("a.docx", b"PK\x03\x04binary", FILETYPE_UNSUPPORTED),
+        ("page.dat", b"<html><body>x</body></html>", FILETYPE_HTML),
+        ("notes.dat", b"just some words", FILETYPE_UNSUPPORTED),
+    ],
+)
+def test_detects_by_extension_and_content(tmp_path, name, content, expected):
+    path = tmp_path / name
+    path.write_bytes(content)
+    assert detect_filetype(path) == expected
+
+
+def test_reports_encoding_and_details(tmp_path):
+    (tmp_path / "rows.csv").write_text("a;b\n1;2\n3;4\n")
+    (tmp_path / "recs.json").write_text("\n".join(json.dumps({"text": str(i)}) for i in range(3)))
+    (tmp_path / "bom.txt").write_bytes("hello".encode("utf-16"))
+    assert sniff_file(tmp_path / "rows.csv").detail == ";"
+    assert sniff_file(tmp_path / "recs.json").detail == "jsonl"
+    assert sniff_file(tmp_path / "bom.txt").encoding == "utf-16"
+
+
+def test_csv_that_looks_like_json_has_no_delimiter(tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text("\n".join(f'{{"x": {i}}},b' for i in range(2000)))
+    assert sniff_file(path) == (FILETYPE_CSV, "utf-8", None)
+
+
+def test_only_reads_prefix_of_large_files(tmp_path):
+    path = tmp_path / "big.jsonl"
+    path.write_text("\n".join(json.dumps({"text": "x" * 50}) for _ in range(10_000)))
+    assert sniff_file(path) == (FILETYPE_JSON, "utf-8", "jsonl")
+
+
+def test_classify_directory_uses_cache(tmp_path, monkeypatch):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    (raw / "a.txt").write_text("hello")
+    (raw / "b.html").write_text("<p>hi</p>")
+    cache = DetectionCache(tmp_path / "cache.json")
+    first = classify_directory(raw, cache=cache)
+    cache.save()
+
+    sniffed = []
+    monkeypatch.setattr(module, "sniff_file", lambda path: sniffed.append(path) or module.SniffResult(0, None, None))
+    reloaded = DetectionCache(tmp_path / "cache.json")
+    assert classify_directory(raw, cache=reloaded) == first
+    assert sniffed == []
+
+    os.utime(raw / "a.txt", ns=(0, 0))
+    classify_directory(raw, cache=reloaded)
+    assert sniffed == [raw / "a.txt"]
+
+
+def test_classify_files_marks_missing_files_corrupt(tmp_path):
+    present = tmp_path / "a.txt"
+    present.write_text("hello")
+    results = classify_files([present, tmp_path / "gone.txt"])
+    assert results[present].filetype == FILETYPE_TEXT
+    assert results[tmp_path / "gone.txt"].filetype == FILETYPE_CORRUPT
@@ -1 +1,102 @@
-"""Tests for deduplicate_minhash.py."""
\ No newline at end of file
+"""Tests for deduplicate_minhash.py."""
+
+import numpy as np
+import pytest
+
+from deduplication.deduplicate_minhash import (
+    MinHashLSH,
+    band_keys,
+    deduplicate_documents,
+    minhash_signatures,
+    optimal_bands_rows,
+    shingle_hashes,
+)
+from document import Document
+
+BASE = (
+    "The Bureau of Meteorology has issued a severe weather warning for damaging winds and heavy rainfall "
+    "across south east Queensland and northern New South Wales, with flash flooding likely in coastal areas "
+    "from Friday afternoon through to Sunday morning, and residents are urged to prepare their homes."
+)
+
+
+def _docs(texts):
+    return [Document(f"d{i}", text) for i, text in enumerate(texts)]
+
+
+def test_signatures_are_deterministic_and_batched():
+    texts = [BASE, "short", ""]
+    batch = minhash_signatures(texts, num_perm=64)
+    assert batch.shape == (3, 64) and batch.dtype == np.uint32
+    for i, text in enumerate(texts):
+        assert np.array_equal(batch[i], minhash_signatures([text], num_perm=64)[0])
+
+
+def test_similarity_tracks_jaccard():
+    near = BASE.replace("Friday afternoon", "Saturday afternoon")
+    sig = minhash_signatures([BASE, near, "An entirely different article about cricket at the MCG."])
+    assert (sig[0] == sig[1]).mean() > 0.6
+    assert (sig[0] == sig[2]).mean() < 0.1
+
+
+def test_shingles_of_short_text():
+    assert len(shingle_hashes("two words")) == 1
+
+
+def test_optimal_bands_rows_respects_num_perm():
+    bands, rows = optimal_bands_rows(0.8, 128)
+    assert bands * rows <= 128 and rows > 1
+
+
+def test_rejects_oversized_bands():
+    with pytest.raises(ValueError):
+        MinHashLSH(num_perm=16, bands=8, rows=4)
+
+
+def test_removes_exact_and_near_duplicates_in_stream():
+    near = BASE.replace("residents are urged", "locals are urged")
+    docs = _docs([BASE, near, BASE, "Completely unrelated text about the footy grand final in Melbourne."])
+    kept = [d.doc_id for d in deduplicate_documents(docs, MinHashLSH(threshold=0.7), batch_size=2)]
+    assert kept == ["d0", "d3"]
+
+
+def test_saved_index_is_memory_mapped_and_incremental(tmp_path):
+    index = MinHashLSH(threshold=0.7)
+    list(deduplicate_documents(_docs([BASE, "Another article about the Ashes series at the Gabba."]), index))
+    index.save(tmp_path)
+
+    reloaded = MinHashLSH.load(tmp_path)
+    assert isinstance(reloaded._signatures, np.memmap)
+    assert reloaded.doc_ids == ["d0", "d1"]
+    later = [Document("new0", BASE), Document("new1", "Fresh story on Darwin's wet season.")]
+    assert [d.doc_id for d in deduplicate_documents(later, reloaded)] == ["new1"]
+
+    reloaded.save(tmp_path)
+    assert len(MinHashLSH.load(tmp_path)) == 3
+
+
+def test_repeated_saves_append_and_merge_segments(tmp_path):
+    rng = np.random.default_rng(3)
+    texts = [" ".join(f"w{word}" for word in rng.integers(0, 5000, 30)) for _ in range(40)]
+    single = MinHashLSH(threshold=0.7)
+    index = MinHashLSH(threshold=0.7)
+    for start in range(0, 40, 5):
+        batch = [Document(f"d{i}", text) for i, text in enumerate(texts[start:start + 5], start)]
+        list(deduplicate_documents(batch, index))
+        list(deduplicate_documents(batch, single))
+        size = (tmp_path / "signatures.u32").stat().st_size if start else 0
+        index.save(tmp_path)
+        assert (tmp_path / "signatures.u32").stat().st_size == size + 5 * index.num_perm * 4
+        index = MinHashLSH.load(tmp_path)
+    assert len(index) == 40 and index.doc_ids == single.doc_ids
+    assert len(index._segments) <= 3
+    assert sorted(tmp_path.glob("buckets-*")) == sorted(
+        tmp_path / f"{name}.{kind}.npy" for name, _, _ in index._segments for kind in ("keys", "rows")
+    )
+    keys = band_keys(index.signatures(texts[:10]), index.bands, index.rows)
+    assert index.persisted_candidates(keys) == single.candidates(keys)
+
+    index.save(tmp_path / "copy")
+    copy = MinHashLSH.load(tmp_path / "copy")
+    assert len(copy._segments) == 1
+    assert copy.persisted_candidates(keys) == single.candidates(keys)
@@ -1 +1,69 @@
-"""Tests for filters_domains.py."""
\ No newline at end of file
+"""Tests for filters_domains.py."""
+
+import pytest
+
+from document import Document
+from filters.filters_domains import DEFAULT_RULE, DomainFilter, filter_domains, url_hosts
+
+URLS = [
+    "https://www.health.gov.au/news",
+    "http://education.nsw.gov.au/a",
+    "nsw.gov.au",
+    "https://user@Spam.Edu.Au:8080/p",
+    "https://www.abc.net.au./news",
+    "https://example.com/",
+    None,
+]
+
+
+def make_filter(**kwargs):
+    return DomainFilter(allow=["gov.au", "edu.au", "abc.net.au"], deny=["*.nsw.gov.au", "spam.edu.au"], **kwargs)
+
+
+def test_extracts_hosts_from_urls():
+    hosts = url_hosts(URLS)
+    assert hosts[:6].tolist() == [
+        "www.health.gov.au", "education.nsw.gov.au", "nsw.gov.au", "spam.edu.au", "www.abc.net.au", "example.com"
+    ]
+    assert hosts.isna()[6]
+
+
+def test_most_specific_rule_decides():
+    domain_filter = make_filter()
+    assert domain_filter.mask_urls(URLS).tolist() == [True, False, True, False, True, False, False]
+    assert domain_filter.hit_counts() == {
+        "allow gov.au": 2,
+        "allow edu.au": 0,
+        "allow abc.net.au": 1,
+        "deny *.nsw.gov.au": 1,
+        "deny spam.edu.au": 1,
+        DEFAULT_RULE: 2,
+    }
+
+
+def test_rejects_conflicting_and_invalid_patterns():
+    with pytest.raises(ValueError):
+        DomainFilter(allow=["gov.au"], deny=["GOV.AU."])
+    with pytest.raises(ValueError):
+        DomainFilter(deny=["gov.*.au"])
+
+
+def test_merge_and_replayed_host_counts_match_a_full_run():
+    first, second = make_filter(keep_host_counts=True), make_filter(keep_host_counts=True)
+    first.mask_urls(URLS[:3])
+    second.mask_urls(URLS[3:])
+    merged = first.merge(second)
+    single = make_filter()
+    single.mask_urls(URLS)
+    assert merged.hit_counts() == single.hit_counts()
+    full = DomainFilter(allow=["au"])
+    full.mask_urls(URLS)
+    replayed = DomainFilter(allow=["au"])
+    replayed.replay_host_counts(merged.host_counts)
+    assert replayed.hit_counts() == full.hit_counts() == {"allow au": 5, DEFAULT_RULE: 2}
+
+
+def test_filters_documents_in_batches():
+    documents = [Document(doc_id=str(i), text="", metadata={"url": url}) for i, url in enumerate(URLS)]
+    kept = list(filter_domains(documents, make_filter(), batch_size=3))
+    assert [document.doc_id for document in kept] == ["0", "2", "4"]
@@ -1 +1,98 @@
-"""Tests for filters_metadata.py."""
\ No newline at end of file
+"""Tests for filters_metadata.py."""
+
+import pandas as pd
+import pytest
+
+from document import Document
+from filters.filters_metadata import DateRange, Matches, MetadataFilter, ValueIn, filter_metadata
+
+FRAME = pd.DataFrame(
+    {
+        "published": ["2021-05-01", "2019-01-01T10:00:00+10:00", "not a date", None, "2023-12-31T18:30:00"],
+        "author": ["Jane", "spam bot", "JANE", None, "Bob"],
+        "source": ["a.jsonl", "b.csv", "a.jsonl", "c.txt", "a.jsonl"],
+    }
+)
+
+
+def test_date_range_is_inclusive_and_drops_missing_dates():
+    rule = DateRange("published", "2020-01-01", "2023-12-31")
+    assert rule.evaluate(FRAME).tolist() == [True, False, False, False, True]
+    assert DateRange("published", end="2019-01-01", keep_missing=True).evaluate(FRAME).tolist() == [
+        False, True, True, True, False
+    ]
+
+
+def test_date_range_accepts_datetime_columns_and_other_formats():
+    frame = pd.DataFrame({"published": pd.to_datetime(["2021-05-01", None, "2024-01-01"])})
+    assert DateRange("published", "2020-01-01", "2023-12-31").evaluate(frame).tolist() == [True, False, False]
+    frame = pd.DataFrame({"published": ["01/05/2021", "31/12/2023", "1 Jan 2024"]})
+    rule = DateRange("published", end="2023-12-31", date_format="%d/%m/%Y")
+    assert rule.evaluate(frame).tolist() == [True, True, False]
+
+
+def test_value_in_ignores_case_and_can_exclude():
+    assert ValueIn("author", ["jane"]).evaluate(FRAME).tolist() == [True, False, True, False, False]
+    block_list = ValueIn("author", ["Spam Bot"], exclude=True, keep_missing=True)
+    assert block_list.evaluate(FRAME).tolist() == [True, False, True, True, True]
+
+
+def test_matches_and_missing_fields():
+    assert Matches("source", r"\.jsonl$").evaluate(FRAME).tolist() == [True, False, True, False, True]
+    assert Matches("licence", "cc-by").evaluate(FRAME).tolist() == [False] * 5
+
+
+def test_counts_rejections_per_rule():
+    metadata_filter = MetadataFilter(
+        [
+            DateRange("published", "2020-01-01", "2023-12-31", name="recent"),
+            ValueIn("author", ["spam bot"], exclude=True, keep_missing=True, name="not spam"),
+            Matches("source", r"\.jsonl$", name="jsonl"),
+        ]
+    )
+    assert metadata_filter.mask(FRAME).tolist() == [True, False, False, False, True]
+    other = MetadataFilter(metadata_filter.rules)
+    other.mask(FRAME)
+    assert metadata_filter.merge(other).hit_counts() == {
+        "records": 10,
+        "kept": 4,
+        "rules": {
+            "recent": {"rejected": 6, "only_rule": 2},
+            "not spam": {"rejected": 2, "only_rule": 0},
+            "jsonl": {"rejected": 4, "only_rule": 0},
+        },
+    }
+
+
+def test_rejects_duplicate_rule_names():
+    with pytest.raises(ValueError):
+        MetadataFilter([ValueIn("author", ["a"]), ValueIn("author", ["a"])])
+
+
+def test_filters_documents_by_metadata_and_attributes():
+    documents = [
+        Document(doc_id="a:0", text="", source="a.jsonl", metadata={"author": "Jane"}),
+        Document(doc_id="a:1", text="", source="a.jsonl", metadata={"author": "spam bot"}),
+        Document(doc_id="b", text="", source="b.txt", metadata={"author": "Jane"}),
+    ]
+    metadata_filter = MetadataFilter([ValueIn("author", ["spam bot"], exclude=True), Matches("source", "jsonl")])
+    kept = list(filter_metadata(documents, metadata_filter, batch_size=2))
+    assert [document.doc_id for document in kept] == ["a:0"]
+
+
+def test_container_metadata_values_do_not_break_batches():
+    documents = [
+        Document(doc_id="a", text="", metadata={"author": ["Jane", "Bob"], "licence": {"name": "CC-BY"}}),
+        Document(doc_id="b", text="", metadata={"author": "spam bot", "licence": "CC-BY"}),
+        Document(doc_id="c", text="", metadata={"author": "Jane", "licence": ["proprietary"]}),
+    ]
+    metadata_filter = MetadataFilter([ValueIn("author", ["spam bot"], exclude=True), Matches("licence", "cc-by")])
+    assert [document.doc_id for document in filter_metadata(documents, metadata_filter)] == ["a"]
+    frame = pd.DataFrame({"author": [["Jane"], "spam bot", None], "licence": ["cc-by"] * 3})
+    assert metadata_filter.mask(frame).tolist() == [True, False, False]
+
+
+def test_integer_metadata_with_missing_values_keeps_its_type():
+    documents = [Document(doc_id="a", text="", metadata={"year": 2024}), Document(doc_id="b", text="", metadata={})]
+    metadata_filter = MetadataFilter([ValueIn("year", [2024], keep_missing=True)])
+    assert [document.doc_id for document in filter_metadata(documents, metadata_filter)] == ["a", "b"]
@@ -0,0 +1,71 @@
+"""Tests for shard_writer.py."""
+
+import bz2
+import gzip
+import json
+import lzma
+
+import numpy as np
+import pytest
+
+from output.shard_writer import ShardedWriter, read_records
+
+OPENERS = {None: open, "gzip": gzip.open, "bz2": bz2.open, "lzma": lzma.open}
+
+
+class LineWriter(ShardedWriter):
+    def serialise(self, record):
+        return f"{record}\n"
+
+    def header(self):
+        return "# header\n"
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "bz2", "lzma"])
+def test_shards_roll_over_and_decompress_as_one_stream(tmp_path, compression):
+    records = [f"record {i:04d}" for i in range(500)]
+    with LineWriter(tmp_path, compression=compression, max_shard_bytes=2000, block_records=64) as writer:
+        writer.write_all(records)
+
+    manifest = json.loads(writer.manifest_path.read_text())
+    assert manifest["records"] == 500 and manifest["compression"] == compression
+    assert len(manifest["shards"]) > 1
+    read_back = []
+    for shard in manifest["shards"]:
+        assert shard["bytes"] <= 2000
+        with OPENERS[compression](tmp_path / shard["path"], "rt") as handle:
+            lines = handle.read().splitlines()
+        assert lines[0] == "# header"
+        read_back.extend(lines[1:])
+        assert len(np.load(tmp_path / shard["index"])) == shard["records"]
+    assert read_back == records
+
+
+def test_writer_without_serialise_cannot_be_created(tmp_path):
+    class Incomplete(ShardedWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(tmp_path)
+    assert not list(tmp_path.iterdir())
+
+
+def test_read_records_seeks_through_index(tmp_path):
+    with LineWriter(tmp_path, compression="gzip", block_records=10) as writer:
+        writer.write_all(range(100))
+    shard = tmp_path / writer.shards[0]["path"]
+    assert read_records(shard, [99, 0, 42, 43], "gzip") == ["99\n", "0\n", "42\n", "43\n"]
+
+
+def test_writer_thread_errors_are_raised(tmp_path):
+    class Failing(LineWriter):
+        def serialise(self, record):
+            raise ValueError("bad record")
+
+    writer = Failing(tmp_path, block_records=1)
+    with pytest.raises(ValueError, match="bad record"):
+        for i in range(10):
+            writer.write(i)
+        writer.close()
+    with pytest.raises(ValueError):
+        LineWriter(tmp_path, compression="zip")
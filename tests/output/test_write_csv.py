@@ -1 +1,26 @@
-"""Tests for write_csv.py."""
\ No newline at end of file
+"""Tests for write_csv.py."""
+
+import csv
+import json
+
+from document import Document
+from output.write_csv import read_csv_records, write_csv
+
+
+def test_every_shard_has_header_and_rows_round_trip(tmp_path):
+    docs = [Document(f"d{i}", f"line one {i}\nline two", metadata={"i": i}, tokens=[["line"]]) for i in range(40)]
+    manifest = json.loads(write_csv(docs, tmp_path, max_shard_bytes=1000, block_records=7).read_text())
+    assert len(manifest["shards"]) > 1
+
+    rows = []
+    for shard in manifest["shards"]:
+        with open(tmp_path / shard["path"], newline="", encoding="utf-8") as handle:
+            shard_rows = list(csv.DictReader(handle))
+        assert len(shard_rows) == shard["records"]
+        rows.extend(shard_rows)
+    assert [row["doc_id"] for row in rows] == [doc.doc_id for doc in docs]
+    assert rows[5]["text"] == "line one 5\nline two"
+    assert json.loads(rows[5]["metadata"]) == {"i": 5} and json.loads(rows[5]["tokens"]) == [["line"]]
+
+    first = tmp_path / manifest["shards"][0]["path"]
+    assert read_csv_records(first, [1])[0]["text"] == "line one 1\nline two"
@@ -1 +1,30 @@
-"""Tests for write_json.py."""
\ No newline at end of file
+"""Tests for write_json.py."""
+
+import gzip
+import json
+
+from document import Document
+from output.write_json import read_jsonl_records, write_jsonl
+
+
+def test_documents_round_trip_through_sharded_jsonl(tmp_path):
+    docs = [Document(f"d{i}", f"G'day mate number {i}", metadata={"i": i}) for i in range(50)]
+    manifest_path = write_jsonl(docs, tmp_path, prefix="corpus", compression="gzip", max_shard_bytes=1500)
+
+    manifest = json.loads(manifest_path.read_text())
+    assert manifest["format"] == "jsonl" and len(manifest["shards"]) > 1
+    records = []
+    for shard in manifest["shards"]:
+        with gzip.open(tmp_path / shard["path"], "rt", encoding="utf-8") as handle:
+            records.extend(json.loads(line) for line in handle)
+    assert [record["doc_id"] for record in records] == [doc.doc_id for doc in docs]
+    assert records[3]["metadata"] == {"i": 3}
+
+    first = tmp_path / manifest["shards"][0]["path"]
+    assert read_jsonl_records(first, [2], "gzip") == [records[2]]
+
+
+def test_fields_restrict_output(tmp_path):
+    write_jsonl([Document("a", "arvo", source="x.txt"), {"doc_id": "b", "text": "servo"}], tmp_path, fields=["text"])
+    lines = (tmp_path / "part-00000.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [{"text": "arvo"}, {"text": "servo"}]
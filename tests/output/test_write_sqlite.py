@@ -1 +1,67 @@
-"""Tests for write_sqlite.py."""
\ No newline at end of file
+"""Tests for write_sqlite.py."""
+
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from constants import FILETYPE_CSV
+from document import Document
+from output.write_sqlite import SQLiteWriter, write_documents
+
+
+def _rows(db_path):
+    connection = sqlite3.connect(db_path)
+    try:
+        return connection.execute("SELECT doc_id, metadata, tokens FROM documents ORDER BY doc_id").fetchall()
+    finally:
+        connection.close()
+
+
+def test_bulk_load_upserts_and_builds_indexes(tmp_path):
+    db_path = tmp_path / "corpus.db"
+    docs = [Document(f"d{i}", f"text {i}", metadata={"i": i}, tokens=[["text", str(i)]]) for i in range(7)]
+    assert write_documents(docs, db_path, batch_size=3) == 7
+    write_documents([Document("d0", "replaced")], db_path)
+
+    rows = _rows(db_path)
+    assert len(rows) == 7
+    assert json.loads(rows[1][1]) == {"i": 1} and json.loads(rows[1][2]) == [["text", "1"]]
+    connection = sqlite3.connect(db_path)
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    indexes = {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_documents_source", "idx_documents_filetype"} <= indexes
+    assert connection.execute("SELECT text FROM documents WHERE doc_id = 'd0'").fetchone() == ("replaced",)
+    connection.close()
+
+
+def test_filetype_is_stored_as_integer(tmp_path):
+    db_path = tmp_path / "corpus.db"
+    write_documents([Document("a", "x", filetype=FILETYPE_CSV)], db_path)
+    connection = sqlite3.connect(db_path)
+    query = "SELECT typeof(filetype) FROM documents WHERE filetype = ?"
+    assert connection.execute(query, (FILETYPE_CSV,)).fetchone() == ("integer",)
+    connection.close()
+
+
+def test_writer_thread_accepts_concurrent_producers(tmp_path):
+    db_path = tmp_path / "corpus.db"
+    with SQLiteWriter(db_path, batch_size=10, queue_size=5) as writer:
+        producers = [
+            threading.Thread(target=lambda p=p: [writer.put(Document(f"p{p}-{i}", "x")) for i in range(25)])
+            for p in range(4)
+        ]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+    assert writer.written == 100
+    assert len(_rows(db_path)) == 100
+
+
+def test_writer_errors_are_raised_on_close(tmp_path):
+    writer = SQLiteWriter(tmp_path / "corpus.db").start()
+    writer.queue.put(("only", "two"))  # wrong row shape
+    with pytest.raises(sqlite3.ProgrammingError):
+        writer.close()
@@ -1 +1,16 @@
-"""Tests for aussie_slang_tokeniser.py."""
\ No newline at end of file
+"""Tests for aussie_slang_tokeniser.py."""
+
+from tokenisation.aussie_slang_tokeniser import build_phrase_index, detect_slang, tokenise
+
+
+def test_keeps_multiword_slang_together():
+    assert tokenise("No worries, she'll be right.") == ["No worries", ",", "she'll be right", "."]
+
+
+def test_prefers_longest_match():
+    index = build_phrase_index({"fair go", "fair go mate"})
+    assert tokenise("a fair go mate", index) == ["a", "fair go mate"]
+
+
+def test_detect_slang():
+    assert detect_slang("G'day! Grab some brekkie at Maccas this arvo.") == ["g'day", "brekkie", "maccas", "arvo"]
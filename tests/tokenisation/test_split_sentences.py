@@ -1 +1,16 @@
-"""Tests for split_sentences.py."""
\ No newline at end of file
+"""Tests for split_sentences.py."""
+
+from tokenisation.split_sentences import split_sentences
+
+
+def test_splits_on_terminal_punctuation():
+    assert split_sentences("It rained. Did it? Yes!") == ["It rained.", "Did it?", "Yes!"]
+
+
+def test_keeps_abbreviations_and_initials():
+    text = "Dr. Smith works at Acme Pty. Ltd. in Vic. with J. Citizen. She is busy."
+    assert split_sentences(text) == ["Dr. Smith works at Acme Pty. Ltd. in Vic. with J. Citizen.", "She is busy."]
+
+
+def test_splits_on_line_breaks():
+    assert split_sentences("Heading\n\nBody text") == ["Heading", "Body text"]
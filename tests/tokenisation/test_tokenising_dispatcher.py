@@ -0,0 +1,39 @@
+"""Tests for tokenising_dispatcher.py."""
+
+import json
+
+from document import Document
+from tokenisation.tokenising_dispatcher import run_tokenising
+from utils.stage_cache import StageCache
+
+
+def test_tokenises_sentences():
+    [doc] = run_tokenising([Document("a", "G'day mate. No worries.")], output_dir=None)
+    assert doc.tokens == [["G'day", "mate", "."], ["No worries", "."]]
+
+
+def test_writes_tokenised_json(tmp_path):
+    list(run_tokenising([Document("a:1", "Hi.")], output_dir=tmp_path))
+    written = json.loads((tmp_path / "a_1_tokenised.json").read_text())
+    assert written["doc_id"] == "a:1" and written["tokens"] == [["Hi", "."]]
+
+
+def test_failures_skip_document():
+    def bad_splitter(text):
+        raise ValueError(text)
+
+    assert list(run_tokenising([Document("a", "x")], sentence_splitter=bad_splitter, output_dir=None)) == []
+
+
+def test_cache_reuses_tokens(tmp_path):
+    cache = StageCache(tmp_path)
+    calls = []
+
+    def splitter(text):
+        calls.append(text)
+        return [text]
+
+    for _ in range(2):
+        [doc] = run_tokenising([Document("a", "No worries")], sentence_splitter=splitter, output_dir=None, cache=cache)
+    assert doc.tokens == [["No worries"]]
+    assert calls == ["No worries"]
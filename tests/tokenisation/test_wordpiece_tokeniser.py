@@ -1 +1,45 @@
-"""Tests for wordpiece_tokeniser.py."""
\ No newline at end of file
+"""Tests for wordpiece_tokeniser.py."""
+
+import pickle
+
+from tokenisation.wordpiece_tokeniser import UNK_TOKEN, WordPieceTokeniser, train_bpe
+
+VOCAB = [UNK_TOKEN, "arv", "arvo", "##o", "##s", "good", "##ie", "g", "day", "!", "'"]
+
+
+def test_longest_match_and_unknown_words():
+    tokeniser = WordPieceTokeniser(VOCAB)
+    assert tokeniser.tokenise("Arvos goodie xyz!") == ["arvo", "##s", "good", "##ie", UNK_TOKEN, "!"]
+    assert tokeniser.decode(tokeniser.encode("arvos goodie")) == "arvos goodie"
+
+
+def test_encode_batch_matches_encode():
+    tokeniser = WordPieceTokeniser(VOCAB)
+    texts = ["arvo arvos", "", "g'day goodie!"]
+    batch = tokeniser.encode_batch(texts)
+    assert batch.ids.dtype.name == "int32" and batch.ids.flags.c_contiguous
+    assert list(batch.offsets) == [0, 3, 3, 9]
+    for i, text in enumerate(texts):
+        assert batch.ids[batch.offsets[i]:batch.offsets[i + 1]].tolist() == tokeniser.encode(text)
+
+
+def test_cache_is_rebuilt_per_process():
+    tokeniser = WordPieceTokeniser(VOCAB, cache_size=8)
+    tokeniser.encode("arvo arvo")
+    assert tokeniser.encode_word.cache_info().hits == 1
+    copy = pickle.loads(pickle.dumps(tokeniser))
+    assert copy.encode_word.cache_info().currsize == 0
+    assert copy.encode("arvos") == tokeniser.encode("arvos")
+
+
+def test_train_bpe_learns_frequent_pairs(tmp_path):
+    texts = ["arvo arvo arvo servo servo", "arvo brekkie"]
+    vocab = train_bpe(texts, vocab_size=14)
+    assert vocab[0] == UNK_TOKEN and len(vocab) == 14
+    assert vocab[-4:] == ["##rv", "##rvo", "arvo", "##ervo"]
+    # Pairs seen only once ("brekkie") are never merged, so training stops early.
+    assert "servo" in train_bpe(texts, vocab_size=100) and len(train_bpe(texts, vocab_size=100)) == 15
+    tokeniser = WordPieceTokeniser(vocab)
+    assert tokeniser.tokenise("arvo") == ["arvo"]
+    tokeniser.save(tmp_path / "vocab.txt")
+    assert WordPieceTokeniser.load(tmp_path / "vocab.txt").vocab == vocab
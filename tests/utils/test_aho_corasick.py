@@ -0,0 +1,39 @@
+"""Tests for aho_corasick.py."""
+
+import re
+
+from utils.aho_corasick import AhoCorasickMatcher, load_or_compile
+
+
+def test_word_bounded_case_insensitive_leftmost_longest():
+    matcher = AhoCorasickMatcher({"fair go": "A", "fair go mate": "B", "go": "C", "mate": "D"})
+    text = "A FAIR  go\nmate, a fair go and gomate"
+    assert [(text[start:end], value) for start, end, value in matcher.find(text)] == [
+        ("FAIR  go\nmate", "B"),
+        ("fair go", "A"),
+    ]
+
+
+def test_overlapping_entries_via_failure_links():
+    matcher = AhoCorasickMatcher(["a b c d", "b c", "c"])
+    tokens, matches = matcher.scan("a b c e")
+    assert tokens == ["a", "b", "c", "e"]
+    assert matches == [(1, 3, "b c")]
+
+
+def test_folding_that_changes_tokenisation_keeps_spans_aligned():
+    matcher = AhoCorasickMatcher({"color": "colour"}, re.compile(r"[A-Za-z]+"))
+    assert matcher.find("\u212a color") == [(2, 7, "colour")]
+    assert matcher.find("\u0130 Color") == [(2, 7, "colour")]
+
+
+def test_compiled_file_roundtrip_and_recompile(tmp_path):
+    path = tmp_path / "lexicon.pkl"
+    first = load_or_compile({"color": "colour"}, path)
+    loaded = AhoCorasickMatcher.load(path)
+    assert loaded.digest == first.digest
+    assert loaded.find("Color") == [(0, 5, "colour")]
+    assert repr(loaded) == repr(first)
+
+    changed = load_or_compile({"color": "colour", "honor": "honour"}, path)
+    assert len(changed) == 2 and AhoCorasickMatcher.load(path).digest == changed.digest
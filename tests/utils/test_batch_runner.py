@@ -0,0 +1,165 @@
+"""Tests for batch_runner.py."""
+
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from utils import batch_runner
+from utils.batch_runner import discover_files, make_shards, run_batch, write_manifest
+from utils.error_handling import CorruptFileError
+
+
+def _write_raw(raw, count):
+    raw.mkdir()
+    for i in range(count):
+        (raw / f"doc{i:02d}.txt").write_text(f"Document number {i}. It was a fair dinkum arvo.")
+
+
+def _run(tmp_path, **kwargs):
+    return list(
+        run_batch(
+            raw_dir=tmp_path / "raw",
+            preprocessed_dir=tmp_path / "preprocessed",
+            processed_dir=tmp_path / "processed",
+            failed_root=tmp_path / "failed",
+            **kwargs,
+        )
+    )
+
+
+def test_discover_skips_hidden_files(tmp_path):
+    (tmp_path / ".gitkeep").write_text("")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_text("b")
+    (tmp_path / "a.txt").write_text("a")
+    assert [p.name for p in discover_files(tmp_path)] == ["a.txt", "b.txt"]
+
+
+def test_make_shards():
+    assert make_shards(list(range(5)), 2) == [[0, 1], [2, 3], [4]]
+    with pytest.raises(ValueError):
+        make_shards([1], 0)
+
+
+def test_page_workers_share_the_cores(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    assert [batch_runner.page_workers_per_worker(workers) for workers in (1, 4, 8, 16)] == [8, 2, 1, 1]
+
+
+def test_results_are_in_input_order(tmp_path):
+    _write_raw(tmp_path / "raw", 9)
+    results = _run(tmp_path, workers=2, shard_size=2, max_pending=2)
+    assert [r.index for r in results] == [0, 1, 2, 3, 4]
+    assert [doc_id for r in results for doc_id, _ in r.documents] == [f"doc{i:02d}.txt" for i in range(9)]
+    tokenised = json.loads((tmp_path / "processed" / "doc03.txt_tokenised.json").read_text())
+    assert tokenised["tokens"][1] == ["It", "was", "a", "fair dinkum", "arvo", "."]
+
+
+def test_same_stem_files_keep_separate_outputs(tmp_path):
+    raw = tmp_path / "raw"
+    for directory, text in (("a", "First index page."), ("b", "Second index page.")):
+        (raw / directory).mkdir(parents=True)
+        (raw / directory / "index.txt").write_text(text)
+    (raw / "a" / "index.html").write_text("<p>Third index page.</p>")
+    results = _run(tmp_path, workers=2, shard_size=1)
+    assert [doc_id for r in results for doc_id, _ in r.documents] == ["a/index.html", "a/index.txt", "b/index.txt"]
+    texts = sorted(path.read_text() for path in (tmp_path / "preprocessed").iterdir())
+    assert texts == ["First index page.", "Second index page.", "Third index page."]
+    assert len(list((tmp_path / "processed").iterdir())) == 3
+
+
+def test_worker_metrics_are_returned_per_shard(tmp_path):
+    _write_raw(tmp_path / "raw", 5)
+    results = _run(tmp_path, workers=2, shard_size=2)
+    assert [r.metrics.stages["tokenising"].documents for r in results] == [2, 2, 1]
+    assert all(r.metrics.stages["load_txt"].bytes > 0 for r in results)
+
+
+def test_failing_file_is_reported_without_losing_shard(tmp_path, monkeypatch):
+    _write_raw(tmp_path / "raw", 3)
+    real_run_tokenising = batch_runner.run_tokenising
+
+    def fail_on_doc01(documents, **kwargs):
+        for document in documents:
+            if document.doc_id == "doc01":
+                raise RuntimeError("tokeniser exploded")
+            yield from real_run_tokenising([document], **kwargs)
+
+    monkeypatch.setattr(batch_runner, "run_tokenising", fail_on_doc01)
+    result = batch_runner.process_shard(
+        0,
+        discover_files(tmp_path / "raw"),
+        preprocessed_dir=tmp_path / "preprocessed",
+        processed_dir=tmp_path / "processed",
+        failed_root=tmp_path / "failed",
+    )
+    assert [doc_id for doc_id, _ in result.documents] == ["doc00", "doc02"]
+    assert result.failures == [(str(tmp_path / "raw" / "doc01.txt"), "RuntimeError: tokeniser exploded")]
+    # Not a corrupt file: left in place for a rerun, with its partial output removed.
+    assert (tmp_path / "raw" / "doc01.txt").exists()
+    assert not (tmp_path / "failed").exists()
+    assert sorted(path.name for path in (tmp_path / "preprocessed").iterdir()) == [
+        "doc00_preprocessed.txt", "doc02_preprocessed.txt"
+    ]
+
+
+def test_corrupt_file_is_quarantined(tmp_path, monkeypatch):
+    _write_raw(tmp_path / "raw", 2)
+    real_run_cleaning = batch_runner.run_cleaning
+
+    def corrupt_doc01(documents, **kwargs):
+        for document in documents:
+            if document.doc_id == "doc01":
+                raise CorruptFileError("truncated")
+            yield from real_run_cleaning([document], **kwargs)
+
+    monkeypatch.setattr(batch_runner, "run_cleaning", corrupt_doc01)
+    result = batch_runner.process_shard(
+        0, discover_files(tmp_path / "raw"), preprocessed_dir=None, processed_dir=None, failed_root=tmp_path / "failed"
+    )
+    assert [doc_id for doc_id, _ in result.documents] == ["doc00"]
+    assert (tmp_path / "failed" / "corrupt" / "doc01.txt").exists()
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="relies on fork inheriting the patch")
+def test_crashed_worker_is_isolated(tmp_path, monkeypatch):
+    _write_raw(tmp_path / "raw", 4)
+    real_run_cleaning = batch_runner.run_cleaning
+
+    def crash_on_doc02(documents, **kwargs):
+        for document in documents:
+            if document.doc_id == "doc02.txt":
+                os._exit(1)
+            yield from real_run_cleaning([document], **kwargs)
+
+    monkeypatch.setattr(batch_runner, "run_cleaning", crash_on_doc02)
+    results = _run(tmp_path, workers=2, shard_size=2)
+    assert [doc_id for r in results for doc_id, _ in r.documents] == ["doc00.txt", "doc01.txt", "doc03.txt"]
+    assert (tmp_path / "failed" / "corrupt" / "doc02.txt").exists()
+
+
+def test_write_manifest(tmp_path):
+    results = [batch_runner.ShardResult(0, [("a", "a.txt")], [("b.pdf", "CorruptFileError: bad")])]
+    assert write_manifest(results, tmp_path / "manifest.jsonl") == (1, 1)
+    lines = [json.loads(line) for line in (tmp_path / "manifest.jsonl").read_text().splitlines()]
+    assert [line["status"] for line in lines] == ["ok", "failed"]
+
+
+def test_shared_stage_cache_is_populated(tmp_path):
+    _write_raw(tmp_path / "raw", 2)
+    _run(tmp_path, workers=2, shard_size=1, cache_dir=tmp_path / "cache")
+    assert any((tmp_path / "cache").rglob("*.json"))
+
+
+def test_two_pass_boilerplate_removal(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    for i, letter in enumerate("abcdef"):
+        record = {"text": f"Unique story {letter}.\nSubscribe to The Daily Yarn", "url": f"https://yarn.com.au/{i}"}
+        (raw / f"page{i}.json").write_text(json.dumps(record))
+    sketch = batch_runner.build_boilerplate_sketch(raw_dir=raw, workers=2, sketch_path=tmp_path / "sketch.npz")
+    assert sketch.domain_documents == {"yarn.com.au": 6}
+    _run(tmp_path, workers=2, shard_size=2, sketch_path=tmp_path / "sketch.npz")
+    assert (tmp_path / "preprocessed" / "page0.json_0_preprocessed.txt").read_text() == "Unique story a."
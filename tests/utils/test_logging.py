@@ -1 +1,67 @@
-"""Tests for logging.py."""
\ No newline at end of file
+"""Tests for logging.py."""
+
+import json
+import pickle
+import pstats
+import tracemalloc
+
+import pytest
+
+from utils.logging import MetricsRegistry, StageMetrics, enable_stage_profiling, get_metrics, write_run_report
+
+
+def test_stage_percentiles_and_merge():
+    fast, slow = StageMetrics(), StageMetrics()
+    for _ in range(90):
+        fast.record(0.001, nbytes=100)
+    for _ in range(10):
+        slow.record(0.1, nbytes=100)
+    fast.merge(pickle.loads(pickle.dumps(slow)))
+
+    assert fast.documents == 100 and fast.bytes == 10_000
+    assert fast.percentile(50) == pytest.approx(0.001, rel=0.2)
+    assert fast.percentile(99) == pytest.approx(0.1, rel=0.2)
+    summary = fast.summary()
+    assert summary["docs_per_second"] == pytest.approx(100 / 1.09, rel=0.01)
+    assert summary["latency_ms"]["max"] == pytest.approx(100)
+
+
+def test_timer_counts_errors_and_registries_merge(tmp_path):
+    worker = MetricsRegistry()
+    with worker.timer("clean", nbytes=5):
+        pass
+    with pytest.raises(ValueError):
+        with worker.timer("clean"):
+            raise ValueError("bad")
+    worker.gauge("pending_shards", 3)
+    assert list(worker.iterate("load", ["ab", "cde"], size=len)) == ["ab", "cde"]
+
+    parent = MetricsRegistry()
+    parent.gauge("pending_shards", 1)
+    parent.merge(pickle.loads(pickle.dumps(worker.drain())))
+    assert not worker.stages
+
+    report = write_run_report(tmp_path / "report.json", parent, documents=2)
+    assert json.loads((tmp_path / "report.json").read_text()) == report
+    assert report["documents"] == 2
+    assert report["stages"]["clean"]["calls"] == 2 and report["stages"]["clean"]["errors"] == 1
+    assert report["stages"]["load"]["bytes"] == 5
+    assert report["gauges"]["pending_shards"]["max"] == 3
+    assert report["peak_rss_bytes"] > 0
+
+
+def test_profiling_one_stage(tmp_path):
+    registry = enable_stage_profiling("profiled", tmp_path, memory=True)
+    try:
+        with registry.timer("profiled"):
+            sorted(range(10_000), key=lambda value: -value)
+        with registry.timer("other"):
+            pass
+        paths = registry.write_profile()
+    finally:
+        registry.profile_stage = None
+        tracemalloc.stop()
+    assert registry is get_metrics()
+    stats = pstats.Stats(str(paths[0]))
+    assert any(name == "<lambda>" for _, _, name in stats.stats)
+    assert "Peak traced memory" in paths[1].read_text()
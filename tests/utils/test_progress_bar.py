@@ -1 +1,38 @@
-"""Tests for progress_bar.py."""
\ No newline at end of file
+"""Tests for progress_bar.py."""
+
+import io
+
+from utils.progress_bar import ProgressBar, format_duration, format_stage_rates
+
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def test_render_and_throttle():
+    stream = _Terminal()
+    progress = ProgressBar(total=4, unit="shards", stream=stream, min_interval=60)
+    progress.update(1, postfix="10 docs")
+    progress.update(1)
+    assert stream.getvalue().count("\r") == 1
+    progress.close()
+    line = stream.getvalue().rsplit("\r", 1)[-1]
+    assert "2/4 shards" in line and "ETA" in line and line.rstrip().endswith("| 10 docs")
+
+
+def test_non_interactive_stream_only_writes_final_line():
+    stream = io.StringIO()
+    with ProgressBar(stream=stream) as progress:
+        progress.update(3)
+    assert stream.getvalue().count("\n") == 1 and "3 items" in stream.getvalue()
+
+
+def test_formatting_helpers():
+    assert format_duration(3725) == "1:02:05"
+    stages = {
+        "fast": {"docs_per_second": 5000.0},
+        "slow": {"docs_per_second": 12.0},
+        "idle": {"docs_per_second": None},
+    }
+    assert format_stage_rates(stages) == "slow 12 docs/s · fast 5,000 docs/s"
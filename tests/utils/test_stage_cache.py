@@ -0,0 +1,48 @@
+"""Tests for stage_cache.py."""
+
+import functools
+import os
+
+from preprocessing.normalise_unicode import normalise_unicode
+from utils.stage_cache import StageCache, callable_fingerprint
+
+
+def test_cached_call_hits_on_same_input(tmp_path):
+    cache = StageCache(tmp_path)
+    calls = []
+
+    def upper(text):
+        calls.append(text)
+        return text.upper()
+
+    assert cache.cached_call("upper", "1", upper, "g'day") == "G'DAY"
+    assert cache.cached_call("upper", "1", upper, "g'day") == "G'DAY"
+    assert calls == ["g'day"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_version_and_config_change_keys():
+    base = StageCache.make_key("s", "1", callable_fingerprint(normalise_unicode), "x")
+    assert base != StageCache.make_key("s", "2", callable_fingerprint(normalise_unicode), "x")
+    folded = functools.partial(normalise_unicode, ascii_fold=True)
+    assert callable_fingerprint(folded).endswith("normalise_unicode(ascii_fold=True)")
+    assert base != StageCache.make_key("s", "1", callable_fingerprint(folded), "x")
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = StageCache(tmp_path, max_bytes=10_500)
+    for i in range(3):
+        cache.put(f"{i:064x}", "x" * 3000)
+        path = cache._path(f"{i:064x}")
+        os.utime(path, (i, i))
+    cache.get(f"{0:064x}")  # refresh entry 0 so entry 1 is the oldest
+    cache.put(f"{3:064x}", "x" * 3000)
+    remaining = {p.stem[-1] for p in tmp_path.rglob("*.json")}
+    assert remaining == {"0", "2", "3"}
+
+
+def test_rewriting_a_key_does_not_grow_the_size(tmp_path):
+    cache = StageCache(tmp_path)
+    for _ in range(10):
+        cache.put(f"{0:064x}", "x" * 3000)
+    assert cache._size == StageCache(tmp_path)._size == 3002